@@ -0,0 +1,216 @@
+import json
+import math
+import os
+
+from algorithms.bubble_sort import bubble_sort
+from algorithms.heap_sort import heap_sort
+from algorithms.insert_sort import insertion_sort
+from algorithms.machine import machine_file
+from algorithms.merge_sort import merge_sort
+from algorithms.quick_sort import quick_sort_first_pivot, quick_sort_median_pivot, quick_sort_random_pivot
+from algorithms.radix_sort import radix_sort
+from algorithms.sorting_networks import MAX_NETWORK_SIZE
+
+ALGORITHMS = {func.__name__: func for func in [
+    bubble_sort,
+    heap_sort,
+    insertion_sort,
+    merge_sort,
+    radix_sort,
+    quick_sort_first_pivot,
+    quick_sort_median_pivot,
+    quick_sort_random_pivot,
+]}
+
+# Features compared against each arrangement's centroid when routing with a cost model
+ROUTING_FEATURES = ('sortedness', 'run_ratio', 'duplicate_rate')
+
+PROBE_POINTS = 64   # Evenly spaced sample points
+PROBE_WINDOW = 8    # Adjacent pairs inspected after each sample point
+
+_model_cache = {}
+
+
+def probe(arr, points=PROBE_POINTS, window=PROBE_WINDOW):
+    """
+    Cheaply estimate the properties of an input from O(points * window) elements.
+
+    Args:
+        arr: The array to inspect
+        points (int): Number of evenly spaced sample points
+        window (int): Number of adjacent pairs inspected after each sample point
+
+    Returns:
+        dict: 'size'; 'dtype' ('int', 'float', 'str', 'bytes' or 'object');
+              'sortedness' (fraction of non-decreasing steps between sample points:
+              1 ascending, 0 descending, ~0.5 random); 'run_ratio' (fraction of local
+              descents, i.e. estimated number of ascending runs / n); 'duplicate_rate'
+              (fraction of repeated values among the samples); and for numeric
+              inputs 'key_min' and 'key_range' of the samples.
+    """
+    n = len(arr)
+    features = {'size': n, 'dtype': 'object', 'sortedness': 1.0, 'run_ratio': 0.0, 'duplicate_rate': 0.0}
+    if n == 0:
+        return features
+
+    stride = max(1, n // points)
+    samples = [arr[i] for i in range(0, n, stride)]
+
+    kinds = {type(value) for value in samples}
+    if kinds <= {int}:
+        features['dtype'] = 'int'
+    elif kinds <= {int, float}:
+        features['dtype'] = 'float'
+    elif kinds == {str}:
+        features['dtype'] = 'str'
+    elif kinds == {bytes}:
+        features['dtype'] = 'bytes'
+    elif all(hasattr(value, '__index__') for value in samples):
+        features['dtype'] = 'int'  # e.g. NumPy integer scalars
+
+    if n < 2:
+        return features
+
+    steps = len(samples) - 1
+    if steps:
+        features['sortedness'] = sum(1 for a, b in zip(samples, samples[1:]) if a <= b) / steps
+
+    descents = pairs = 0
+    for start in range(0, n - 1, stride):
+        for i in range(start, min(start + window, n - 1)):
+            pairs += 1
+            if arr[i] > arr[i + 1]:
+                descents += 1
+    features['run_ratio'] = descents / pairs if pairs else 0.0
+
+    try:
+        features['duplicate_rate'] = 1 - len(set(samples)) / len(samples)
+    except TypeError:
+        pass
+
+    if features['dtype'] in ('int', 'float'):
+        features['key_min'] = min(samples)
+        features['key_range'] = max(samples) - features['key_min']
+    return features
+
+
+def _eligible(features):
+    names = list(ALGORITHMS)
+    # radix_sort handles int, float, str and bytes keys, not arbitrary objects
+    if features['dtype'] == 'object':
+        names.remove('radix_sort')
+    return names
+
+
+def predict_cost(coefficients, n):
+    """
+    Evaluate a fitted cost curve c0 + c1*n + c2*n*log2(n) + c3*n^2.
+
+    Returns:
+        float: Predicted runtime in seconds (never negative)
+    """
+    basis = (1.0, n, n * math.log2(n) if n > 1 else 0.0, float(n) * n)
+    return max(sum(c * b for c, b in zip(coefficients, basis)), 0.0)
+
+
+def _nearest_arrangement(features, model):
+    def distance(centroid):
+        return sum((features[name] - centroid[name]) ** 2 for name in ROUTING_FEATURES)
+    return min(model['arrangements'], key=lambda name: distance(model['arrangements'][name]['centroid']))
+
+
+def _heuristic_choice(features, eligible):
+    n = features['size']
+    if n <= MAX_NETWORK_SIZE or features['run_ratio'] <= 0.02 and features['sortedness'] >= 0.9:
+        return 'insertion_sort'
+    if 'radix_sort' in eligible and features.get('key_range', n) <= 16 * n:
+        return 'radix_sort'
+    # Never quadratic, unlike the quicksort presets on sorted/adversarial input
+    return 'merge_sort'
+
+
+def load_cost_model(path=None):
+    """
+    Load (and cache) the cost model fitted for this machine.
+
+    Args:
+        path (str): Model file (default: this machine's file under outputs/machines/)
+
+    Returns:
+        dict: The model, or None if no model has been fitted yet
+    """
+    path = path or machine_file('cost_model')
+    if path not in _model_cache:
+        model = None
+        if os.path.exists(path):
+            with open(path) as file:
+                model = json.load(file)
+        _model_cache[path] = model
+    return _model_cache[path]
+
+
+def choose_algorithm(features, model=None):
+    """
+    Pick the algorithm expected to be fastest for an input with the given features.
+
+    With a cost model, the input is matched to the benchmark arrangement with the
+    closest features and the algorithm with the lowest predicted time at this size
+    wins. Without one, simple rules derived from the benchmark results are used.
+
+    Args:
+        features (dict): Output of probe()
+        model (dict): Cost model from utils.cost_model.fit_cost_model() (optional)
+
+    Returns:
+        str: Name of the chosen function in ALGORITHMS
+    """
+    eligible = _eligible(features)
+    if model is None or features['size'] <= MAX_NETWORK_SIZE:
+        return _heuristic_choice(features, eligible)
+
+    arrangement = model['arrangements'][_nearest_arrangement(features, model)]
+    costs = {name: predict_cost(arrangement['coefficients'][name], features['size'])
+             for name in eligible if name in arrangement['coefficients']}
+    if not costs:
+        return _heuristic_choice(features, eligible)
+    return min(costs, key=costs.get)
+
+
+def sort(arr, model=None, key=None, reverse=False):
+    """
+    Sort an array in place with whichever algorithm suits it best.
+    
+    Args:
+        arr: The array to sort
+        model (dict): Cost model to route with (default: this machine's fitted model,
+                      falling back to heuristics if there is none)
+        key: Function computing the sort key of an element, called once per element;
+             routing then uses the properties of the keys
+        reverse: Sort in descending order (default: False)
+    
+    Returns:
+        str: Name of the algorithm that was used
+    """
+    if model is None:
+        model = load_cost_model()
+    if key is None:
+        name = choose_algorithm(probe(arr), model)
+        ALGORITHMS[name](arr, reverse=reverse)
+        return name
+    
+    # Route on the keys and sort positions by them, so key() runs once per element
+    keys = [key(value) for value in arr]
+    name = choose_algorithm(probe(keys), model)
+    order = list(range(len(keys)))
+    ALGORITHMS[name](order, key=keys.__getitem__, reverse=reverse)
+    values = list(arr)
+    for position, i in enumerate(order):
+        arr[position] = values[i]
+    return name
+
+
+# Example usage
+if __name__ == "__main__":
+    for arr in ([5, 3, 9, 1, 7] * 20, list(range(100)), [0.5, -2.0, 3.25] * 30):
+        name = sort(arr)
+        print(f"Sorted {len(arr)} elements with {name}: {arr[:5]}...")
@@ -0,0 +1,182 @@
+from array import array
+
+import numpy as np
+
+from algorithms.quick_sort import quick_sort
+from algorithms.radix_sort import radix_order
+from algorithms.tuning import TUNED
+
+# Output formats of the argsort functions
+OUTPUTS = ('array', 'numpy')
+
+
+def _as_list(keys):
+    # Python lists index and compare fastest; NumPy columns are converted once
+    return keys.tolist() if isinstance(keys, np.ndarray) else keys
+
+
+def _finish(order, output):
+    if output == 'array':
+        return order if isinstance(order, array) else array('l', order)
+    if output == 'numpy':
+        return np.asarray(order, dtype=np.intp)
+    raise ValueError(f"output must be one of {OUTPUTS}, got {output!r}")
+
+
+def _insertion_sort_order(order, keys, low, high, reverse):
+    # Stable insertion sort of order[low:high] by keys[index]
+    for i in range(low + 1, high):
+        index = order[i]
+        key = keys[index]
+        j = i - 1
+        while j >= low and (keys[order[j]] < key if reverse else key < keys[order[j]]):
+            order[j + 1] = order[j]
+            j -= 1
+        order[j + 1] = index
+
+
+def _merge_order(order, keys, low, mid, high, reverse):
+    # Merge the sorted runs order[low:mid] and order[mid:high] by keys[index]; only the
+    # left run is copied (into a compact array), and ties take from it, keeping stability
+    run = order[low:mid]
+    i, j, k = 0, mid, low
+    while i < len(run) and j < high:
+        left, right = run[i], order[j]
+        if keys[left] < keys[right] if reverse else keys[right] < keys[left]:
+            order[k] = right
+            j += 1
+        else:
+            order[k] = left
+            i += 1
+        k += 1
+    order[k:k + len(run) - i] = run[i:]
+
+
+def merge_argsort(keys, reverse=False, cutoff=None, output='array'):
+    """
+    Stable sorting permutation of keys, computed by a bottom-up merge sort of a compact
+    array('l') of indices that compares keys[index] directly: no (key, index) pairs are
+    built, and the only scratch space is a copy of each left run.
+
+    Args:
+        keys: Sequence of mutually comparable keys (list, array or NumPy array)
+        reverse: Descending order, keeping equal keys in their original order (default: False)
+        cutoff: Runs of at most this many indices are insertion sorted before merging
+                (default: this machine's tuned merge_sort cutoff)
+        output: 'array' for a compact array('l'), 'numpy' for a NumPy intp array
+
+    Returns:
+        Indices into keys in sorted order
+    """
+    keys = _as_list(keys)
+    n = len(keys)
+    order = array('l', range(n))
+    if cutoff is None:
+        cutoff = TUNED['merge_sort_cutoff']
+
+    width = max(cutoff, 1)
+    if width > 1:
+        for low in range(0, n, width):
+            _insertion_sort_order(order, keys, low, min(low + width, n), reverse)
+    while width < n:
+        for low in range(0, n - width, 2 * width):
+            _merge_order(order, keys, low, low + width, min(low + 2 * width, n), reverse)
+        width *= 2
+    return _finish(order, output)
+
+
+def quick_argsort(keys, reverse=False, pivot=None, partition=None, cutoff=None, output='array'):
+    """
+    Stable sorting permutation of keys, computed by the quick sort engine. This is a
+    decorate-sort wrapper: quick_sort(key=...) sorts a list of (key, index) pairs, which
+    also makes the result stable, and writes the indices back into an array('l'), so it
+    costs as much memory as sorting tuples.
+
+    Args:
+        keys: Sequence of mutually comparable keys (list, array or NumPy array)
+        reverse: Descending order, keeping equal keys in their original order (default: False)
+        pivot: Pivot strategy passed on to quick_sort()
+        partition: Partition scheme passed on to quick_sort()
+        cutoff: Small-subarray cutoff passed on to quick_sort()
+        output: 'array' for a compact array('l'), 'numpy' for a NumPy intp array
+
+    Returns:
+        Indices into keys in sorted order
+    """
+    keys = _as_list(keys)
+    order = array('l', range(len(keys)))
+    quick_sort(order, pivot, cutoff, partition, key=keys.__getitem__, reverse=reverse)
+    return _finish(order, output)
+
+
+def radix_argsort(keys, reverse=False, base=None, output='array'):
+    """
+    Stable sorting permutation of int, float, str or bytes keys, computed with radix_order().
+
+    Args:
+        keys: Sequence of keys (list, array or NumPy array)
+        reverse: Descending order, keeping equal keys in their original order (default: False)
+        base: Radix for integer keys passed on to radix_order()
+        output: 'array' for a compact array('l'), 'numpy' for a NumPy intp array
+
+    Returns:
+        Indices into keys in sorted order
+    """
+    return _finish(radix_order(_as_list(keys), base, reverse), output)
+
+
+# Method name -> stable argsort function, as used by lexsort()
+ARGSORTS = {
+    'merge': merge_argsort,
+    'quick': quick_argsort,
+    'radix': radix_argsort,
+}
+
+
+def lexsort(columns, reverse=False, method='radix', output='array'):
+    """
+    Sorting permutation for several key columns, the first column being the primary
+    key (the order sorting tuples of the columns would give).
+
+    One stable argsort pass per column, from the last column to the first: each pass
+    orders the rows by one column while keeping the order of the previous passes
+    among rows with equal keys.
+
+    Args:
+        columns: Sequence of equally long key columns, most significant first
+        reverse: Descending order, for all columns or as one flag per column (default: False)
+        method: Argsort used per pass, a name in ARGSORTS (default: 'radix')
+        output: 'array' for a compact array('l'), 'numpy' for a NumPy intp array
+
+    Returns:
+        Indices into the columns in sorted order
+    """
+    columns = [_as_list(column) for column in columns]
+    if not columns:
+        return _finish([], output)
+    if len({len(column) for column in columns}) > 1:
+        raise ValueError("lexsort columns must all have the same length")
+
+    flags = reverse if isinstance(reverse, (list, tuple)) else [reverse] * len(columns)
+    if len(flags) != len(columns):
+        raise ValueError("lexsort needs one reverse flag per column")
+    argsort = ARGSORTS[method]
+
+    order = list(range(len(columns[0])))
+    for column, descending in zip(reversed(columns), reversed(flags)):
+        # Sort the current order by this column; stability keeps earlier passes as tie-breaks
+        permutation = argsort([column[i] for i in order], descending)
+        order = [order[i] for i in permutation]
+    return _finish(order, output)
+
+
+# Example usage
+if __name__ == "__main__":
+    names = ["carol", "alice", "bob", "alice", "carol"]
+    ages = [35, 30, 25, 22, 35]
+    ids = [5, 1, 2, 4, 3]
+    print("Names:", names)
+    print("merge_argsort(names):", merge_argsort(names).tolist())
+    print("radix_argsort(ages, reverse=True):", radix_argsort(ages, reverse=True).tolist())
+    order = lexsort([names, ages, ids], output='numpy')
+    print("lexsort(names, ages, ids):", order, [(names[i], ages[i], ids[i]) for i in order])
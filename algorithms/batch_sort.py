@@ -0,0 +1,129 @@
+import numpy as np
+
+# Bits per LSD pass; NumPy's stable sort on uint16 keys is itself a radix sort
+DIGIT_BITS = 16
+
+
+def to_ragged(arrays):
+    """
+    Flatten a collection of arrays into one values array plus segment offsets.
+
+    Args:
+        arrays: Iterable of sequences (the segments)
+
+    Returns:
+        tuple: (values, offsets) where segment i is values[offsets[i]:offsets[i+1]]
+    """
+    arrays = [np.asarray(arr) for arr in arrays]
+    # Empty segments default to float64 and must not change the batch's dtype
+    non_empty = [arr.dtype for arr in arrays if arr.size]
+    dtype = np.result_type(*non_empty) if non_empty else np.int64
+    arrays = [arr.astype(dtype, copy=False) for arr in arrays]
+    offsets = np.zeros(len(arrays) + 1, dtype=np.int64)
+    np.cumsum([len(arr) for arr in arrays], out=offsets[1:])
+    values = np.concatenate(arrays) if arrays else np.empty(0, dtype=dtype)
+    return values, offsets
+
+
+def from_ragged(values, offsets):
+    """
+    Split a flattened values array back into a list of Python lists.
+    """
+    return [values[offsets[i]:offsets[i + 1]].tolist() for i in range(len(offsets) - 1)]
+
+
+def _segment_ids(offsets):
+    return np.repeat(np.arange(len(offsets) - 1, dtype=np.int64), np.diff(offsets))
+
+
+def _shift_to_zero(values, low):
+    # values - low as uint64, exact for every integer dtype: the difference lies in
+    # [0, 2**64), so computing it modulo 2**64 never wraps (an int64 cast would for
+    # uint64 values of 2**63 and above)
+    return values.astype(np.uint64) - np.uint64(low % 2**64)
+
+
+def _unshift(keys, low, dtype):
+    # Inverse of _shift_to_zero(), casting back to the batch's dtype
+    return (keys + np.uint64(low % 2**64)).astype(dtype)
+
+
+def batch_sort(values, offsets):
+    """
+    Sort every segment of a ragged batch in one call with a segmented NumPy sort.
+
+    Integer batches are sorted as a single composite key segment_id * span + value
+    when it fits in 64 bits; otherwise the batch is sorted by (segment_id, value)
+    with np.lexsort. Segments never mix because segment ids are the primary key.
+
+    Args:
+        values (numpy.ndarray): Flattened elements of all segments
+        offsets (numpy.ndarray): Segment boundaries, len(segments) + 1 entries
+
+    Returns:
+        numpy.ndarray: A new array holding each segment sorted in place of the original
+    """
+    values = np.asarray(values)
+    if values.size == 0:
+        return values.copy()
+    segments = _segment_ids(offsets)
+
+    if np.issubdtype(values.dtype, np.integer):
+        low = int(values.min())
+        span = int(values.max()) - low + 1
+        if span * (len(offsets) - 1) < 2**63:
+            keys = segments.astype(np.uint64) * np.uint64(span) + _shift_to_zero(values, low)
+            keys.sort()
+            return _unshift(keys % np.uint64(span), low, values.dtype)
+
+    return values[np.lexsort((values, segments))]
+
+
+def batch_radix_sort(values, offsets, digit_bits=DIGIT_BITS):
+    """
+    Sort every segment of a ragged batch of integers with a segmented LSD radix sort.
+
+    Values (shifted to be non-negative) are sorted digit by digit, least significant
+    first, and a final set of passes over the segment ids regroups the segments.
+    Every pass is a stable counting sort on a digit_bits-wide key.
+
+    Args:
+        values (numpy.ndarray): Flattened integer elements of all segments
+        offsets (numpy.ndarray): Segment boundaries, len(segments) + 1 entries
+        digit_bits (int): Bits per radix pass, at most 16 (default: 16)
+
+    Returns:
+        numpy.ndarray: A new array holding each segment sorted in place of the original
+    """
+    values = np.asarray(values)
+    if not np.issubdtype(values.dtype, np.integer):
+        raise TypeError(f"batch_radix_sort needs integer values, got {values.dtype}")
+    if values.size == 0:
+        return values.copy()
+    if not 1 <= digit_bits <= 16:
+        raise ValueError("digit_bits must be between 1 and 16")
+
+    low = int(values.min())
+    keys = _shift_to_zero(values, low)
+    segments = _segment_ids(offsets).astype(np.uint64)
+    mask = np.uint64((1 << digit_bits) - 1)
+    order = np.arange(values.size)
+
+    # Least significant key first: value digits, then segment id digits
+    for key, key_max in ((keys, int(values.max()) - low), (segments, len(offsets) - 2)):
+        shift = 0
+        while key_max >> shift:
+            digits = ((key[order] >> np.uint64(shift)) & mask).astype(np.uint16)
+            order = order[np.argsort(digits, kind='stable')]
+            shift += digit_bits
+
+    return values[order]
+
+
+# Example usage
+if __name__ == "__main__":
+    arrays = [[5, 2, 9], [3, 1], [], [8, 7, 6, 5]]
+    values, offsets = to_ragged(arrays)
+    print("Unsorted segments:", arrays)
+    print("Sorted segments (numpy):", from_ragged(batch_sort(values, offsets), offsets))
+    print("Sorted segments (radix):", from_ragged(batch_radix_sort(values, offsets), offsets))
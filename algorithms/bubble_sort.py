@@ -1,4 +1,9 @@
-def bubble_sort(arr):
+from algorithms.keyed import sort_by_key
+
+def bubble_sort(arr, key=None, reverse=False):
+    # Sorts by key(element) / in descending order through decorate-sort-undecorate
+    if key is not None or reverse:
+        return sort_by_key(bubble_sort, arr, key, reverse)
     n = len(arr)
     # Traverse through all array elements
     for i in range(n):
@@ -1,31 +1,67 @@
-def heap_sort(arr):
+from algorithms.keyed import sort_by_key
+from algorithms.sorting_networks import small_sort
+from algorithms.tuning import TUNED
+
+def heapify(arr, n, i, arity=2):
+    """
+    Sift arr[i] down the max-heap held in arr[0:n].
+    
+    Args:
+        arr: The array holding the heap
+        n: Number of elements in the heap
+        i: Index of the element to sift down
+        arity: Children per heap node (default: 2)
+    """
+    largest = i
+    first = arity * i + 1
+    
+    # Check which existing child is greater than the largest so far
+    for child in range(first, min(first + arity, n)):
+        if arr[child] > arr[largest]:
+            largest = child
+    
+    # Change root if needed
+    if largest != i:
+        arr[i], arr[largest] = arr[largest], arr[i]  # Swap
+        heapify(arr, n, largest, arity)
+
+def heap_sort(arr, cutoff=None, arity=None, key=None, reverse=False):
+    """
+    Sort an array using Heap Sort.
+    
+    Args:
+        arr: The array to sort
+        cutoff: Once the heap holds at most this many elements (its smallest ones),
+                they are finished with a sorting network / insertion sort
+                (default: this machine's tuned value, 0 if untuned)
+        arity: Children per heap node; wider heaps are shallower but compare more
+               children per level (default: this machine's tuned value, 2 if untuned)
+        key: Function computing the sort key of an element, called once per element
+        reverse: Sort in descending order (default: False)
+    """
+    if key is not None or reverse:
+        # Ties are broken by position, which also makes the sort stable
+        return sort_by_key(heap_sort, arr, key, reverse, cutoff=cutoff, arity=arity)
+    if cutoff is None:
+        cutoff = TUNED['heap_sort_cutoff']
+    if arity is None:
+        arity = TUNED['heap_arity']
     
     n = len(arr)
     
-    # Build a maxheap
-    def heapify(arr, n, i):
-        largest = i
-        left = 2 * i + 1
-        right = 2 * i + 2
-        
-        # Check if left child exists and is greater than root
-        if left < n and arr[left] > arr[largest]:
-            largest = left
-        
-        # Check if right child exists and is greater than largest so far
-        if right < n and arr[right] > arr[largest]:
-            largest = right
-        
-        # Change root if needed
-        if largest != i:
-            arr[i], arr[largest] = arr[largest], arr[i]  # Swap
-            heapify(arr, n, largest)
+    if n <= cutoff:
+        small_sort(arr, 0, n - 1)
+        return
     
     # Build max heap
-    for i in range(n // 2 - 1, -1, -1):
-        heapify(arr, n, i)
+    for i in range((n - 2) // arity, -1, -1):
+        heapify(arr, n, i, arity)
     
     # Extract elements one by one
     for i in range(n - 1, 0, -1):
+        if i < cutoff:
+            # The remaining heap arr[0..i] holds the i+1 smallest elements
+            small_sort(arr, 0, i)
+            break
         arr[i], arr[0] = arr[0], arr[i]  # Swap
-        heapify(arr, i, 0)
+        heapify(arr, i, 0, arity)
@@ -1,8 +1,19 @@
-def insertion_sort(arr):
-    for i in range(1, len(arr)):
-        key = arr[i]
+from algorithms.keyed import sort_by_key
+
+def insertion_sort(arr, low=0, high=None, key=None, reverse=False):
+    # Sorts arr[low:high] in place (the whole array by default)
+    if high is None:
+        high = len(arr)
+    if key is not None or reverse:
+        # Sorts by key(element) / in descending order through decorate-sort-undecorate
+        segment = arr[low:high]
+        sort_by_key(insertion_sort, segment, key, reverse)
+        arr[low:high] = segment
+        return
+    for i in range(low + 1, high):
+        value = arr[i]
         j = i - 1
-        while j >= 0 and arr[j] > key:
+        while j >= low and arr[j] > value:
             arr[j + 1] = arr[j]
             j -= 1
-        arr[j + 1] = key
+        arr[j + 1] = value
@@ -0,0 +1,40 @@
+def sort_by_key(sort, arr, key=None, reverse=False, **kwargs):
+    """
+    Sort arr in place by key with any in-place sorting function (decorate-sort-undecorate).
+
+    Keys are computed once per element into a list parallel to the values, and the
+    function sorts (key, index) pairs. For builtin key types (int, float, str, tuples of
+    them) comparisons then run in C without calling back into Python code; keys of
+    user-defined classes still go through their own comparison methods.
+    The index breaks ties, which makes every algorithm stable. For reverse=True the
+    pairs hold the negated index and the sorted pairs are read back to front, so equal
+    keys still keep their original order, as with sorted(..., reverse=True).
+
+    Args:
+        sort (callable): Function sorting a list in place, e.g. merge_sort
+        arr: The array to sort
+        key (callable): Function computing the sort key of an element (default: the element)
+        reverse (bool): Sort in descending order (default: False)
+        **kwargs: Further arguments for sort
+
+    Returns:
+        The return value of sort
+    """
+    values = list(arr)
+    keys = values if key is None else [key(value) for value in values]
+
+    if reverse:
+        decorated = [(k, -i) for i, k in enumerate(keys)]
+    else:
+        decorated = list(zip(keys, range(len(keys))))
+
+    result = sort(decorated, **kwargs)
+
+    if reverse:
+        decorated.reverse()
+        for position, (_, i) in enumerate(decorated):
+            arr[position] = values[-i]
+    else:
+        for position, (_, i) in enumerate(decorated):
+            arr[position] = values[i]
+    return result
@@ -0,0 +1,31 @@
+import os
+import platform
+import re
+
+# Per-machine artefacts (fitted cost models, tuned parameters) live here by default
+MACHINE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'outputs', 'machines')
+
+
+def machine_id():
+    """
+    Identify the machine benchmarks were run on, as a string safe to use in file names.
+
+    Returns:
+        str: Host name, architecture and CPU count, e.g. 'buildbox-x86_64-8cpu'
+    """
+    raw = f"{platform.node() or 'unknown'}-{platform.machine() or 'unknown'}-{os.cpu_count() or 1}cpu"
+    return re.sub(r'[^A-Za-z0-9_.-]', '_', raw)
+
+
+def machine_file(kind, directory=MACHINE_DIR):
+    """
+    Path of a per-machine JSON file, e.g. outputs/machines/<machine id>.cost_model.json
+
+    Args:
+        kind (str): What the file holds ('cost_model', 'tuning', ...)
+        directory (str): Directory holding the per-machine files
+
+    Returns:
+        str: The file path (the file may not exist yet)
+    """
+    return os.path.join(directory, f"{machine_id()}.{kind}.json")
@@ -1,40 +1,71 @@
-def merge_sort(arr):
-    def _merge(arr, left, mid, right):
-        # Merge two subarrays arr[left...mid] and arr[mid+1...right]
-        n1 = mid - left + 1
-        n2 = right - mid
-        
-        # Create temporary arrays
-        L = arr[left:left+n1]
-        R = arr[mid+1:mid+1+n2]
-        
-        # Merge the temp arrays back into arr[left...right]
-        i = j = 0
-        k = left
-        
-        while i < n1 and j < n2:
-            if L[i] <= R[j]:
-                arr[k] = L[i]
-                i += 1
-            else:
-                arr[k] = R[j]
-                j += 1
-            k += 1
-        
-        # Copy remaining elements of L[]
-        while i < n1:
+import math
+
+from algorithms.insert_sort import insertion_sort
+from algorithms.keyed import sort_by_key
+from algorithms.tuning import TUNED
+
+# inplace_merge_sort() insertion sorts runs of up to this many elements (stable, no scratch)
+INPLACE_MERGE_LEAF = 16
+
+def _merge(arr, left, mid, right):
+    # Merge the sorted runs arr[left...mid] and arr[mid+1...right] in linear time;
+    # equal elements keep their order (left run first)
+    n1 = mid - left + 1
+    n2 = right - mid
+
+    # Create temporary arrays (list() copies: slices of NumPy arrays and memoryviews
+    # are views into arr, which the merge below overwrites)
+    L = list(arr[left:left+n1])
+    R = list(arr[mid+1:mid+1+n2])
+
+    # Merge the temp arrays back into arr[left...right]
+    i = j = 0
+    k = left
+
+    while i < n1 and j < n2:
+        if L[i] <= R[j]:
             arr[k] = L[i]
             i += 1
-            k += 1
-        
-        # Copy remaining elements of R[]
-        while j < n2:
+        else:
             arr[k] = R[j]
             j += 1
-            k += 1
+        k += 1
+
+    # Copy remaining elements of L[]
+    while i < n1:
+        arr[k] = L[i]
+        i += 1
+        k += 1
+
+    # Copy remaining elements of R[]
+    while j < n2:
+        arr[k] = R[j]
+        j += 1
+        k += 1
+
+def merge_sort(arr, cutoff=None, key=None, reverse=False):
+    """
+    Sort an array using top-down Merge Sort.
+    
+    Args:
+        arr: The array to sort
+        cutoff: Runs of at most this many elements are insertion sorted instead of being
+                split further, which keeps the sort stable (default: this machine's tuned
+                value, 0 if untuned)
+        key: Function computing the sort key of an element, called once per element
+        reverse: Sort in descending order, keeping equal elements in their original
+                 order (default: False)
+    """
+    if key is not None or reverse:
+        return sort_by_key(merge_sort, arr, key, reverse, cutoff=cutoff)
+    if cutoff is None:
+        cutoff = TUNED['merge_sort_cutoff']
     
     def _merge_sort(arr, left, right):
-        if left < right:
+        if right - left < cutoff:
+            # Small run: insertion sort it (stable, unlike the sorting networks)
+            insertion_sort(arr, left, right + 1)
+        elif left < right:
             mid = (left + right) // 2
             
             # Sort first and second halves
@@ -44,3 +75,135 @@ def merge_sort(arr):
     
     # Sorting the input array
     _merge_sort(arr, 0, len(arr) - 1)
+
+def _reverse(arr, first, last):
+    # Reverse arr[first:last] in place with swaps (no temporary list)
+    last -= 1
+    while first < last:
+        arr[first], arr[last] = arr[last], arr[first]
+        first += 1
+        last -= 1
+
+def _rotate(arr, first, middle, last, buffer):
+    # Rotate arr[first:last] so arr[middle] comes first. The shorter side is parked
+    # in the buffer while the longer one shifts over when it fits; otherwise three
+    # in-place reversals
+    left = middle - first
+    right = last - middle
+    if left <= len(buffer):
+        buffer[:left] = arr[first:middle]
+        for k in range(right):
+            arr[first + k] = arr[middle + k]
+        for k in range(left):
+            arr[first + right + k] = buffer[k]
+    elif right <= len(buffer):
+        buffer[:right] = arr[middle:last]
+        for k in range(left - 1, -1, -1):
+            arr[first + right + k] = arr[first + k]
+        for k in range(right):
+            arr[first + k] = buffer[k]
+    else:
+        _reverse(arr, first, middle)
+        _reverse(arr, middle, last)
+        _reverse(arr, first, last)
+
+def _buffered_merge(arr, first, middle, last, buffer):
+    # Merge arr[first:middle] and arr[middle:last], copying the shorter run into the
+    # buffer: forwards from the left when the left run is shorter, else backwards
+    if middle - first <= last - middle:
+        size = middle - first
+        buffer[:size] = arr[first:middle]
+        i, j, k = 0, middle, first
+        while i < size and j < last:
+            if arr[j] < buffer[i]:
+                arr[k] = arr[j]
+                j += 1
+            else:
+                arr[k] = buffer[i]
+                i += 1
+            k += 1
+        while i < size:
+            arr[k] = buffer[i]
+            i += 1
+            k += 1
+    else:
+        size = last - middle
+        buffer[:size] = arr[middle:last]
+        i, j, k = size - 1, middle - 1, last - 1
+        while i >= 0 and j >= first:
+            if buffer[i] < arr[j]:
+                arr[k] = arr[j]
+                j -= 1
+            else:
+                arr[k] = buffer[i]
+                i -= 1
+            k -= 1
+        while i >= 0:
+            arr[k] = buffer[i]
+            i -= 1
+            k -= 1
+
+def _sym_merge(arr, first, middle, last, buffer):
+    # Stable in-place merge of arr[first:middle] and arr[middle:last] (Kim & Kutzner's
+    # SymMerge): find the symmetric split point by binary search, rotate the two
+    # middle blocks past each other and merge both halves recursively
+    if first >= middle or middle >= last or not arr[middle] < arr[middle - 1]:
+        return
+    if min(middle - first, last - middle) <= len(buffer):
+        _buffered_merge(arr, first, middle, last, buffer)
+        return
+
+    mid = (first + last) // 2
+    n = mid + middle
+    if middle > mid:
+        start, r = n - last, mid
+    else:
+        start, r = first, middle
+    p = n - 1
+    while start < r:
+        c = (start + r) // 2
+        if not arr[p - c] < arr[c]:
+            start = c + 1
+        else:
+            r = c
+    end = n - start
+
+    if start < middle < end:
+        _rotate(arr, start, middle, end, buffer)
+    _sym_merge(arr, first, start, mid, buffer)
+    _sym_merge(arr, mid, end, last, buffer)
+
+def inplace_merge_sort(arr, buffered=True, key=None, reverse=False):
+    """
+    Sort an array with a stable merge sort that needs no O(n) scratch space.
+
+    Runs of INPLACE_MERGE_LEAF elements are insertion sorted, then merged with
+    rotation-based SymMerge. With buffered=True a single √n-element buffer is allocated
+    up front: merges and rotations whose shorter side fits in it are done through the
+    buffer, the rest are split by SymMerge until they fit, giving O(n log n)
+    comparisons with O(√n) extra memory. With buffered=False every merge works by
+    rotations (three reversals) alone, using O(1) extra memory beyond the O(log n)
+    recursion at the cost of O(n log² n) moves.
+
+    Args:
+        arr: The array to sort
+        buffered: Use the √n buffer (default: True)
+        key: Function computing the sort key of an element, called once per element
+             (decorating the keys takes O(n) memory again)
+        reverse: Sort in descending order, keeping equal elements in their original
+                 order (default: False)
+    """
+    if key is not None or reverse:
+        return sort_by_key(inplace_merge_sort, arr, key, reverse, buffered=buffered)
+    n = len(arr)
+    buffer = [None] * math.isqrt(n) if buffered else []
+
+    for start in range(0, n, INPLACE_MERGE_LEAF):
+        insertion_sort(arr, start, min(start + INPLACE_MERGE_LEAF, n))
+
+    # Bottom-up: merge adjacent runs of doubling width
+    width = INPLACE_MERGE_LEAF
+    while width < n:
+        for first in range(0, n - width, 2 * width):
+            _sym_merge(arr, first, first + width, min(first + 2 * width, n), buffer)
+        width *= 2
@@ -1,4 +1,56 @@
+import math
+import os
 import random
+from array import array
+
+from algorithms.keyed import sort_by_key
+from algorithms.sorting_networks import small_sort
+from algorithms.tuning import TUNED
+
+# Ranges smaller than this use median-of-3 instead of the ninther
+NINTHER_THRESHOLD = 40
+
+# Random pivot offsets drawn per refill of a PivotRandom buffer
+RANDOM_BUFFER_SIZE = 1024
+
+# Source of per-call seeds when none is given; seed_pivot_random() makes it reproducible
+_seed_source = random.Random(int.from_bytes(os.urandom(8), 'little'))
+
+
+def seed_pivot_random(seed):
+    """
+    Make the seeds drawn by randomized quick sorts reproducible, like random.seed().
+    """
+    _seed_source.seed(seed)
+
+
+class PivotRandom:
+    """
+    Seeded source of random pivot indices for one sort call.
+
+    Offsets are drawn in bulk: one randbytes() call fills an array('I') buffer of
+    RANDOM_BUFFER_SIZE 32-bit values, so the partition loop only pays for an array
+    lookup and a modulo instead of a random.randint() call per pivot. The modulo bias
+    is below n / 2**32, i.e. negligible for any array that fits in memory.
+    """
+
+    def __init__(self, seed=None, buffer_size=RANDOM_BUFFER_SIZE):
+        self.seed = _seed_source.getrandbits(64) if seed is None else seed
+        self._rng = random.Random(self.seed)
+        self._byte_count = buffer_size * array('I').itemsize
+        self._buffer = array('I')
+        self._next = 0
+
+    def randint(self, low, high):
+        """
+        Random integer in [low, high], both inclusive.
+        """
+        if self._next == len(self._buffer):
+            self._buffer = array('I', self._rng.randbytes(self._byte_count))
+            self._next = 0
+        value = self._buffer[self._next]
+        self._next += 1
+        return low + value % (high - low + 1)
 
 def _partition(arr, low, high, pivot_index):
     # Move pivot to the end temporarily
@@ -19,14 +71,216 @@ def _partition(arr, low, high, pivot_index):
     arr[i + 1], arr[high] = arr[high], arr[i + 1]
     return i + 1
 
-def quick_sort_first_pivot(arr):
+def _median_index(arr, a, b, c):
+    # Index of the median of arr[a], arr[b] and arr[c]
+    if arr[a] <= arr[b] <= arr[c] or arr[c] <= arr[b] <= arr[a]:
+        return b
+    elif arr[b] <= arr[a] <= arr[c] or arr[c] <= arr[a] <= arr[b]:
+        return a
+    else:
+        return c
+
+def _first_pivot(arr, low, high):
+    # Choose the first element as pivot
+    return low
+
+def _random_pivot(arr, low, high, rng):
+    # Choose a random element as pivot
+    return rng.randint(low, high)
+
+def _median_of_three(arr, low, high):
+    # Find median of first, middle, and last element
+    return _median_index(arr, low, low + (high - low) // 2, high)
+
+def _ninther(arr, low, high):
+    # Tukey's ninther: median of the medians of three evenly spaced triples
+    if high - low + 1 < NINTHER_THRESHOLD:
+        return _median_of_three(arr, low, high)
+    eighth = (high - low) // 8
+    mid = low + (high - low) // 2
+    return _median_index(arr,
+                         _median_index(arr, low, low + eighth, low + 2 * eighth),
+                         _median_index(arr, mid - eighth, mid, mid + eighth),
+                         _median_index(arr, high - 2 * eighth, high - eighth, high))
+
+def _select_index(arr, indices, k):
+    # Index of the k-th smallest of arr[indices] in worst-case linear time (BFPRT)
+    while len(indices) > 5:
+        pivot = arr[_median_of_medians_index(arr, indices)]
+        smaller = [i for i in indices if arr[i] < pivot]
+        larger = [i for i in indices if arr[i] > pivot]
+        if k < len(smaller):
+            indices = smaller
+        elif k >= len(indices) - len(larger):
+            k -= len(indices) - len(larger)
+            indices = larger
+        else:
+            return next(i for i in indices if arr[i] == pivot)
+    return sorted(indices, key=arr.__getitem__)[k]
+
+def _median_of_medians_index(arr, indices):
+    # Median (found recursively) of the medians of groups of five
+    medians = []
+    for start in range(0, len(indices), 5):
+        group = sorted(indices[start:start + 5], key=arr.__getitem__)
+        medians.append(group[(len(group) - 1) // 2])
+    return _select_index(arr, medians, (len(medians) - 1) // 2)
+
+def _median_of_medians(arr, low, high):
+    # Guarantees at least 30% of the range on each side of the pivot
+    return _median_of_medians_index(arr, list(range(low, high + 1)))
+
+def _sampled_median(arr, low, high, rng):
+    # Median of about sqrt(n) randomly sampled elements (drawn with replacement)
+    size = high - low + 1
+    sample = [rng.randint(low, high) for _ in range(min(size, max(3, math.isqrt(size))))]
+    sample.sort(key=arr.__getitem__)
+    return sample[(len(sample) - 1) // 2]
+
+# Pivot strategy name -> function(arr, low, high) returning the pivot index;
+# randomized strategies take the call's PivotRandom as a fourth argument
+PIVOT_STRATEGIES = {
+    'first': _first_pivot,
+    'random': _random_pivot,
+    'median3': _median_of_three,
+    'ninther': _ninther,
+    'median_of_medians': _median_of_medians,
+    'sampled': _sampled_median,
+}
+RANDOMIZED_PIVOTS = {'random', 'sampled'}
+
+def _lomuto(arr, low, high, choose_pivot):
+    pi = _partition(arr, low, high, choose_pivot(arr, low, high))
+    return (low, pi - 1), (pi + 1, high)
+
+def _hoare(arr, low, high, choose_pivot):
+    # Move pivot to the front; both scans stop on elements equal to it
+    pivot_index = choose_pivot(arr, low, high)
+    arr[low], arr[pivot_index] = arr[pivot_index], arr[low]
+    pivot = arr[low]
+    
+    i = low - 1
+    j = high + 1
+    while True:
+        i += 1
+        while arr[i] < pivot:
+            i += 1
+        j -= 1
+        while arr[j] > pivot:
+            j -= 1
+        if i >= j:
+            return (low, j), (j + 1, high)
+        arr[i], arr[j] = arr[j], arr[i]
+
+def _three_way(arr, low, high, choose_pivot):
+    # Dijkstra's Dutch national flag: < pivot | == pivot | > pivot
+    pivot_index = choose_pivot(arr, low, high)
+    arr[low], arr[pivot_index] = arr[pivot_index], arr[low]
+    pivot = arr[low]
+    
+    lt, i, gt = low, low + 1, high
+    while i <= gt:
+        if arr[i] < pivot:
+            arr[lt], arr[i] = arr[i], arr[lt]
+            lt += 1
+            i += 1
+        elif arr[i] > pivot:
+            arr[i], arr[gt] = arr[gt], arr[i]
+            gt -= 1
+        else:
+            i += 1
+    return (low, lt - 1), (gt + 1, high)
+
+def _dual_pivot(arr, low, high, choose_pivot):
+    # Yaroslavskiy: the strategy picks one pivot from each outer third of the range
+    third = (high - low) // 3
+    first = choose_pivot(arr, low, low + third)
+    second = choose_pivot(arr, high - third, high)
+    arr[low], arr[first] = arr[first], arr[low]
+    arr[high], arr[second] = arr[second], arr[high]
+    if arr[low] > arr[high]:
+        arr[low], arr[high] = arr[high], arr[low]
+    p, q = arr[low], arr[high]
+    
+    if p == q:
+        # Equal pivots would leave every duplicate of them in one part
+        return _three_way(arr, low, high, _first_pivot)
+    
+    # < p | p <= x <= q | unscanned | > q
+    lt, k, gt = low + 1, low + 1, high - 1
+    while k <= gt:
+        if arr[k] < p:
+            arr[k], arr[lt] = arr[lt], arr[k]
+            lt += 1
+        elif arr[k] > q:
+            while arr[gt] > q and k < gt:
+                gt -= 1
+            arr[k], arr[gt] = arr[gt], arr[k]
+            gt -= 1
+            if arr[k] < p:
+                arr[k], arr[lt] = arr[lt], arr[k]
+                lt += 1
+        k += 1
+    lt -= 1
+    gt += 1
+    
+    # Place pivots in their correct positions
+    arr[low], arr[lt] = arr[lt], arr[low]
+    arr[high], arr[gt] = arr[gt], arr[high]
+    return (low, lt - 1), (lt + 1, gt - 1), (gt + 1, high)
+
+# Partition scheme name -> function(arr, low, high, choose_pivot) returning the subranges left to sort
+PARTITION_SCHEMES = {
+    'lomuto': _lomuto,
+    'hoare': _hoare,
+    'three_way': _three_way,
+    'dual_pivot': _dual_pivot,
+}
+
+def quick_sort(arr, pivot=None, cutoff=None, partition=None, seed=None, key=None, reverse=False):
     """
-    Sort an array using iterative QuickSort with first element as pivot.
+    Sort an array using iterative QuickSort with a configurable pivot strategy and
+    partition scheme.
+    
+    Randomized pivot strategies draw from a PivotRandom seeded per call; the seed is
+    kept in quick_sort.last_seed (None for deterministic strategies) so that a run can
+    be replayed exactly by passing it back as seed.
     
     Args:
         arr: The array to sort
+        pivot: Name of the pivot strategy in PIVOT_STRATEGIES
+               (default: this machine's tuned value, 'median3' if untuned)
+        cutoff: Subarrays of at most this many elements are finished with a
+                sorting network / insertion sort instead of partitioning
+                (default: this machine's tuned value, 0 if untuned)
+        partition: Name of the partition scheme in PARTITION_SCHEMES
+                   (default: this machine's tuned value, 'lomuto' if untuned)
+        seed: Seed for randomized pivot strategies (default: a fresh seed per call)
+        key: Function computing the sort key of an element, called once per element
+        reverse: Sort in descending order (default: False)
     """
-    if not arr or len(arr) <= 1:
+    if key is not None or reverse:
+        # Ties are broken by position, which also makes the sort stable
+        return sort_by_key(quick_sort, arr, key, reverse, pivot=pivot, cutoff=cutoff, partition=partition, seed=seed)
+    
+    if pivot is None:
+        pivot = TUNED['quick_sort_pivot']
+    if cutoff is None:
+        cutoff = TUNED['quick_sort_cutoff']
+    if partition is None:
+        partition = TUNED['quick_sort_partition']
+    split = PARTITION_SCHEMES[partition]
+    
+    if pivot in RANDOMIZED_PIVOTS:
+        rng = PivotRandom(seed)
+        select = PIVOT_STRATEGIES[pivot]
+        choose_pivot = lambda arr, low, high: select(arr, low, high, rng)
+        quick_sort.last_seed = rng.seed
+    else:
+        choose_pivot = PIVOT_STRATEGIES[pivot]
+        quick_sort.last_seed = None
+    
+    if len(arr) <= 1:
         return
     
     # Create an auxiliary stack
@@ -40,90 +294,61 @@ def quick_sort_first_pivot(arr):
         # Pop low and high
         low, high = stack.pop()
         
-        if low < high:
-            # Choose the first element as pivot
-            pivot_index = low
-            
-            # Find the partition index
-            pi = _partition(arr, low, high, pivot_index)
-            
-            # Push subarrays to stack
-            stack.append((low, pi - 1))   # Elements before partition
-            stack.append((pi + 1, high))  # Elements after partition
-
-def quick_sort_random_pivot(arr):
+        if 0 < high - low < cutoff:
+            # Small subarray: hand it to the shared base case
+            small_sort(arr, low, high)
+        elif low < high:
+            # Partition and push the subranges still to be sorted
+            stack.extend(split(arr, low, high, choose_pivot))
+
+def quick_sort_first_pivot(arr, cutoff=None, key=None, reverse=False):
     """
-    Sort an array using iterative QuickSort with a random element as pivot.
+    Sort an array using iterative QuickSort with first element as pivot.
     
     Args:
         arr: The array to sort
+        cutoff: Subarrays of at most this many elements are finished with a
+                sorting network / insertion sort instead of partitioning
+                (default: this machine's tuned value, 0 if untuned)
+        key: Function computing the sort key of an element, called once per element
+        reverse: Sort in descending order (default: False)
     """
-    if not arr or len(arr) <= 1:
-        return
-    
-    # Create an auxiliary stack
-    stack = []
-    
-    # Push initial values of low and high to stack
-    stack.append((0, len(arr) - 1))
+    quick_sort(arr, 'first', cutoff, 'lomuto', key=key, reverse=reverse)
+
+def quick_sort_random_pivot(arr, cutoff=None, seed=None, key=None, reverse=False):
+    """
+    Sort an array using iterative QuickSort with a random element as pivot.
     
-    # Keep popping from stack while it's not empty
-    while stack:
-        # Pop low and high
-        low, high = stack.pop()
-        
-        if low < high:
-            # Choose a random element as pivot
-            pivot_index = random.randint(low, high)
-            
-            # Find the partition index
-            pi = _partition(arr, low, high, pivot_index)
-            
-            # Push subarrays to stack
-            stack.append((low, pi - 1))   # Elements before partition
-            stack.append((pi + 1, high))  # Elements after partition
-
-def quick_sort_median_pivot(arr):
+    Args:
+        arr: The array to sort
+        cutoff: Subarrays of at most this many elements are finished with a
+                sorting network / insertion sort instead of partitioning
+                (default: this machine's tuned value, 0 if untuned)
+        seed: Seed for the pivot choices (default: a fresh seed per call); the seed
+              used is kept in quick_sort_random_pivot.last_seed for replay
+        key: Function computing the sort key of an element, called once per element
+        reverse: Sort in descending order (default: False)
+    """
+    quick_sort(arr, 'random', cutoff, 'lomuto', seed, key, reverse)
+    quick_sort_random_pivot.last_seed = quick_sort.last_seed
+
+def quick_sort_median_pivot(arr, cutoff=None, key=None, reverse=False):
     """
     Sort an array using iterative QuickSort with median of three elements as pivot.
     
     Args:
         arr: The array to sort
+        cutoff: Subarrays of at most this many elements are finished with a
+                sorting network / insertion sort instead of partitioning
+                (default: this machine's tuned value, 0 if untuned)
+        key: Function computing the sort key of an element, called once per element
+        reverse: Sort in descending order (default: False)
     """
-    if not arr or len(arr) <= 1:
-        return
-    
-    def _median_of_three(low, high):
-        mid = low + (high - low) // 2
-        # Find median of first, middle, and last element
-        if arr[low] <= arr[mid] <= arr[high] or arr[high] <= arr[mid] <= arr[low]:
-            return mid
-        elif arr[mid] <= arr[low] <= arr[high] or arr[high] <= arr[low] <= arr[mid]:
-            return low
-        else:
-            return high
-    
-    # Create an auxiliary stack
-    stack = []
-    
-    # Push initial values of low and high to stack
-    stack.append((0, len(arr) - 1))
-    
-    # Keep popping from stack while it's not empty
-    while stack:
-        # Pop low and high
-        low, high = stack.pop()
-        
-        if low < high:
-            # Choose the median of three elements as pivot
-            pivot_index = _median_of_three(low, high)
-            
-            # Find the partition index
-            pi = _partition(arr, low, high, pivot_index)
-            
-            # Push subarrays to stack
-            stack.append((low, pi - 1))   # Elements before partition
-            stack.append((pi + 1, high))  # Elements after partition
+    quick_sort(arr, 'median3', cutoff, 'lomuto', key=key, reverse=reverse)
+
+# Seed of the latest call, for replaying it (None until a randomized sort has run)
+quick_sort.last_seed = None
+quick_sort_random_pivot.last_seed = None
 
 # Example usage
 if __name__ == "__main__":
@@ -145,4 +370,11 @@ if __name__ == "__main__":
     arr3 = test_array.copy()
     print(f"Unsorted array: {arr3}")
     quick_sort_median_pivot(arr3)
-    print(f"Sorted array (median pivot): {arr3}")
\ No newline at end of file
+    print(f"Sorted array (median pivot): {arr3}")
+    print()
+    
+    for pivot in PIVOT_STRATEGIES:
+        for partition in PARTITION_SCHEMES:
+            arr4 = test_array.copy()
+            quick_sort(arr4, pivot, partition=partition)
+            print(f"Sorted array ({pivot} pivot, {partition} partition): {arr4}")
\ No newline at end of file
@@ -1,32 +1,47 @@
-def counting_sort(arr, exp):
+import numbers
+from array import array
+
+from algorithms.insert_sort import insertion_sort
+from algorithms.tuning import TUNED
+
+# Digit width for float keys, which are 64-bit patterns after float_bits()
+FLOAT_DIGIT_BITS = 8
+FLOAT_SIGN = 1 << 63
+FLOAT_MASK = (1 << 64) - 1
+
+# MSD string buckets of at most this many keys are finished with insertion sort
+MSD_CUTOFF = 32
+
+def counting_sort(arr, exp, base=10):
     """
     Counting sort implementation used as a subroutine in radix sort.
     Sorts the array based on the digit at position exp.
     
     Args:
         arr: The array to sort
-        exp: The current digit position (1s, 10s, 100s, etc.)
+        exp: The current digit position (1s, 10s, 100s, etc. for base 10)
+        base: Radix of the digits (default: 10)
     """
     n = len(arr)
     
     # Initialize output array and count array
     output = [0] * n
-    count = [0] * 10
+    count = [0] * base
     
     # Store count of occurrences of each digit
     for i in range(n):
-        index = (arr[i] // exp) % 10
+        index = (arr[i] // exp) % base
         count[index] += 1
     
     # Change count[i] so that it contains the position of this digit in output
-    for i in range(1, 10):
+    for i in range(1, base):
         count[i] += count[i - 1]
     
     # Build the output array
     # Process array in reverse to maintain stability
     i = n - 1
     while i >= 0:
-        index = (arr[i] // exp) % 10
+        index = (arr[i] // exp) % base
         output[count[index] - 1] = arr[i]
         count[index] -= 1
         i -= 1
@@ -35,29 +50,250 @@ def counting_sort(arr, exp):
     for i in range(n):
         arr[i] = output[i]
 
-def radix_sort(arr):
+def counting_sort_indices(order, keys, exp, base=10, reverse=False):
+    """
+    Stable counting sort of an index array by the digit at position exp of keys[index].
+    
+    Args:
+        order: Indices into keys, in their current order
+        keys: Non-negative integer keys, parallel to the array being sorted
+        exp: The current digit position
+        base: Radix of the digits (default: 10)
+        reverse: Order digits from largest to smallest (default: False)
+    
+    Returns:
+        list: The indices reordered by that digit
+    """
+    count = [0] * base
+    top = base - 1
+    
+    # Store count of occurrences of each digit
+    for i in order:
+        digit = (keys[i] // exp) % base
+        count[top - digit if reverse else digit] += 1
+    
+    # Change count[i] so that it contains the position of this digit in output
+    for i in range(1, base):
+        count[i] += count[i - 1]
+    
+    # Build the output array, processing in reverse to maintain stability
+    output = [0] * len(order)
+    for i in reversed(order):
+        digit = (keys[i] // exp) % base
+        if reverse:
+            digit = top - digit
+        output[count[digit] - 1] = i
+        count[digit] -= 1
+    return output
+
+def _key_kind(keys):
+    # Which radix strategy the keys need: 'int', 'float', 'str' or 'bytes'
+    kinds = set(map(type, keys))
+    if all(hasattr(kind, '__index__') for kind in kinds):
+        return 'int'
+    if all(hasattr(kind, '__index__') or issubclass(kind, numbers.Real) for kind in kinds):
+        return 'float'
+    if all(issubclass(kind, str) for kind in kinds):
+        return 'str'
+    if all(issubclass(kind, (bytes, bytearray)) for kind in kinds):
+        return 'bytes'
+    raise TypeError(f"radix_sort needs int, float, str or bytes keys, got {sorted(kind.__name__ for kind in kinds)}")
+
+def float_bits(keys):
+    """
+    Map floats to unsigned 64-bit integers with the same order (IEEE-754 bit transform):
+    negative numbers have all bits flipped, non-negative ones get the sign bit set.
+    -0.0 is folded into 0.0 so both compare equal, as they do as floats.
+    
+    Non-float keys (ints mixed with floats, Fractions, ...) must convert to a float
+    exactly, otherwise the transform could reorder them: ints beyond 2**53 that a float
+    cannot represent raise ValueError instead of being sorted silently wrong.
+    """
+    values = []
+    for k in keys:
+        try:
+            value = float(k) + 0.0
+        except OverflowError:
+            value = None
+        if value is None or not isinstance(k, float) and value != k:
+            raise ValueError(f"radix_sort cannot order {type(k).__name__} keys that are not exactly "
+                             "floats among float keys; use a comparison sort for such mixed keys")
+        values.append(value)
+    bits = array('Q', array('d', values).tobytes())
+    return [b ^ FLOAT_MASK if b >> 63 else b | FLOAT_SIGN for b in bits]
+
+def _lsd_order(keys, base, reverse=False):
+    # Stable order of positions by non-negative integer keys, least significant digit first
+    order = list(range(len(keys)))
+    max_key = max(keys, default=0)
+    exp = 1
+    while max_key // exp > 0:
+        order = counting_sort_indices(order, keys, exp, base, reverse)
+        exp *= base
+    return order
+
+def _lsd_order_bits(keys, key_bits, digit_bits, reverse=False):
+    # _lsd_order() for fixed-width keys: digits come from shifts and masks, which stay
+    # cheap on 64-bit values where // and % on Python ints do not
+    mask = (1 << digit_bits) - 1
+    order = list(range(len(keys)))
+    for shift in range(0, key_bits, digit_bits):
+        digits = [(k >> shift) & mask for k in keys]
+        if reverse:
+            digits = [mask - digit for digit in digits]
+        
+        # Starting position of every digit in the output
+        count = [0] * (mask + 1)
+        for i in order:
+            count[digits[i]] += 1
+        total = 0
+        for digit in range(mask + 1):
+            count[digit], total = total, total + count[digit]
+        
+        output = [0] * len(order)
+        for i in order:
+            digit = digits[i]
+            output[count[digit]] = i
+            count[digit] += 1
+        order = output
+    return order
+
+def msd_order(keys):
+    """
+    Stable order of positions by str/bytes keys with an MSD radix sort over their bytes.
+    
+    Strings are compared as UTF-8, whose byte order matches code point order. Each
+    bucket is split on its next byte (a key that has ended sorts first); buckets of at
+    most MSD_CUTOFF keys are finished with insertion sort instead.
+    
+    Args:
+        keys: str or bytes keys
+    
+    Returns:
+        list: Positions of keys in sorted order
+    """
+    keys = [k.encode() if isinstance(k, str) else bytes(k) for k in keys]
+    order = list(range(len(keys)))
+    stack = [(0, len(keys), 0)]
+    
+    while stack:
+        low, high, depth = stack.pop()
+        if high - low <= MSD_CUTOFF:
+            # Small bucket: every key in it shares its first depth bytes
+            insertion_sort(order, low, high, key=keys.__getitem__)
+            continue
+        
+        # Bucket 0 holds keys that end at this depth, bucket b + 1 those with next byte b
+        count = [0] * 257
+        for i in order[low:high]:
+            k = keys[i]
+            count[k[depth] + 1 if depth < len(k) else 0] += 1
+        
+        starts = [0] * 257
+        total = low
+        for bucket in range(257):
+            starts[bucket] = total
+            total += count[bucket]
+        
+        output = [0] * (high - low)
+        positions = [start - low for start in starts]
+        for i in order[low:high]:
+            k = keys[i]
+            bucket = k[depth] + 1 if depth < len(k) else 0
+            output[positions[bucket]] = i
+            positions[bucket] += 1
+        order[low:high] = output
+        
+        # Ended keys are all equal; every other bucket is split on the next byte
+        for bucket in range(1, 257):
+            if count[bucket] > 1:
+                stack.append((starts[bucket], starts[bucket] + count[bucket], depth + 1))
+    
+    return order
+
+def radix_order(keys, base=None, reverse=False):
+    """
+    Stable sorting permutation of int, float, str or bytes keys: position i of the
+    result is the index of the key that belongs at position i.
+    
+    Args:
+        keys: The keys (a sequence; it is not modified)
+        base: Radix for integer keys (default: this machine's tuned value, 10 if untuned)
+        reverse: Descending order, keeping equal keys in their original order (default: False)
+    
+    Returns:
+        list: Indices into keys in sorted order
+    """
+    if base is None:
+        base = TUNED['radix_base']
+    if len(keys) == 0:
+        return []
+    
+    kind = _key_kind(keys)
+    if kind == 'int':
+        low = min(keys)
+        return _lsd_order([k - low for k in keys] if low < 0 else keys, base, reverse)
+    if kind == 'float':
+        return _lsd_order_bits(float_bits(keys), 64, FLOAT_DIGIT_BITS, reverse)
+    if reverse:
+        # Reverse trick: a stable ascending sort of the reversed input, read backwards,
+        # is descending with equal keys still in their original order
+        order = [len(keys) - 1 - i for i in msd_order(keys[::-1])]
+        order.reverse()
+        return order
+    return msd_order(keys)
+
+def radix_sort(arr, base=None, key=None, reverse=False):
     """
     Sort an array using the Radix Sort algorithm.
     
+    Non-negative integers are sorted in place digit by digit. Other keys are sorted
+    through an index array (see radix_order()): negative integers are biased by the
+    minimum, floats go through an order-preserving IEEE-754 bit transform, and
+    str/bytes keys use an MSD radix sort over their bytes.
+    
     Args:
-        arr: The array to sort (must contain non-negative integers)
+        arr: The array to sort (integers, floats, strings or bytes, or elements whose
+             key is one of those)
+        base: Radix for integer keys; larger bases mean fewer passes over bigger count
+              arrays (default: this machine's tuned value, 10 if untuned)
+        key: Function computing the sort key of an element, called once per element
+        reverse: Sort in descending order, keeping equal elements in their original
+                 order (default: False)
     """
-    # Find the maximum number to know the number of digits
-    if not arr:
+    if base is None:
+        base = TUNED['radix_base']
+    
+    if len(arr) == 0:
         return
+    
+    keys = arr if key is None else [key(value) for value in arr]
+    if key is None and not reverse and _key_kind(keys) == 'int' and min(keys) >= 0:
+        # Find the maximum number to know the number of digits
+        max_num = max(arr)
         
-    max_num = max(arr)
+        # Do counting sort for every digit
+        # exp is base^i where i is the current digit position
+        exp = 1
+        while max_num // exp > 0:
+            counting_sort(arr, exp, base)
+            exp *= base
+        return
     
-    # Do counting sort for every digit
-    # exp is 10^i where i is the current digit position
-    exp = 1
-    while max_num // exp > 0:
-        counting_sort(arr, exp)
-        exp *= 10
+    # Sort an index array over the keys, then apply it to the values
+    order = radix_order(keys, base, reverse)
+    values = list(arr)
+    for position, i in enumerate(order):
+        arr[position] = values[i]
 
 # Example usage
 if __name__ == "__main__":
     arr = [170, 45, 75, 90, 802, 24, 2, 66]
     print("Unsorted array:", arr)
     radix_sort(arr)
-    print("Sorted array:", arr)
\ No newline at end of file
+    print("Sorted array:", arr)
+    
+    for arr in ([3, -7, 0, -2, 5], [2.5, -0.5, 1e-9, -3.75, 0.0], ["pear", "apple", "", "äpfel", "app"]):
+        print("Unsorted array:", arr)
+        radix_sort(arr)
+        print("Sorted array:", arr)
\ No newline at end of file
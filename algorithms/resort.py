@@ -0,0 +1,53 @@
+from algorithms.merge_sort import _merge, merge_sort
+
+def resort(sorted_arr, inserts=(), deletes=(), updates=None, sort=merge_sort):
+    """
+    Bring an array that was sorted last cycle up to date after a small delta, without
+    sorting it from scratch.
+
+    Elements at deleted or updated positions are dropped while the untouched ones are
+    compacted in place (they stay sorted), only the delta (updated values plus inserts)
+    is sorted, and the two sorted runs are combined with merge sort's linear-time
+    _merge(). For a delta of k elements this costs O(n + k log k) instead of O(n log n).
+
+    Args:
+        sorted_arr: The previously sorted array, updated in place
+        inserts: New values to add
+        deletes: Positions in sorted_arr of elements to remove
+        updates (dict): Position in sorted_arr -> new value of that element
+        sort (callable): In-place sorting function for the delta (default: merge_sort)
+    """
+    updates = updates or {}
+    deletes = set(deletes)
+    changed = deletes.union(updates)
+    n = len(sorted_arr)
+    if any(not 0 <= position < n for position in changed):
+        raise IndexError("resort positions must index the previous sorted array")
+
+    # Compact the untouched elements to the front, preserving their order
+    kept = 0
+    if changed:
+        for position in range(n):
+            if position not in changed:
+                sorted_arr[kept] = sorted_arr[position]
+                kept += 1
+        del sorted_arr[kept:]
+    else:
+        kept = n
+
+    delta = [value for position, value in updates.items() if position not in deletes]
+    delta.extend(inserts)
+    if not delta:
+        return
+    sort(delta)
+
+    sorted_arr.extend(delta)
+    if kept:
+        _merge(sorted_arr, 0, kept - 1, len(sorted_arr) - 1)
+
+# Example usage
+if __name__ == "__main__":
+    arr = [1, 3, 5, 7, 9, 11, 13]
+    print("Sorted last cycle:", arr)
+    resort(arr, inserts=[6, 0], deletes=[2], updates={4: 14})
+    print("After inserting 6 and 0, deleting arr[2] and setting arr[4] = 14:", arr)
@@ -0,0 +1,164 @@
+import math
+
+from algorithms.heap_sort import heapify
+from algorithms.quick_sort import _median_of_medians, _median_of_three, _three_way, quick_sort
+
+# partial_sort() keeps a heap of the k smallest up to this fraction of n; above it,
+# nth_element() plus sorting the prefix is cheaper
+PARTIAL_SORT_HEAP_RATIO = 0.02
+
+def nth_element(arr, n, low=0, high=None):
+    """
+    Rearrange arr so that arr[n] is the element a full sort would put there, with no
+    larger element before it and no smaller element after it (introselect).
+
+    Quickselect with median-of-3 pivots and a three-way partition, so runs of equal
+    keys are settled in one pass; after 2*log2(size) partitions it switches to
+    median-of-medians pivots, which bounds the worst case at linear time.
+
+    Args:
+        arr: The array to rearrange
+        n: Index of the element to place
+        low: Index of the first element of the range to consider (default: 0)
+        high: Index of the last element of the range, inclusive (default: len(arr) - 1)
+
+    Returns:
+        The n-th smallest element
+    """
+    if high is None:
+        high = len(arr) - 1
+    if not low <= n <= high:
+        raise IndexError(f"nth_element index {n} outside [{low}, {high}]")
+
+    choose_pivot = _median_of_three
+    budget = 2 * int(math.log2(high - low + 1))
+
+    while low < high:
+        if budget == 0:
+            choose_pivot = _median_of_medians
+        budget -= 1
+
+        (left_low, left_high), (right_low, right_high) = _three_way(arr, low, high, choose_pivot)
+        if n <= left_high:
+            high = left_high
+        elif n >= right_low:
+            low = right_low
+        else:
+            # arr[n] lies in the block of elements equal to the pivot
+            break
+
+    return arr[n]
+
+def partial_sort(arr, k):
+    """
+    Rearrange arr so that arr[:k] holds its k smallest elements in sorted order; the
+    order of the rest is unspecified.
+
+    Small k keep a max-heap of the k smallest (O(n log k)); larger k select the k-th
+    element with nth_element() and quick sort the prefix (O(n + k log k)).
+
+    Args:
+        arr: The array to rearrange
+        k: Number of leading elements to sort
+    """
+    n = len(arr)
+    k = min(k, n)
+    if k <= 0:
+        return
+
+    if k > n * PARTIAL_SORT_HEAP_RATIO:
+        nth_element(arr, k - 1)
+        prefix = arr[:k]
+        quick_sort(prefix)
+        arr[:k] = prefix
+        return
+
+    # Build a max heap of the first k elements
+    for i in range((k - 2) // 2, -1, -1):
+        heapify(arr, k, i)
+
+    # Every smaller element replaces the largest of the current k smallest
+    for i in range(k, n):
+        if arr[i] < arr[0]:
+            arr[0], arr[i] = arr[i], arr[0]
+            heapify(arr, k, 0)
+
+    # Heap sort the k smallest in place
+    for i in range(k - 1, 0, -1):
+        arr[i], arr[0] = arr[0], arr[i]
+        heapify(arr, i, 0)
+
+def _min_heapify(arr, n, i):
+    # heapify() with the comparison reversed: sift arr[i] down the min-heap arr[0:n]
+    smallest = i
+    left = 2 * i + 1
+    right = 2 * i + 2
+
+    if left < n and arr[left] < arr[smallest]:
+        smallest = left
+    if right < n and arr[right] < arr[smallest]:
+        smallest = right
+
+    if smallest != i:
+        arr[i], arr[smallest] = arr[smallest], arr[i]
+        _min_heapify(arr, n, smallest)
+
+def top_k(iterable, k, largest=False):
+    """
+    The k smallest (or largest) items of an iterable, consumed in one pass while
+    holding only k items, so it works on streams that do not fit in memory.
+
+    Args:
+        iterable: Items to select from (consumed once)
+        k: Number of items to keep
+        largest: Keep the k largest instead of the k smallest (default: False)
+
+    Returns:
+        list: The selected items, smallest first (largest first if largest=True)
+    """
+    if k <= 0:
+        return []
+
+    items = iter(iterable)
+    heap = []
+    for value in items:
+        heap.append(value)
+        if len(heap) == k:
+            break
+    size = len(heap)
+
+    # Root holds the item closest to being evicted: a max heap keeps the k smallest
+    sift = _min_heapify if largest else heapify
+    for i in range((size - 2) // 2, -1, -1):
+        sift(heap, size, i)
+
+    if largest:
+        for value in items:
+            if value > heap[0]:
+                heap[0] = value
+                _min_heapify(heap, size, 0)
+    else:
+        for value in items:
+            if value < heap[0]:
+                heap[0] = value
+                heapify(heap, size, 0)
+
+    # Extract in place: a max heap ends ascending, a min heap descending
+    for i in range(size - 1, 0, -1):
+        heap[i], heap[0] = heap[0], heap[i]
+        sift(heap, i, 0)
+    return heap
+
+# Example usage
+if __name__ == "__main__":
+    arr = [10, 7, 8, 9, 1, 5, 3, 3, 12]
+    print("Array:", arr)
+
+    median = nth_element(arr.copy(), len(arr) // 2)
+    print("Median (nth_element):", median)
+
+    arr2 = arr.copy()
+    partial_sort(arr2, 3)
+    print("Three smallest (partial_sort):", arr2[:3])
+
+    print("Three largest (top_k):", top_k(iter(arr), 3, largest=True))
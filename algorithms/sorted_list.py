@@ -0,0 +1,316 @@
+from bisect import bisect_left, bisect_right, insort
+from itertools import chain, islice
+
+from algorithms.merge_sort import merge_sort
+
+# Target block size: blocks are split above twice this and merged below half of it
+SORTED_LIST_LOAD = 512
+
+
+def _merge_sorted(left, right):
+    # Linear merge of two sorted lists into a new list (left first on ties)
+    merged = []
+    i = j = 0
+    while i < len(left) and j < len(right):
+        if right[j] < left[i]:
+            merged.append(right[j])
+            j += 1
+        else:
+            merged.append(left[i])
+            i += 1
+    merged.extend(left[i:])
+    merged.extend(right[j:])
+    return merged
+
+
+class SortedList:
+    """
+    Sorted container for data arriving continuously: a list of sorted blocks of about
+    SORTED_LIST_LOAD elements, the maximum of every block, and a positional index
+    (a Fenwick tree over the block lengths).
+
+    Inserting or removing bisects the block maxima, then the block, and touches only
+    that block, so updates cost O(log n) plus a block-sized memmove. The positional
+    index answers "how many elements precede block b" and "which block holds
+    position i" in O(log(n / load)); it is updated in place on inserts and removes
+    and rebuilt lazily after a block is split or merged.
+
+    Bulk loading (the constructor and update() with large batches) sorts the new
+    values with one of the repository's sorting functions and merges them in.
+    """
+
+    def __init__(self, iterable=None, load=SORTED_LIST_LOAD, sort=merge_sort):
+        """
+        Args:
+            iterable: Initial values (default: empty)
+            load: Target block size (default: SORTED_LIST_LOAD)
+            sort (callable): In-place sorting function used for bulk loads (default: merge_sort)
+        """
+        self._load = load
+        self._sort = sort
+        self._len = 0
+        self._lists = []
+        self._maxes = []
+        self._index = None
+        if iterable is not None:
+            self.update(iterable)
+
+    def __len__(self):
+        return self._len
+
+    def __iter__(self):
+        return chain.from_iterable(self._lists)
+
+    def __reversed__(self):
+        return chain.from_iterable(reversed(block) for block in reversed(self._lists))
+
+    def __contains__(self, value):
+        pos = bisect_left(self._maxes, value)
+        if pos == len(self._maxes):
+            return False
+        block = self._lists[pos]
+        return block[bisect_left(block, value)] == value
+
+    def __getitem__(self, index):
+        pos, offset = self._locate(self._normalize(index))
+        return self._lists[pos][offset]
+
+    def __repr__(self):
+        return f"SortedList({list(self)!r})"
+
+    # Positional index
+
+    def _build_index(self):
+        tree = [0] + [len(block) for block in self._lists]
+        for i in range(1, len(tree)):
+            parent = i + (i & -i)
+            if parent < len(tree):
+                tree[parent] += tree[i]
+        self._index = tree
+        return tree
+
+    def _index_add(self, pos, delta):
+        tree = self._index
+        if tree is None:
+            return
+        i = pos + 1
+        while i < len(tree):
+            tree[i] += delta
+            i += i & -i
+
+    def _offset(self, pos):
+        # Number of elements in the blocks before block pos
+        tree = self._index or self._build_index()
+        total = 0
+        while pos > 0:
+            total += tree[pos]
+            pos -= pos & -pos
+        return total
+
+    def _locate(self, index):
+        # Position in the whole list -> (block, offset within the block)
+        tree = self._index or self._build_index()
+        pos = 0
+        step = 1 << (len(tree) - 1).bit_length()
+        while step:
+            candidate = pos + step
+            if candidate < len(tree) and tree[candidate] <= index:
+                pos = candidate
+                index -= tree[candidate]
+            step >>= 1
+        return pos, index
+
+    def _normalize(self, index):
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError("SortedList index out of range")
+        return index
+
+    # Block maintenance
+
+    def _rebalance(self, pos):
+        # Split an oversized block or join an undersized one with a neighbour
+        block = self._lists[pos]
+        if len(block) > 2 * self._load:
+            half = len(block) // 2
+            self._lists[pos:pos + 1] = [block[:half], block[half:]]
+            self._maxes[pos:pos + 1] = [block[half - 1], block[-1]]
+            self._index = None
+        elif len(block) < self._load // 2 and len(self._lists) > 1:
+            if pos == len(self._lists) - 1:
+                pos -= 1
+            self._lists[pos:pos + 2] = [self._lists[pos] + self._lists[pos + 1]]
+            self._maxes[pos:pos + 2] = [self._maxes[pos + 1]]
+            self._index = None
+            self._rebalance(pos)
+
+    def _delete(self, pos, offset):
+        block = self._lists[pos]
+        del block[offset]
+        self._len -= 1
+        if not block:
+            del self._lists[pos]
+            del self._maxes[pos]
+            self._index = None
+            return
+        self._maxes[pos] = block[-1]
+        self._index_add(pos, -1)
+        self._rebalance(pos)
+
+    # Updates
+
+    def add(self, value):
+        """
+        Insert one value, after any equal values already present.
+        """
+        if not self._maxes:
+            self._lists.append([value])
+            self._maxes.append(value)
+            self._index = None
+        else:
+            pos = bisect_right(self._maxes, value)
+            if pos == len(self._maxes):
+                # New maximum: append to the last block
+                pos -= 1
+                self._lists[pos].append(value)
+                self._maxes[pos] = value
+            else:
+                insort(self._lists[pos], value)
+            self._index_add(pos, 1)
+            self._rebalance(pos)
+        self._len += 1
+
+    def update(self, iterable):
+        """
+        Insert many values. Batches small next to the container are inserted one by
+        one; larger ones are sorted with the bulk-load sort, merged with the current
+        contents in linear time and re-cut into blocks.
+        """
+        values = list(iterable)
+        if not values:
+            return
+        if len(values) * self._load < self._len:
+            for value in values:
+                self.add(value)
+            return
+
+        self._sort(values)
+        if self._len:
+            values = _merge_sorted(list(self), values)
+        load = self._load
+        self._lists = [values[i:i + load] for i in range(0, len(values), load)]
+        self._maxes = [block[-1] for block in self._lists]
+        self._len = len(values)
+        self._index = None
+
+    def discard(self, value):
+        """
+        Remove one occurrence of value if present.
+
+        Returns:
+            bool: Whether a value was removed
+        """
+        pos = bisect_left(self._maxes, value)
+        if pos == len(self._maxes):
+            return False
+        block = self._lists[pos]
+        offset = bisect_left(block, value)
+        if block[offset] != value:
+            return False
+        self._delete(pos, offset)
+        return True
+
+    def remove(self, value):
+        """
+        Remove one occurrence of value; raises ValueError if it is not present.
+        """
+        if not self.discard(value):
+            raise ValueError(f"{value!r} not in SortedList")
+
+    def pop(self, index=-1):
+        """
+        Remove and return the value at a position (default: the largest value).
+        """
+        pos, offset = self._locate(self._normalize(index))
+        value = self._lists[pos][offset]
+        self._delete(pos, offset)
+        return value
+
+    def clear(self):
+        self._len = 0
+        self._lists = []
+        self._maxes = []
+        self._index = None
+
+    # Queries
+
+    def bisect_left(self, value):
+        """
+        Position at which value would be inserted before any equal values.
+        """
+        pos = bisect_left(self._maxes, value)
+        if pos == len(self._maxes):
+            return self._len
+        return self._offset(pos) + bisect_left(self._lists[pos], value)
+
+    def bisect_right(self, value):
+        """
+        Position at which value would be inserted after any equal values.
+        """
+        pos = bisect_right(self._maxes, value)
+        if pos == len(self._maxes):
+            return self._len
+        return self._offset(pos) + bisect_right(self._lists[pos], value)
+
+    def count(self, value):
+        return self.bisect_right(value) - self.bisect_left(value)
+
+    def index(self, value):
+        """
+        Position of the first occurrence of value; raises ValueError if it is not present.
+        """
+        position = self.bisect_left(value)
+        if position == self._len or self[position] != value:
+            raise ValueError(f"{value!r} not in SortedList")
+        return position
+
+    def islice(self, start=0, stop=None):
+        """
+        Iterate over the values at positions start .. stop - 1.
+        """
+        stop = self._len if stop is None else min(stop, self._len)
+        if start >= stop:
+            return iter(())
+        pos, offset = self._locate(start)
+        blocks = chain([self._lists[pos][offset:]], islice(self._lists, pos + 1, None))
+        return islice(chain.from_iterable(blocks), stop - start)
+
+    def irange(self, minimum=None, maximum=None, inclusive=(True, True)):
+        """
+        Iterate over the values between minimum and maximum in sorted order.
+
+        Args:
+            minimum: Lower bound (default: unbounded)
+            maximum: Upper bound (default: unbounded)
+            inclusive (tuple): Whether each bound is included (default: (True, True))
+        """
+        start = 0
+        if minimum is not None:
+            start = self.bisect_left(minimum) if inclusive[0] else self.bisect_right(minimum)
+        stop = self._len
+        if maximum is not None:
+            stop = self.bisect_right(maximum) if inclusive[1] else self.bisect_left(maximum)
+        return self.islice(start, stop)
+
+
+# Example usage
+if __name__ == "__main__":
+    readings = SortedList([10, 7, 8, 9, 1, 5])
+    print("Initial:", list(readings))
+    readings.update([3, 12, 6])
+    readings.add(4)
+    readings.remove(9)
+    print("After inserts and removes:", list(readings))
+    print("Median:", readings[len(readings) // 2])
+    print("Values in [4, 8):", list(readings.irange(4, 8, inclusive=(True, False))))
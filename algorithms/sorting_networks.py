@@ -0,0 +1,125 @@
+from algorithms.insert_sort import insertion_sort
+
+MAX_NETWORK_SIZE = 16
+
+# Optimal-size sorting networks (fewest known comparators) for 2..16 inputs, layer by layer.
+# 14 and 15 are Green's 16-input network with the top wires removed; every network
+# was checked exhaustively with the 0-1 principle.
+_GREEN_16 = [
+    [(0, 13), (1, 12), (2, 15), (3, 14), (4, 8), (5, 6), (7, 11), (9, 10)],
+    [(0, 5), (1, 7), (2, 9), (3, 4), (6, 13), (8, 14), (10, 15), (11, 12)],
+    [(0, 1), (2, 3), (4, 5), (6, 8), (7, 9), (10, 11), (12, 13), (14, 15)],
+    [(0, 2), (1, 3), (4, 10), (5, 11), (6, 7), (8, 9), (12, 14), (13, 15)],
+    [(1, 2), (3, 12), (4, 6), (5, 7), (8, 10), (9, 11), (13, 14)],
+    [(1, 4), (2, 6), (5, 8), (7, 10), (9, 13), (11, 14)],
+    [(2, 4), (3, 6), (9, 12), (11, 13)],
+    [(3, 5), (6, 8), (7, 9), (10, 12)],
+    [(3, 4), (5, 6), (7, 8), (9, 10), (11, 12)],
+    [(6, 7), (8, 9)],
+]
+
+
+def _drop_wires(layers, size):
+    # A comparator (i, j) with j >= size never moves a +infinity sentinel, so it can be removed
+    return [[(i, j) for i, j in layer if j < size] for layer in layers]
+
+
+NETWORKS = {
+    2: [[(0, 1)]],
+    3: [[(0, 2)], [(0, 1)], [(1, 2)]],
+    4: [[(0, 2), (1, 3)], [(0, 1), (2, 3)], [(1, 2)]],
+    5: [[(0, 3), (1, 4)], [(0, 2), (1, 3)], [(0, 1), (2, 4)], [(1, 2), (3, 4)], [(2, 3)]],
+    6: [[(0, 5), (1, 3), (2, 4)], [(1, 2), (3, 4)], [(0, 3), (2, 5)], [(0, 1), (2, 3), (4, 5)], [(1, 2), (3, 4)]],
+    7: [[(0, 6), (2, 3), (4, 5)], [(0, 2), (1, 4), (3, 6)], [(0, 1), (2, 5), (3, 4)], [(1, 2), (4, 6)],
+        [(2, 3), (4, 5)], [(1, 2), (3, 4), (5, 6)]],
+    8: [[(0, 2), (1, 3), (4, 6), (5, 7)], [(0, 4), (1, 5), (2, 6), (3, 7)], [(0, 1), (2, 3), (4, 5), (6, 7)],
+        [(2, 4), (3, 5)], [(1, 4), (3, 6)], [(1, 2), (3, 4), (5, 6)]],
+    9: [[(0, 3), (1, 7), (2, 5), (4, 8)], [(0, 7), (2, 4), (3, 8), (5, 6)], [(0, 2), (1, 3), (4, 5), (7, 8)],
+        [(1, 4), (3, 6), (5, 7)], [(0, 1), (2, 4), (3, 5), (6, 8)], [(2, 3), (4, 5), (6, 7)], [(1, 2), (3, 4), (5, 6)]],
+    10: [[(4, 9), (3, 8), (2, 7), (1, 6), (0, 5)], [(1, 4), (6, 9), (0, 3), (5, 8)], [(0, 2), (3, 6), (7, 9)],
+         [(0, 1), (2, 4), (5, 7), (8, 9)], [(1, 2), (4, 6), (7, 8), (3, 5)], [(2, 5), (6, 8), (1, 3), (4, 7)],
+         [(2, 3), (6, 7)], [(3, 4), (5, 6)], [(4, 5)]],
+    11: [[(0, 9), (1, 6), (2, 4), (3, 7), (5, 8)], [(0, 1), (3, 5), (4, 10), (6, 9), (7, 8)],
+         [(1, 3), (2, 5), (4, 7), (8, 10)], [(0, 4), (1, 2), (3, 7), (5, 9), (6, 8)],
+         [(0, 1), (2, 6), (4, 5), (7, 8), (9, 10)], [(2, 4), (3, 6), (5, 7), (8, 9)],
+         [(1, 2), (3, 4), (5, 6), (7, 8)], [(2, 3), (4, 5), (6, 7)]],
+    12: [[(0, 8), (1, 7), (2, 6), (3, 11), (4, 10), (5, 9)], [(0, 1), (2, 5), (3, 4), (6, 9), (7, 8), (10, 11)],
+         [(0, 2), (1, 6), (5, 10), (9, 11)], [(0, 3), (1, 2), (4, 6), (5, 7), (8, 11), (9, 10)],
+         [(1, 4), (3, 5), (6, 8), (7, 10)], [(1, 3), (2, 5), (6, 9), (8, 10)], [(2, 3), (4, 5), (6, 7), (8, 9)],
+         [(4, 6), (5, 7)], [(3, 4), (5, 6), (7, 8)]],
+    13: [[(0, 12), (1, 10), (2, 9), (3, 7), (5, 11), (6, 8)], [(1, 6), (2, 3), (4, 11), (7, 9), (8, 10)],
+         [(0, 4), (1, 2), (3, 6), (7, 8), (9, 10), (11, 12)], [(4, 6), (5, 9), (8, 11), (10, 12)],
+         [(0, 5), (3, 8), (4, 7), (6, 11), (9, 10)], [(0, 1), (2, 5), (6, 9), (7, 8), (10, 11)],
+         [(1, 3), (2, 4), (5, 6), (9, 10)], [(1, 2), (3, 4), (5, 7), (6, 8)], [(2, 3), (4, 5), (6, 7), (8, 9)],
+         [(3, 4), (5, 6)]],
+    14: _drop_wires(_GREEN_16, 14),
+    15: _drop_wires(_GREEN_16, 15),
+    16: _GREEN_16,
+}
+
+
+def _generate_kernel(size):
+    """
+    Generate straight-line Python for one network: load the elements into locals,
+    run every compare-exchange as a plain if, and store them back.
+    """
+    names = [f"x{i}" for i in range(size)]
+    lines = [f"def _network_{size}(a, lo):"]
+    lines += [f"    {name} = a[lo + {i}]" for i, name in enumerate(names)]
+    for layer in NETWORKS[size]:
+        for i, j in layer:
+            lines.append(f"    if {names[i]} > {names[j]}: {names[i]}, {names[j]} = {names[j]}, {names[i]}")
+    # Element-wise stores work for lists, array.array, NumPy arrays and memoryviews alike
+    lines += [f"    a[lo + {i}] = {name}" for i, name in enumerate(names)]
+    return "\n".join(lines) + "\n"
+
+
+def _compile_kernels():
+    kernels = {}
+    for size in NETWORKS:
+        namespace = {}
+        exec(compile(_generate_kernel(size), f"<sorting network {size}>", "exec"), namespace)
+        kernels[size] = namespace[f"_network_{size}"]
+    return kernels
+
+
+_KERNELS = _compile_kernels()
+
+
+def network_sort(arr, low, high):
+    """
+    Sort arr[low..high] (inclusive) with the sorting network for that size.
+
+    Args:
+        arr: The array to sort
+        low: Index of the first element
+        high: Index of the last element; at most MAX_NETWORK_SIZE elements
+    """
+    size = high - low + 1
+    if size > 1:
+        _KERNELS[size](arr, low)
+
+
+def small_sort(arr, low, high):
+    """
+    Base case shared by the divide-and-conquer sorts: a sorting network for up to
+    MAX_NETWORK_SIZE elements, insertion sort beyond that.
+
+    Args:
+        arr: The array to sort
+        low: Index of the first element
+        high: Index of the last element (inclusive)
+    """
+    if high - low + 1 <= MAX_NETWORK_SIZE:
+        network_sort(arr, low, high)
+    else:
+        insertion_sort(arr, low, high + 1)
+
+
+# Example usage
+if __name__ == "__main__":
+    print(_generate_kernel(4))
+    arr = [10, 7, 8, 9, 1, 5, 3]
+    print("Unsorted array:", arr)
+    network_sort(arr, 0, len(arr) - 1)
+    print("Sorted array:", arr)
@@ -0,0 +1,83 @@
+import json
+import os
+
+from algorithms.machine import machine_file
+
+# Parameter values used when this machine has not been tuned (utils/autotune.py)
+DEFAULTS = {
+    'radix_base': 10,
+    'quick_sort_pivot': 'median3',
+    'quick_sort_partition': 'lomuto',
+    'quick_sort_cutoff': 0,
+    'merge_sort_cutoff': 0,
+    'heap_sort_cutoff': 0,
+    'heap_arity': 2,
+}
+
+# Accepted values of the name-valued parameters (quick_sort's PIVOT_STRATEGIES and
+# PARTITION_SCHEMES; listed here because quick_sort imports this module)
+CHOICES = {
+    'quick_sort_pivot': ('first', 'random', 'median3', 'ninther', 'median_of_medians', 'sampled'),
+    'quick_sort_partition': ('lomuto', 'hoare', 'three_way', 'dual_pivot'),
+}
+
+# Old value -> current name, for tuning files written before a rename
+RENAMED = {
+    'quick_sort_pivot': {'median': 'median3'},
+}
+
+
+def _validate(name, value):
+    """
+    Map renamed values to their current name and reject values of the wrong kind, so a
+    stale tuning file falls back to DEFAULTS instead of failing inside an algorithm.
+
+    Returns:
+        The value to use, or None if it is not valid
+    """
+    value = RENAMED.get(name, {}).get(value, value)
+    if name in CHOICES:
+        return value if value in CHOICES[name] else None
+    if isinstance(value, bool) or not isinstance(value, int):
+        return None
+    return value
+
+
+def load_tuning(path=None):
+    """
+    Read the tuned parameters of this machine, filling anything missing or invalid from
+    DEFAULTS (invalid values are reported).
+
+    Args:
+        path (str): Tuning file (default: this machine's file under outputs/machines/)
+
+    Returns:
+        dict: Parameter name -> value
+    """
+    path = path or machine_file('tuning')
+    tuning = dict(DEFAULTS)
+    if os.path.exists(path):
+        with open(path) as file:
+            stored = json.load(file)
+        for name, value in stored.get('parameters', {}).items():
+            if name not in DEFAULTS:
+                continue
+            valid = _validate(name, value)
+            if valid is None:
+                print(f"Warning: Ignoring tuned {name}={value!r} from {path}, using {DEFAULTS[name]!r}")
+            else:
+                tuning[name] = valid
+    return tuning
+
+
+# Loaded once at import; the algorithms read their defaults from here on every call
+TUNED = load_tuning()
+
+
+def reload_tuning(path=None):
+    """
+    Re-read the tuning file in place, e.g. after the autotuner has written a new one.
+    """
+    TUNED.clear()
+    TUNED.update(load_tuning(path))
+    return TUNED
@@ -1,13 +1,19 @@
-from utils.load_testcases import load_testcases
-from utils.run_experiment import run_experiment
-from utils.plot_graph import plot_algorithm_comparison,plot_comparative_performance,plot_testcase_comparison,plot_arrangement_comparison,plot_overall_comparison,plot_quicksort_comparison
+from utils.load_testcases import load_testcase_views
+from utils.run_experiment import bind_params, run_experiment, run_parameter_sweep, save_results, timing_isolation
+from utils.journal import Journal, results_from_journal
+from utils.cost_model import fit_cost_model, save_cost_model
+from utils.presortedness import attach_presortedness
+from utils.profiler import profile_cell
+from utils.benchmarks import RECORD_KEYS, run_backend_experiment, run_batch_experiment, run_key_type_experiment, run_lexsort_experiment, run_memory_experiment, run_online_experiment, run_resort_experiment, run_quicksort_matrix, run_record_experiment, run_selection_experiment
+from utils.plot_graph import plot_algorithm_comparison,plot_comparative_performance,plot_testcase_comparison,plot_arrangement_comparison,plot_overall_comparison,plot_quicksort_comparison,plot_memory_comparison,plot_runtime_vs_disorder
 
-from algorithms.quick_sort import quick_sort_first_pivot, quick_sort_median_pivot, quick_sort_random_pivot
+from algorithms.quick_sort import quick_sort_first_pivot, quick_sort_median_pivot, quick_sort_random_pivot, seed_pivot_random
 from algorithms.radix_sort import radix_sort
-from algorithms.merge_sort import merge_sort
+from algorithms.merge_sort import inplace_merge_sort, merge_sort
 from algorithms.insert_sort import insertion_sort
 from algorithms.heap_sort import heap_sort
 from algorithms.bubble_sort import bubble_sort
+from algorithms.batch_sort import batch_sort, batch_radix_sort
 
 import platform
 from prettytable import PrettyTable
@@ -16,6 +22,14 @@ import numpy as np
 ITERATIONS_PER_TESTCASE=3
 WARMUP_PER_TESTCASE=0
 
+# Low-noise timing: GC disabled around timed runs, CPU pinning, priority and timer overhead subtraction
+TIMING_ISOLATION=True
+PIN_CPU=None            # CPU index to pin to, e.g. 0 (None leaves affinity unchanged)
+PRIORITY_INCREMENT=None # Niceness increment, e.g. -10 (needs privileges; None leaves priority unchanged)
+
+# Separate tracemalloc pass per cell recording peak/retained memory
+MEASURE_MEMORY=True
+
 FUNCTIONS=[
     bubble_sort,
     heap_sort,
@@ -33,9 +47,91 @@ TESTCASE_FILES = {
     'bst': 'testcases/bst.txt',
     'bst_reverse': 'testcases/bst_reverse.txt',
     'random': 'testcases/random.txt',
-    'all': 'testcases/complete_dataset.txt',
+    'antiqsort': 'testcases/antiqsort.txt',
+    'organ_pipe': 'testcases/organ_pipe.txt',
+    'sawtooth': 'testcases/sawtooth.txt',
+    'few_unique': 'testcases/few_unique.txt',
+    'nearly_sorted': 'testcases/nearly_sorted.txt',
+    'sorted_random_tail': 'testcases/sorted_random_tail.txt',
+    'zipf': 'testcases/zipf.txt',
+    'perturbed': 'testcases/perturbed.txt',
 }
 
+# Seed for the per-call seeds of randomized pivots (None: different on every run);
+# each timed iteration's seed is recorded in the results either way
+PIVOT_SEED = None
+
+# Virtual arrangement indexing every test case of the arrangements above
+ALL_ARRANGEMENT = 'all'
+
+# Raw results of the main experiment; the adaptive sort() cost model is fitted from them
+RESULTS_PATH = 'outputs/results.json'
+
+# Every measured cell of the main experiment is appended here (fsync'd in batches); the
+# analysis and plots are built from the journal. RESUME=True continues an interrupted
+# run from the first missing cell instead of starting afresh.
+JOURNAL_PATH = 'outputs/journal.jsonl'
+RESUME = False
+
+# Presortedness metrics plotted against runtime (see utils/presortedness.py)
+DISORDER_METRICS = ['inversion_ratio', 'run_ratio', 'displacement_ratio']
+
+# Small-subarray cutoffs (sorting network / insertion sort base case; insertion sort only for merge sort) swept on one arrangement
+CUTOFF_SWEEP_FUNCTIONS = [quick_sort_median_pivot, quick_sort_random_pivot, merge_sort, heap_sort]
+CUTOFF_SWEEP_VALUES = [0, 4, 8, 12, 16, 24, 32]
+CUTOFF_SWEEP_ARRANGEMENT = 'random'
+
+# Many-small-arrays throughput: batched sorts against looping the per-array functions
+BATCH_FUNCTIONS = [batch_sort, batch_radix_sort]
+BATCH_LOOPED_FUNCTIONS = [radix_sort, merge_sort, quick_sort_median_pivot]
+
+# Every pivot strategy x partition scheme of the quick sort engine, timed on all arrangements
+QUICKSORT_MATRIX_ITERATIONS = 1
+
+# Selection APIs (nth_element, partial_sort, top_k) against a full sort plus slice, per k / n
+SELECTION_RATIOS = [0.001, 0.01, 0.1, 0.5]
+SELECTION_ARRANGEMENT = 'random'
+
+# Sorting records by key= against wrapping them in objects with key-computing comparisons
+RECORD_SORT_FUNCTIONS = [merge_sort, heap_sort, quick_sort_median_pivot, radix_sort]
+RECORD_ARRANGEMENT = 'random'
+
+# Radix sort against comparison sorts on signed int, float and string keys
+KEY_TYPE_FUNCTIONS = [radix_sort, merge_sort, quick_sort_median_pivot]
+KEY_TYPE_ARRANGEMENT = 'random'
+
+# Multi-column sorting permutations: lexsort() passes against sorting tuples of the columns
+LEXSORT_TUPLE_FUNCTIONS = [merge_sort, quick_sort_median_pivot]
+LEXSORT_ARRANGEMENT = 'random'
+
+# Stable sorts compared on time and peak memory across all arrangements: merge_sort's O(n)
+# scratch against the in-place block merge sort with a √n buffer and with O(1) extra memory
+STABLE_SORT_FUNCTIONS = [merge_sort, inplace_merge_sort, bind_params(inplace_merge_sort, buffered=False)]
+
+# Every algorithm on every container backend (list, array('q'), NumPy int64, memoryview)
+BACKEND_ARRANGEMENT = 'random'
+
+# Continuously arriving data: SortedList inserts against re-sorting per batch, per batch size / n
+ONLINE_RESORT_FUNCTIONS = [merge_sort, quick_sort_median_pivot]
+ONLINE_BATCH_RATIOS = [0.01, 0.05, 0.25]
+ONLINE_ARRANGEMENT = 'random'
+
+# Incremental re-sort (sort the delta, merge it in) against sorting from scratch: random deltas per
+# delta size / n on one arrangement, plus the delta every 'perturbed' case applies to its ascending source
+RESORT_FUNCTIONS = [merge_sort, quick_sort_median_pivot, radix_sort]
+RESORT_FRACTIONS = [0.01, 0.05, 0.2]
+RESORT_ARRANGEMENT = 'random'
+RESORT_PERTURBED_ARRANGEMENT = 'perturbed'
+
+# (function name, arrangement, input size) cells profiled in a separate pass after timing
+PROFILE_CELLS = [
+    ('heap_sort', 'random', 2000),
+    ('merge_sort', 'random', 2000),
+    ('radix_sort', 'random', 2000),
+    ('quick_sort_median_pivot', 'antiqsort', 2000),
+]
+PROFILER = 'cprofile'  # 'cprofile' (.pstats + collapsed stacks) or 'sampling' (collapsed stacks)
+
 
 def analyze_results(results):
     """
@@ -58,7 +154,7 @@ def analyze_results(results):
                 input_size = case['input_size']
                 if input_size not in processed_all_results[func_name]:
                     processed_all_results[func_name][input_size] = []
-                processed_all_results[func_name][input_size].append((case['avg'], case['min'], case['max']))
+                processed_all_results[func_name][input_size].append((case['avg'], case['min'], case['max'], case['p99']))
         
         # Calculate aggregate statistics for each algorithm and input size
         final_all_results = {}
@@ -67,7 +163,8 @@ def analyze_results(results):
             for size, times_list in size_data.items():
                 avg_time = np.mean([t[0] for t in times_list])
                 std_dev = np.std([t[0] for t in times_list]) if len(times_list) > 1 else 0
-                final_all_results[func_name][size] = (avg_time, std_dev)
+                p99_time = np.mean([t[3] for t in times_list])
+                final_all_results[func_name][size] = (avg_time, std_dev, p99_time)
         
         # Extract all input sizes
         all_input_sizes = set()
@@ -81,18 +178,19 @@ def analyze_results(results):
         
         # Create a table for performance comparison
         table = PrettyTable()
-        table.field_names = ["Algorithm", "Avg Time (s)", "Best Time (s)", "Worst Time (s)"]
+        table.field_names = ["Algorithm", "Avg Time (s)", "Best Time (s)", "Worst Time (s)", "Avg P99 Time (s)"]
         
         # Calculate metrics for each algorithm
         for func_name, size_all_results in final_all_results.items():
             # Calculate average time across all input sizes
-            avg_time = np.mean([time for time, _ in size_all_results.values()])
+            avg_time = np.mean([time for time, _, _ in size_all_results.values()])
+            p99_time = np.mean([p99 for _, _, p99 in size_all_results.values()])
             
             # Find best and worst times
             best_time = float('inf')
             worst_time = 0
             
-            for size, (time, _) in size_all_results.items():
+            for size, (time, _, _) in size_all_results.items():
                 if time < best_time:
                     best_time = time
                 if time > worst_time:
@@ -113,6 +211,7 @@ def analyze_results(results):
                 f"{avg_time:.6f}", 
                 f"{best_time:.6f}", 
                 f"{worst_time:.6f}",
+                f"{p99_time:.6f}",
                 # f"{best_size}",
                 # f"{worst_size}"
             ])
@@ -147,7 +246,7 @@ def analyze_results(results):
 
 
 
-def display_machine_specs(testcases):
+def display_machine_specs(testcases, views=None, timing_settings=None):
     print("\n" + "="*80)
     print("EXPERIMENTAL SETUP INFORMATION".center(80))
     print("="*80)
@@ -159,7 +258,17 @@ def display_machine_specs(testcases):
 
     print(f"\n2. Timing Mechanism:")
     print(f"   - Using Python's time.perf_counter() for high-precision timing")
+    print(f"   - CPU time recorded alongside with time.process_time()")
     print(f"   - All times reported in seconds")
+    if timing_settings and timing_settings['isolated']:
+        print(f"   - Timing isolation: enabled")
+        print(f"   - Garbage collector: collected before and disabled during each timed run")
+        print(f"   - CPU affinity: {timing_settings['cpu_affinity'] if timing_settings['cpu_affinity'] is not None else 'not pinned'}")
+        print(f"   - Process priority: {timing_settings['priority'] if timing_settings['priority'] is not None else 'unchanged'}")
+        print(f"   - CPU spin-up before timing: {timing_settings['spin_seconds']:.2f} s")
+        print(f"   - Subtracted timer overhead per call: {timing_settings['timer_overhead'] * 1e9:.1f} ns")
+    else:
+        print(f"   - Timing isolation: disabled")
 
     print(f"\n3. Experiment Repetition:")
     print(f"   - Each sorting algorithm was run {ITERATIONS_PER_TESTCASE} times per input")
@@ -171,10 +280,16 @@ def display_machine_specs(testcases):
 
     print(f"\n5. Input Selection:")
     print(f"   - Number of different test cases: {len(testcases)}")
+    if views:
+        references = sum(len(view) for arrangement, view in views.items() if arrangement != ALL_ARRANGEMENT)
+        print(f"   - Test case references across arrangements: {references} (each unique input timed once)")
     if testcases:
         print(f"   - Input sizes range from {min(len(tc) for tc in testcases)} to {max(len(tc) for tc in testcases)}")
 
-    print(f"\n6. Input Consistency:")
+    print(f"\n6. Memory Measurement:")
+    print(f"   - " + ("Peak and retained traced memory measured with tracemalloc in a separate, untimed pass" if MEASURE_MEMORY else "Disabled"))
+
+    print(f"\n7. Input Consistency:")
     print(f"   - Same inputs were used for all sorting algorithms")
     print(f"   - Each algorithm was tested on identical data for fair comparison")
 
@@ -182,23 +297,100 @@ def display_machine_specs(testcases):
 
 if __name__=='__main__':
 
-    testcases={}
-    for arrangement,file in TESTCASE_FILES.items():
-        testcases[arrangement]=load_testcases(file)
+    testcases,views=load_testcase_views(TESTCASE_FILES, combined_view=ALL_ARRANGEMENT)
+    if PIVOT_SEED is not None:
+        seed_pivot_random(PIVOT_SEED)
+
+    print(f"Running experiment on {len(testcases)} unique test cases across {len(TESTCASE_FILES)} arrangements")
+    with Journal(JOURNAL_PATH, resume=RESUME) as journal, \
+            timing_isolation(enabled=TIMING_ISOLATION, cpu=PIN_CPU, priority=PRIORITY_INCREMENT) as timing_settings:
+        run_experiment(FUNCTIONS, testcases, iterations=ITERATIONS_PER_TESTCASE, warmup=WARMUP_PER_TESTCASE, views=views,
+                       isolate=TIMING_ISOLATION, timer_overhead=timing_settings['timer_overhead'],
+                       measure_memory=MEASURE_MEMORY, journal=journal)
+    print()
+
+    results = results_from_journal(JOURNAL_PATH, views, order=[func.__name__ for func in FUNCTIONS])
 
-    results={}
-    for arrangement,testcase in testcases.items():
-        print(f"Running experiment on {arrangement}")
-        results[arrangement]=run_experiment(FUNCTIONS, testcase, iterations=ITERATIONS_PER_TESTCASE, warmup=WARMUP_PER_TESTCASE)
-        print()
+    attach_presortedness(results, testcases)
+    save_results(results, RESULTS_PATH)
+    cost_model_path = save_cost_model(fit_cost_model(results, testcases, views, skip=(ALL_ARRANGEMENT,)))
+    print(f"Results saved as '{RESULTS_PATH}', cost model for adaptive sort() saved as '{cost_model_path}'")
 
-    display_machine_specs(testcases['all'])
+    display_machine_specs(list(testcases.values()), views, timing_settings)
 
     analyze_results(results)
 
-    plot_algorithm_comparison(results['all'],save_plots=True)
-    plot_comparative_performance(results['all'],save_plots=True)
+    plot_algorithm_comparison(results[ALL_ARRANGEMENT],save_plots=True)
+    plot_comparative_performance(results[ALL_ARRANGEMENT],save_plots=True)
     plot_testcase_comparison(results,save_plots=True)
     plot_arrangement_comparison(results,save_plots=True)
     plot_overall_comparison(results,save_plots=True)
     plot_quicksort_comparison(results,save_plots=True)
+    if MEASURE_MEMORY:
+        plot_memory_comparison(results[ALL_ARRANGEMENT],save_plots=True)
+        plot_memory_comparison(results[ALL_ARRANGEMENT],title="Allocations (sampled lower bound)",metric='sampled_allocations',save_plots=True)
+    for metric in DISORDER_METRICS:
+        plot_runtime_vs_disorder(results[ALL_ARRANGEMENT],metric=metric,save_plots=True)
+
+    sweep_cases = [testcases[fingerprint] for fingerprint in views[CUTOFF_SWEEP_ARRANGEMENT]]
+    print(f"Sweeping small-subarray cutoff on {CUTOFF_SWEEP_ARRANGEMENT}")
+    sweep_results, best_cutoffs = run_parameter_sweep(CUTOFF_SWEEP_FUNCTIONS, sweep_cases, 'cutoff', CUTOFF_SWEEP_VALUES,
+                                                      iterations=ITERATIONS_PER_TESTCASE, warmup=WARMUP_PER_TESTCASE)
+    for func_name, cutoff in best_cutoffs.items():
+        print(f"   - Best cutoff for {func_name}: {cutoff}")
+    plot_comparative_performance(sweep_results, title_prefix="Cutoff Sweep: ", save_plots=True, save_dir='outputs/cutoff_sweep_plots/')
+
+    matrix_results = run_quicksort_matrix(testcases, views, iterations=QUICKSORT_MATRIX_ITERATIONS)
+    plot_quicksort_comparison(matrix_results, title="Quicksort Pivot x Partition Matrix", save_plots=True,
+                              save_dir='outputs/quicksort_matrix_plots/')
+
+    selection_cases = [testcases[fingerprint] for fingerprint in views[SELECTION_ARRANGEMENT]]
+    selection_results = run_selection_experiment(selection_cases, SELECTION_RATIOS,
+                                                 iterations=ITERATIONS_PER_TESTCASE, warmup=WARMUP_PER_TESTCASE)
+    plot_testcase_comparison(selection_results, title_prefix="Selection: ", save_plots=True, save_dir='outputs/selection_plots/')
+
+    record_cases = [testcases[fingerprint] for fingerprint in views[RECORD_ARRANGEMENT]]
+    run_record_experiment(RECORD_SORT_FUNCTIONS, record_cases, RECORD_KEYS,
+                          iterations=ITERATIONS_PER_TESTCASE, warmup=WARMUP_PER_TESTCASE)
+
+    key_type_cases = [testcases[fingerprint] for fingerprint in views[KEY_TYPE_ARRANGEMENT]]
+    key_type_results = run_key_type_experiment(KEY_TYPE_FUNCTIONS, key_type_cases,
+                                               iterations=ITERATIONS_PER_TESTCASE, warmup=WARMUP_PER_TESTCASE)
+    plot_testcase_comparison(key_type_results, title_prefix="Key Type: ", save_plots=True, save_dir='outputs/key_type_plots/')
+
+    lexsort_cases = [testcases[fingerprint] for fingerprint in views[LEXSORT_ARRANGEMENT]]
+    run_lexsort_experiment(LEXSORT_TUPLE_FUNCTIONS, lexsort_cases,
+                           iterations=ITERATIONS_PER_TESTCASE, warmup=WARMUP_PER_TESTCASE)
+
+    stable_results = run_memory_experiment(STABLE_SORT_FUNCTIONS, testcases, views,
+                                           iterations=ITERATIONS_PER_TESTCASE, warmup=WARMUP_PER_TESTCASE)
+    plot_memory_comparison(stable_results[ALL_ARRANGEMENT], title="Stable Sorts: Peak Memory Usage", save_plots=True,
+                           save_dir='outputs/stable_sort_plots/')
+    plot_comparative_performance(stable_results[ALL_ARRANGEMENT], title_prefix="Stable Sorts: ", save_plots=True,
+                                 save_dir='outputs/stable_sort_plots/')
+
+    backend_cases = [testcases[fingerprint] for fingerprint in views[BACKEND_ARRANGEMENT]]
+    backend_results = run_backend_experiment(FUNCTIONS, backend_cases,
+                                             iterations=ITERATIONS_PER_TESTCASE, warmup=WARMUP_PER_TESTCASE)
+    plot_testcase_comparison(backend_results, title_prefix="Backend: ", save_plots=True, save_dir='outputs/backend_plots/')
+
+    online_cases = [testcases[fingerprint] for fingerprint in views[ONLINE_ARRANGEMENT]]
+    online_results = run_online_experiment(ONLINE_RESORT_FUNCTIONS, online_cases, ONLINE_BATCH_RATIOS,
+                                           iterations=ITERATIONS_PER_TESTCASE, warmup=WARMUP_PER_TESTCASE)
+    plot_testcase_comparison(online_results, title_prefix="Online: ", save_plots=True, save_dir='outputs/online_plots/')
+
+    resort_cases = [testcases[fingerprint] for fingerprint in views[RESORT_ARRANGEMENT]]
+    perturbed_cases = [testcases[fingerprint] for fingerprint in views[RESORT_PERTURBED_ARRANGEMENT]]
+    run_resort_experiment(RESORT_FUNCTIONS, resort_cases, RESORT_FRACTIONS,
+                          iterations=ITERATIONS_PER_TESTCASE, warmup=WARMUP_PER_TESTCASE,
+                          perturbed_cases=perturbed_cases)
+
+    run_batch_experiment(BATCH_FUNCTIONS, BATCH_LOOPED_FUNCTIONS, list(testcases.values()),
+                         iterations=ITERATIONS_PER_TESTCASE, warmup=WARMUP_PER_TESTCASE)
+
+    # Profiling runs last so it can never perturb the timings above
+    functions_by_name = {func.__name__: func for func in FUNCTIONS}
+    for func_name, arrangement, size in PROFILE_CELLS:
+        arrangement_cases = [testcases[fingerprint] for fingerprint in views[arrangement]]
+        outputs = profile_cell(functions_by_name[func_name], arrangement_cases, size, arrangement, profiler=PROFILER)
+        print(f"Profile of {func_name} on {arrangement} (n={outputs['input_size']}) saved as '{outputs['collapsed']}'")
@@ -1,94 +1,340 @@
-import random
-from tqdm import tqdm
+import argparse
 import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+from tqdm import tqdm
+
+# Allow running as `python utils/Test_Generator.py` from the repository root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from algorithms.quick_sort import quick_sort_median_pivot
 
 STEP_SIZE = 50
 START = 50
 END = 2000
+MAX_ELEMENTS = 10**8
+MAX_ANTIQSORT_ELEMENTS = 20_000  # Building the adversary is quadratic; larger sizes are skipped
+
+SAVE_DIR = 'testcases/'
+WRITE_CHUNK_SIZE = 1 << 20  # Elements formatted per write() call
 
 def generator_1(element_count): # Generates list sorted in increasing order
-    arr = []
-    for element in range(1,element_count+1):
-        arr.append(element)
-    return arr
+    return np.arange(1, element_count + 1, dtype=np.int64)
 
 def generator_2(element_count): # Generates list sorted in decreasing order
-    arr = []
-    for element in range(element_count, 0, -1):
-        arr.append(element)
-    return arr
+    return np.arange(element_count, 0, -1, dtype=np.int64)
 
-def generator_3(element_count): # Generates list as if the elements were obtained from preorder traversal of balanced BST
-    arr = []
-
-    def bst_traversal(lower, upper):
-        if lower > upper:
-            return
-        mid = (lower+upper)//2
-        arr.append(mid)
-        bst_traversal(lower, mid-1)
-        bst_traversal(mid+1, upper)
-    
-    bst_traversal(1, element_count)
+def _bst_traversal(element_count, postorder=False):
+    """
+    Iterative, level-by-level construction of a balanced BST traversal over 1..element_count.
+
+    Every subtree [lower, upper] rooted at mid = (lower+upper)//2 owns a contiguous
+    slice of the output, so a whole tree level can be placed with a few vectorized
+    operations instead of one recursive call per node.
+
+    Args:
+        element_count (int): Number of nodes in the tree
+        postorder (bool): Emit right subtree, left subtree, root (as the original
+                          generator_4 did) instead of root, left subtree, right subtree
+
+    Returns:
+        numpy.ndarray: The traversal as an int64 array
+    """
+    arr = np.empty(element_count, dtype=np.int64)
+    if element_count == 0:
+        return arr
+    lower = np.array([1], dtype=np.int64)
+    upper = np.array([element_count], dtype=np.int64)
+    offset = np.array([0], dtype=np.int64)  # Start of each subtree's slice in arr
+
+    while lower.size:
+        mid = (lower + upper) // 2
+        left_size = mid - lower
+        right_size = upper - mid
+
+        if postorder:
+            arr[offset + left_size + right_size] = mid
+            left_offset = offset + right_size
+            right_offset = offset
+        else:
+            arr[offset] = mid
+            left_offset = offset + 1
+            right_offset = offset + 1 + left_size
+
+        # Children of the next level, dropping empty subtrees
+        has_left = left_size > 0
+        has_right = right_size > 0
+        lower = np.concatenate((lower[has_left], mid[has_right] + 1))
+        upper = np.concatenate((mid[has_left] - 1, upper[has_right]))
+        offset = np.concatenate((left_offset[has_left], right_offset[has_right]))
 
     return arr
 
+def generator_3(element_count): # Generates list as if the elements were obtained from preorder traversal of balanced BST
+    return _bst_traversal(element_count)
+
 def generator_4(element_count): # Generates list as if the elements were obtained from postorder traversal of balanced BST
-    arr = []
-
-    def bst_traversal(lower, upper):
-        if lower > upper:
-            return
-        mid = (lower+upper)//2
-        bst_traversal(mid+1, upper)
-        bst_traversal(lower, mid-1)
-        arr.append(mid)
-
-    bst_traversal(1, element_count)
-    
-    return arr
+    return _bst_traversal(element_count, postorder=True)
 
 def generator_5(element_count, seed=42): # Generates list with elements arranged randomly
-    arr = list(range(1, element_count + 1))
-    
-    random.seed(seed)
-    random.shuffle(arr)
-    
+    rng = np.random.default_rng(seed)
+    return rng.permutation(element_count).astype(np.int64) + 1
+
+def random_case_count(element_count): # Dynamically varying the number of randomly generated examples
+    return int(pow(element_count, 0.25)) + 2
+
+def _seed(family, element_count, arr_num=0):
+    # Distinct, reproducible seed per (family, size, example) so no two random cases repeat
+    return (FAMILY_SEEDS[family], element_count, arr_num)
+
+def _random_cases(element_count):
+    for arr_num in range(random_case_count(element_count)):
+        yield generator_5(element_count, seed=_seed('random', element_count, arr_num))
+
+class _Gas:
+    """
+    Element whose value is decided lazily by McIlroy's adversary while the sort runs.
+    Python's comparison operators are routed to the adversary so unmodified sort
+    functions can be attacked.
+    """
+    __slots__ = ('index', 'adversary')
+
+    def __init__(self, index, adversary):
+        self.index = index
+        self.adversary = adversary
+
+    def __lt__(self, other):
+        return self.adversary.compare(self.index, other.index) < 0
+
+    def __le__(self, other):
+        return self.adversary.compare(self.index, other.index) <= 0
+
+    def __gt__(self, other):
+        return self.adversary.compare(self.index, other.index) > 0
+
+    def __ge__(self, other):
+        return self.adversary.compare(self.index, other.index) >= 0
+
+class _AntiQsort:
+    """
+    McIlroy's "A Killer Adversary for Quicksort" (1999). All values start as "gas"
+    (larger than anything frozen). Whenever two gas values are compared, one is frozen
+    to the next smallest solid value, preferring to keep the likely pivot candidate as
+    gas so every partition is as lopsided as possible.
+    """
+    def __init__(self, element_count):
+        self.gas = element_count + 1
+        self.values = [self.gas] * element_count
+        self.solid = 1
+        self.candidate = 0
+
+    def _freeze(self, index):
+        self.values[index] = self.solid
+        self.solid += 1
+
+    def compare(self, x, y):
+        values = self.values
+        if values[x] == self.gas and values[y] == self.gas:
+            if x == self.candidate:
+                self._freeze(x)
+            else:
+                self._freeze(y)
+        if values[x] == self.gas:
+            self.candidate = x
+        elif values[y] == self.gas:
+            self.candidate = y
+        return values[x] - values[y]
+
+def generator_antiqsort(element_count, sort_func=quick_sort_median_pivot): # Generates McIlroy's adversarial input for sort_func (O(n^2) to build)
+    adversary = _AntiQsort(element_count)
+    sort_func([_Gas(i, adversary) for i in range(element_count)])
+
+    # Values never compared gas-to-gas can be frozen in any order without changing the trace
+    for i in range(element_count):
+        if adversary.values[i] == adversary.gas:
+            adversary._freeze(i)
+    return np.array(adversary.values, dtype=np.int64)
+
+def _antiqsort_cases(element_count): # Adversarial input, or nothing above MAX_ANTIQSORT_ELEMENTS
+    if element_count > MAX_ANTIQSORT_ELEMENTS:
+        return []
+    return [generator_antiqsort(element_count)]
+
+def generator_organ_pipe(element_count): # Generates list rising to the middle and falling back
+    half = (element_count + 1) // 2
+    return np.concatenate((np.arange(1, half + 1), np.arange(element_count - half, 0, -1))).astype(np.int64)
+
+def generator_sawtooth(element_count, period=None): # Generates repeated ascending runs of length period
+    if period is None:
+        period = max(2, int(np.sqrt(element_count)))
+    return np.arange(element_count, dtype=np.int64) % period + 1
+
+def generator_few_unique(element_count, unique=10, seed=42): # Generates random keys drawn from only `unique` distinct values
+    rng = np.random.default_rng(seed)
+    return rng.integers(1, unique + 1, size=element_count, dtype=np.int64)
+
+def generator_nearly_sorted(element_count, swaps=None, seed=42): # Generates ascending list with k random element swaps
+    if swaps is None:
+        swaps = max(1, element_count // 100)
+    rng = np.random.default_rng(seed)
+    arr = np.arange(1, element_count + 1, dtype=np.int64)
+    i = rng.integers(0, element_count, size=swaps)
+    j = rng.integers(0, element_count, size=swaps)
+    # Applied sequentially so overlapping swaps behave like k real swaps
+    for a, b in zip(i.tolist(), j.tolist()):
+        arr[a], arr[b] = arr[b], arr[a]
+    return arr
+
+def generator_sorted_random_tail(element_count, tail_fraction=0.1, seed=42): # Generates ascending list followed by a random tail
+    rng = np.random.default_rng(seed)
+    tail = max(1, int(element_count * tail_fraction))
+    head = np.arange(1, element_count - tail + 1, dtype=np.int64)
+    return np.concatenate((head, rng.integers(1, element_count + 1, size=tail, dtype=np.int64)))
+
+def generator_perturbed(element_count, fraction=0.05, seed=42): # Generates ascending list with a fraction of positions overwritten by random values
+    rng = np.random.default_rng(seed)
+    arr = np.arange(1, element_count + 1, dtype=np.int64)
+    positions = rng.choice(element_count, size=max(1, int(element_count * fraction)), replace=False)
+    arr[positions] = rng.integers(1, element_count + 1, size=positions.size, dtype=np.int64)
     return arr
 
-def write_array(arr, filename): # Function for writing into a file
-    save_dir = 'testcases/'
+def generator_zipf(element_count, exponent=1.5, seed=42): # Generates Zipf-distributed keys (many repeats of small keys, a long tail)
+    rng = np.random.default_rng(seed)
+    return np.minimum(rng.zipf(exponent, size=element_count), np.iinfo(np.int32).max).astype(np.int64)
+
+FAMILY_SEEDS = {
+    'random': 0,
+    'few_unique': 1,
+    'nearly_sorted': 2,
+    'sorted_random_tail': 3,
+    'zipf': 4,
+    'perturbed': 5,
+}
+
+# Arrangement name -> (output file, function yielding the arrays for one size)
+ARRANGEMENTS = {
+    'ascending': ('ascending.txt', lambda n: [generator_1(n)]),
+    'descending': ('descending.txt', lambda n: [generator_2(n)]),
+    'bst': ('bst.txt', lambda n: [generator_3(n)]),
+    'bst_reverse': ('bst_reverse.txt', lambda n: [generator_4(n)]),
+    'random': ('random.txt', _random_cases),
+    'antiqsort': ('antiqsort.txt', _antiqsort_cases),
+    'organ_pipe': ('organ_pipe.txt', lambda n: [generator_organ_pipe(n)]),
+    'sawtooth': ('sawtooth.txt', lambda n: [generator_sawtooth(n)]),
+    'few_unique': ('few_unique.txt', lambda n: [generator_few_unique(n, seed=_seed('few_unique', n))]),
+    'nearly_sorted': ('nearly_sorted.txt', lambda n: [generator_nearly_sorted(n, seed=_seed('nearly_sorted', n))]),
+    'sorted_random_tail': ('sorted_random_tail.txt', lambda n: [generator_sorted_random_tail(n, seed=_seed('sorted_random_tail', n))]),
+    'zipf': ('zipf.txt', lambda n: [generator_zipf(n, seed=_seed('zipf', n))]),
+    'perturbed': ('perturbed.txt', lambda n: [generator_perturbed(n, seed=_seed('perturbed', n))]),
+}
+
+def size_ladder(start=START, end=END, step=STEP_SIZE, ladder='linear', points=None):
+    """
+    Build the list of input sizes to generate.
+
+    Args:
+        start (int): Smallest input size
+        end (int): Largest input size (inclusive, capped at MAX_ELEMENTS)
+        step (int): Increment between sizes for a linear ladder
+        ladder (str): 'linear' for start, start+step, ..., or 'geometric' for
+                      log-spaced sizes between start and end
+        points (int): Number of sizes on a geometric ladder (default: one per
+                      power-of-two octave between start and end)
+
+    Returns:
+        list: Sorted, de-duplicated input sizes
+    """
+    if start < 1 or end < start:
+        raise ValueError(f"Invalid size range: {start}..{end}")
+    if end > MAX_ELEMENTS:
+        raise ValueError(f"END may not exceed {MAX_ELEMENTS} elements")
+
+    if ladder == 'linear':
+        return list(range(start, end + 1, step))
+    if ladder == 'geometric':
+        if points is None:
+            points = int(np.log2(end / start)) + 1
+        sizes = np.unique(np.rint(np.geomspace(start, end, num=max(points, 1))).astype(np.int64))
+        return sizes.tolist()
+    raise ValueError(f"Unknown ladder '{ladder}', expected 'linear' or 'geometric'")
+
+def write_block(file, arr): # Writes one [n] header plus its elements to an open file
+    file.write(f'{len(arr)}\n')
+    for chunk_start in range(0, len(arr), WRITE_CHUNK_SIZE):
+        chunk = arr[chunk_start:chunk_start + WRITE_CHUNK_SIZE]
+        file.write('\n'.join(map(str, chunk.tolist())))
+        file.write('\n')
+
+def write_arrangement(arrangement, sizes, save_dir=SAVE_DIR):
+    """
+    Generate every array of one arrangement and write them to its file in a single pass.
+    The file is truncated first, so re-running the generator replaces old test cases.
+
+    Args:
+        arrangement (str): Key of ARRANGEMENTS
+        sizes (list): Input sizes to generate
+        save_dir (str): Directory the test case file is written to
+
+    Returns:
+        tuple: (arrangement, path of the written file, number of arrays written)
+    """
+    filename, make_arrays = ARRANGEMENTS[arrangement]
+    path = os.path.join(save_dir, filename)
+    count = 0
+    with open(path, "w") as file:
+        for element_count in sizes:
+            for arr in make_arrays(element_count):
+                write_block(file, arr)
+                count += 1
+    return arrangement, path, count
+
+def generate(sizes, arrangements=None, workers=None, save_dir=SAVE_DIR):
+    """
+    Generate the test case files, one worker process per arrangement.
+
+    Args:
+        sizes (list): Input sizes to generate
+        arrangements (list): Arrangement names to generate (default: all of ARRANGEMENTS)
+        workers (int): Maximum number of worker processes (default: one per arrangement)
+        save_dir (str): Directory the test case files are written to
+
+    Returns:
+        dict: Mapping of arrangement name to written file path
+    """
+    if arrangements is None:
+        arrangements = list(ARRANGEMENTS)
     if not os.path.exists(save_dir):
         os.makedirs(save_dir)
         print(f"Created directory: {save_dir}")
-    filename = os.path.join(save_dir, filename)
-    with open(filename, "a") as file:  # "a" mode appends to the existing content
-        file.write(f'{len(arr)}\n')
-        for num in arr:
-            file.write(f'{num}\n')
+    skipped = [size for size in sizes if size > MAX_ANTIQSORT_ELEMENTS]
+    if 'antiqsort' in arrangements and skipped:
+        print(f"antiqsort: skipping {len(skipped)} size(s) above {MAX_ANTIQSORT_ELEMENTS} (quadratic to build)")
 
-if __name__ == '__main__':
+    paths = {}
+    with ProcessPoolExecutor(max_workers=workers or len(arrangements)) as executor:
+        futures = [executor.submit(write_arrangement, arrangement, sizes, save_dir) for arrangement in arrangements]
+        for future in tqdm(as_completed(futures), total=len(futures), desc='Progress Bar'):
+            arrangement, path, count = future.result()
+            paths[arrangement] = path
+            tqdm.write(f"{arrangement}: wrote {count} arrays to {path}")
 
-    for element_count in tqdm(range(START, END+1, STEP_SIZE),desc='Progress Bar'):
-        
-        arr = generator_1(element_count)
-        write_array(arr, 'complete_dataset.txt')
-        write_array(arr, 'ascending.txt')
-
-        arr = generator_2(element_count)
-        write_array(arr, 'complete_dataset.txt')
-        write_array(arr, 'descending.txt')
-
-        arr = generator_3(element_count)
-        write_array(arr, 'complete_dataset.txt')
-        write_array(arr, 'bst.txt')
-
-        arr = generator_4(element_count)
-        write_array(arr, 'complete_dataset.txt')
-        write_array(arr, 'bst_reverse.txt')
-
-        # Dynamically varying the number of randomly generated examples for all files
-        for arr_num in range(int(pow(element_count, 0.25)) + 2):
-            arr = generator_5(element_count, seed = ((arr_num * 43) % 7))
-            write_array(arr, 'complete_dataset.txt')
-            write_array(arr, 'random.txt')
+    return paths
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Generate sorting test cases')
+    parser.add_argument('--start', type=int, default=START, help='Smallest input size')
+    parser.add_argument('--end', type=int, default=END, help=f'Largest input size (up to {MAX_ELEMENTS})')
+    parser.add_argument('--step', type=int, default=STEP_SIZE, help='Step between sizes on a linear ladder')
+    parser.add_argument('--ladder', choices=['linear', 'geometric'], default='linear', help='Spacing of input sizes')
+    parser.add_argument('--points', type=int, default=None, help='Number of sizes on a geometric ladder')
+    parser.add_argument('--arrangements', nargs='+', choices=list(ARRANGEMENTS), default=None, help='Arrangements to generate')
+    parser.add_argument('--workers', type=int, default=None, help='Number of worker processes')
+    parser.add_argument('--save-dir', default=SAVE_DIR, help='Output directory')
+    return parser.parse_args()
+
+if __name__ == '__main__':
+    args = parse_args()
+    sizes = size_ladder(args.start, args.end, args.step, args.ladder, args.points)
+    generate(sizes, args.arrangements, args.workers, args.save_dir)
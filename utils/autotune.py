@@ -0,0 +1,206 @@
+import argparse
+import json
+import math
+import os
+import sys
+import time
+
+# Allow running as `python utils/autotune.py` from the repository root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from algorithms.heap_sort import heap_sort
+from algorithms.machine import machine_file, machine_id
+from algorithms.merge_sort import merge_sort
+from algorithms.quick_sort import PARTITION_SCHEMES, PIVOT_STRATEGIES, quick_sort
+from algorithms.radix_sort import radix_sort
+from algorithms.tuning import DEFAULTS, reload_tuning
+from utils.run_experiment import bind_params, run_experiment
+
+
+def _non_negative_ints(case):
+    return all(isinstance(value, int) and value >= 0 for value in case)
+
+
+def _any_case(case):
+    return True
+
+
+# Tuned parameter -> the function it belongs to, its keyword argument, the candidate
+# values and which test cases the function accepts. Parameters of the same function
+# are tuned in this order, each with the ones before it fixed at their tuned values.
+# Only parameters that keep an algorithm's guarantees are searched: merge sort insertion
+# sorts the leaves below its cutoff, so every candidate leaves it stable.
+SEARCH_SPACE = {
+    'radix_base': (radix_sort, 'base', [2, 4, 8, 10, 16, 32, 64, 256, 1024], _non_negative_ints),
+    'quick_sort_pivot': (quick_sort, 'pivot', list(PIVOT_STRATEGIES), _any_case),
+    'quick_sort_partition': (quick_sort, 'partition', list(PARTITION_SCHEMES), _any_case),
+    'quick_sort_cutoff': (quick_sort, 'cutoff', [0, 4, 8, 12, 16, 24, 32], _any_case),
+    'merge_sort_cutoff': (merge_sort, 'cutoff', [0, 4, 8, 12, 16, 24, 32], _any_case),
+    'heap_sort_cutoff': (heap_sort, 'cutoff', [0, 4, 8, 12, 16], _any_case),
+    'heap_arity': (heap_sort, 'arity', [2, 3, 4, 6, 8], _any_case),
+}
+
+
+def stratified_sample(testcases, views, per_arrangement=3, skip=('all',)):
+    """
+    Pick a representative subset of the test cases: per_arrangement cases from every
+    arrangement, spread evenly over its range of input sizes.
+
+    The sample is ordered rank by rank (every arrangement's smallest pick first, then
+    every arrangement's second pick, ...), so each prefix is itself stratified and
+    cheaper than the rest; successive_halving() relies on this.
+
+    Args:
+        testcases (dict): Fingerprint -> test case, as returned by load_testcase_views()
+        views (dict): Arrangement -> fingerprints
+        per_arrangement (int): Number of cases to pick per arrangement
+        skip (tuple): Virtual arrangements to leave out (default: ('all',))
+
+    Returns:
+        list: Test cases
+    """
+    picks = []
+    for arrangement, fingerprints in views.items():
+        if arrangement in skip or not fingerprints:
+            continue
+        by_size = sorted(dict.fromkeys(fingerprints), key=lambda fingerprint: len(testcases[fingerprint]))
+        count = min(per_arrangement, len(by_size))
+        if count == 1:
+            indices = [len(by_size) // 2]
+        else:
+            indices = [round(k * (len(by_size) - 1) / (count - 1)) for k in range(count)]
+        picks.append([by_size[i] for i in indices])
+
+    ordered = [column[rank] for rank in range(per_arrangement) for column in picks if rank < len(column)]
+    return [testcases[fingerprint] for fingerprint in dict.fromkeys(ordered)]
+
+
+def successive_halving(func, param, values, test_cases, eta=2, fixed=None, iterations=3, warmup=1, **kwargs):
+    """
+    Find the fastest value of one keyword parameter with successive halving.
+
+    Every round times the surviving values on a prefix of the test cases and keeps the
+    fastest 1/eta of them; the prefix grows by a factor of eta per round and the last
+    round uses every test case. Poor values are dropped after the cheap early rounds
+    instead of being timed on the whole sample.
+
+    Args:
+        func (callable): Function accepting the parameter
+        param (str): Name of the keyword parameter
+        values (list): Candidate values
+        test_cases (list): Test cases, cheapest and most representative first
+        eta (int): Elimination factor per round (default: 2)
+        fixed (dict): Further keyword arguments passed on every call
+        iterations (int): Number of iterations per test case (default: 3)
+        warmup (int): Number of warmup runs per test case (default: 1)
+        **kwargs: Further arguments for run_experiment()
+
+    Returns:
+        tuple: (best value, rounds) where rounds lists, per round, the number of test
+               cases used and the total average time of each surviving value
+    """
+    fixed = fixed or {}
+    survivors = list(values)
+    total_rounds = max(1, math.ceil(math.log(len(survivors), eta))) if len(survivors) > 1 else 1
+    rounds = []
+
+    for round_index in range(total_rounds):
+        budget = max(1, math.ceil(len(test_cases) * eta ** (round_index + 1 - total_rounds)))
+        variants = {value: bind_params(func, **fixed, **{param: value}) for value in survivors}
+        results = run_experiment(list(variants.values()), test_cases[:budget], iterations=iterations,
+                                 warmup=warmup, **kwargs)
+
+        scores = {value: sum(s['avg'] for s in results[variant.__name__]) for value, variant in variants.items()}
+        rounds.append({'cases': budget, 'scores': scores})
+
+        keep = max(1, math.ceil(len(survivors) / eta))
+        survivors = sorted(survivors, key=scores.get)[:keep]
+
+    return survivors[0], rounds
+
+
+def autotune(testcases, views, parameters=None, per_arrangement=3, eta=2, iterations=3, warmup=1, **kwargs):
+    """
+    Tune algorithm parameters on a stratified sample of the test cases.
+
+    Args:
+        testcases (dict): Fingerprint -> test case, as returned by load_testcase_views()
+        views (dict): Arrangement -> fingerprints
+        parameters (list): Names from SEARCH_SPACE to tune (default: all of them)
+        per_arrangement (int): Sampled test cases per arrangement
+        eta (int): Successive halving elimination factor
+        iterations (int): Number of iterations per test case
+        warmup (int): Number of warmup runs per test case
+        **kwargs: Further arguments for run_experiment()
+
+    Returns:
+        dict: JSON-serializable tuning with 'machine', 'parameters' (name -> tuned value)
+              and 'search' (name -> successive halving rounds)
+    """
+    parameters = parameters or list(SEARCH_SPACE)
+    sample = stratified_sample(testcases, views, per_arrangement)
+    tuning = {'machine': machine_id(), 'parameters': {}, 'search': {}}
+
+    for name in SEARCH_SPACE:
+        if name not in parameters:
+            continue
+        func, param, values, accepts = SEARCH_SPACE[name]
+        cases = [case for case in sample if accepts(case)]
+        if not cases:
+            print(f"No sampled test case suits {func.__name__}; keeping {name} = {DEFAULTS[name]}")
+            continue
+
+        fixed = {SEARCH_SPACE[other][1]: value for other, value in tuning['parameters'].items()
+                 if SEARCH_SPACE[other][0] is func}
+        best, rounds = successive_halving(func, param, values, cases, eta, fixed, iterations, warmup, **kwargs)
+        tuning['parameters'][name] = best
+        tuning['search'][name] = [{'cases': r['cases'], 'scores': {str(v): t for v, t in r['scores'].items()}}
+                                  for r in rounds]
+
+    return tuning
+
+
+def save_tuning(tuning, path=None):
+    """
+    Write tuned parameters to this machine's tuning file (or the given path) and make
+    them the defaults of the algorithms in this process.
+
+    Only this machine's file is read at import, so parameters saved to another path
+    are the defaults of the current process alone; later processes pick them up only
+    after reload_tuning(path).
+
+    Returns:
+        str: The path written
+    """
+    path = path or machine_file('tuning')
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as file:
+        json.dump(tuning, file, indent=2)
+    reload_tuning(path)
+    return path
+
+
+def parse_args(arrangements):
+    parser = argparse.ArgumentParser(description='Tune algorithm parameters for this machine')
+    parser.add_argument('--parameters', nargs='+', choices=list(SEARCH_SPACE), default=list(SEARCH_SPACE))
+    parser.add_argument('--arrangements', nargs='+', choices=arrangements, default=arrangements)
+    parser.add_argument('--per-arrangement', type=int, default=3)
+    parser.add_argument('--eta', type=int, default=2)
+    parser.add_argument('--iterations', type=int, default=3)
+    parser.add_argument('--warmup', type=int, default=1)
+    parser.add_argument('--output', default=None, help='Tuning file (default: this machine\'s file, the only one read at import)')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    from run import TESTCASE_FILES
+    from utils.load_testcases import load_testcase_views
+
+    args = parse_args(list(TESTCASE_FILES))
+    testcases, views = load_testcase_views({name: TESTCASE_FILES[name] for name in args.arrangements}, combined_view=None)
+    start = time.perf_counter()
+    tuning = autotune(testcases, views, args.parameters, args.per_arrangement, args.eta, args.iterations, args.warmup)
+    path = save_tuning(tuning, args.output)
+    print(f"Tuned {len(tuning['parameters'])} parameters in {time.perf_counter() - start:.2f}s, saved as '{path}'")
+    for name, value in tuning['parameters'].items():
+        print(f"   - {name}: {value} (default {DEFAULTS[name]})")
@@ -0,0 +1,91 @@
+import sys
+from array import array
+
+import numpy as np
+
+# Bytes per element of the typed backends ('q': signed 64-bit, like NumPy's int64)
+TYPECODE = 'q'
+
+
+class SharedBuffer:
+    """
+    One growable bytearray that every memoryview materialization writes into, so
+    the memoryview backend reuses a single allocation instead of creating a new
+    container per run. A view stays valid until the next materialization.
+    """
+
+    def __init__(self):
+        self.buffer = bytearray()
+
+    def view(self, case):
+        """
+        Copy a test case into the shared buffer.
+
+        Args:
+            case: Sequence of integers
+
+        Returns:
+            memoryview: Typed view (format 'q') over the first len(case) slots
+        """
+        data = array(TYPECODE, case)
+        size = len(data) * data.itemsize
+        if size > len(self.buffer):
+            # Views of the old buffer may still be alive, so grow by reallocating
+            self.buffer = bytearray(size)
+        view = memoryview(self.buffer)[:size]
+        view[:] = memoryview(data).cast('B')
+        return view.cast(TYPECODE)
+
+
+_shared = SharedBuffer()
+
+
+# Backend name -> function materializing a fresh, independent container from a test case
+BACKENDS = {
+    'list': list,
+    'array': lambda case: array(TYPECODE, case),
+    'numpy': lambda case: np.array(case, dtype=np.int64),
+    'memoryview': _shared.view,
+}
+
+
+def materializer(backend=None):
+    """
+    Resolve a backend given by name (see BACKENDS) or as a function.
+
+    Args:
+        backend (str or callable): Backend name or materializing function (default: 'list')
+
+    Returns:
+        callable: Function turning a test case into a fresh container
+    """
+    if backend is None:
+        return BACKENDS['list']
+    if callable(backend):
+        return backend
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend '{backend}', expected one of {list(BACKENDS)}")
+    return BACKENDS[backend]
+
+
+def footprint(container):
+    """
+    Bytes a container occupies, including what it points to: a list's boxed ints
+    (each distinct object counted once, so cached small ints are shared), the data
+    behind a NumPy view (getsizeof already counts an owned buffer), or the part of the
+    shared buffer a memoryview covers.
+
+    Args:
+        container: list, array.array, NumPy array or memoryview
+
+    Returns:
+        int: Footprint in bytes
+    """
+    if isinstance(container, list):
+        objects = {id(value): value for value in container}
+        return sys.getsizeof(container) + sum(sys.getsizeof(value) for value in objects.values())
+    if isinstance(container, np.ndarray):
+        return sys.getsizeof(container) + (container.nbytes if container.base is not None else 0)
+    if isinstance(container, memoryview):
+        return sys.getsizeof(container) + container.nbytes
+    return sys.getsizeof(container)
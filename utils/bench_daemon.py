@@ -0,0 +1,253 @@
+import argparse
+import asyncio
+import importlib
+import json
+import os
+import socket
+import sys
+import time
+
+# Allow running as `python utils/bench_daemon.py` from the repository root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SOCKET_PATH = 'outputs/bench_daemon.sock'
+
+# Warm worker processes; more than one times cells in parallel, which adds noise
+WORKERS = 1
+
+# Packages whose modules are re-imported in the workers when their source changes
+RELOAD_PACKAGES = ('algorithms',)
+
+# Statistics streamed back per cell (the mergeable accumulators stay in the worker)
+STREAMED_SKIP = ('accumulator', 'cpu_accumulator')
+
+
+# Worker side: every worker process keeps the test cases and the imported modules
+# between jobs, so a job pays neither interpreter startup nor file parsing
+
+_cases = {}
+_source_mtimes = {}
+
+
+def _init_worker(cases):
+    _cases.update(cases)
+
+
+def _reloadable(name):
+    return any(name == package or name.startswith(package + '.') for package in RELOAD_PACKAGES)
+
+
+def _source_mtime(module):
+    path = getattr(module, '__file__', None)
+    return os.path.getmtime(path) if path and os.path.exists(path) else None
+
+
+def _reload_changed_modules():
+    # Forget every algorithm module as soon as one source file changed, so the whole
+    # package is imported afresh and no module keeps a stale reference to another
+    changed = any(name in _source_mtimes and _source_mtime(module) != _source_mtimes[name]
+                  for name, module in list(sys.modules.items()) if _reloadable(name))
+    if changed:
+        for name in [name for name in sys.modules if _reloadable(name)]:
+            del sys.modules[name]
+        _source_mtimes.clear()
+        importlib.invalidate_caches()
+    return changed
+
+
+def _record_source_mtimes():
+    for name, module in list(sys.modules.items()):
+        if _reloadable(name) and name not in _source_mtimes:
+            _source_mtimes[name] = _source_mtime(module)
+
+
+def resolve_function(path):
+    """
+    Import a function from 'package.module:function' or 'package.module.function'.
+    """
+    module_name, _, func_name = path.partition(':') if ':' in path else path.rpartition('.')
+    return getattr(importlib.import_module(module_name), func_name)
+
+
+def _run_cell(function_path, fingerprint, iterations, warmup, params):
+    from utils.run_experiment import _calculate_runtime, _stats_to_json, bind_params
+
+    reloaded = _reload_changed_modules()
+    func = resolve_function(function_path)
+    _record_source_mtimes()
+    if params:
+        func = bind_params(func, **params)
+
+    case = _cases[fingerprint]
+    stats = _calculate_runtime(func, iterations, warmup, setup=lambda: (list(case),))
+    cell = {name: value for name, value in _stats_to_json(stats).items() if name not in STREAMED_SKIP}
+    cell.update({'input_size': len(case), 'fingerprint': fingerprint, 'reloaded': reloaded, 'worker': os.getpid()})
+    return cell
+
+
+# Server side
+
+class BenchDaemon:
+    """
+    Long-running benchmark server: test cases are loaded once, worker processes stay
+    warm, and jobs arrive as JSON lines over a Unix socket (asyncio).
+
+    A job {"function": "algorithms.merge_sort:merge_sort", "arrangement": "random",
+    "sizes": [500, 1000], "iterations": 3, "warmup": 0, "params": {"cutoff": 8}}
+    streams one {"type": "result", ...} line per cell as soon as it completes, then a
+    {"type": "done", ...} line. {"command": "status"} lists the arrangements and sizes;
+    {"command": "shutdown"} stops the daemon. Workers re-import the algorithm modules
+    whenever one of their source files has changed since the previous job.
+    """
+
+    def __init__(self, testcases, views, workers=WORKERS):
+        from concurrent.futures import ProcessPoolExecutor
+
+        self.testcases = testcases
+        self.views = views
+        self.executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(testcases,))
+        self.server = None
+
+    def _cells(self, job):
+        arrangement = job.get('arrangement', 'all')
+        if arrangement not in self.views:
+            raise ValueError(f"Unknown arrangement '{arrangement}', expected one of {list(self.views)}")
+        sizes = set(job['sizes']) if job.get('sizes') else None
+        fingerprints = dict.fromkeys(self.views[arrangement])
+        return [fingerprint for fingerprint in fingerprints
+                if sizes is None or len(self.testcases[fingerprint]) in sizes]
+
+    async def _run_job(self, job, writer):
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        fingerprints = self._cells(job)
+        futures = [loop.run_in_executor(self.executor, _run_cell, job['function'], fingerprint,
+                                        job.get('iterations', 1), job.get('warmup', 0), job.get('params'))
+                   for fingerprint in fingerprints]
+        try:
+            for future in asyncio.as_completed(futures):
+                cell = await future
+                await self._send(writer, {'type': 'result', 'function': job['function'],
+                                          'arrangement': job.get('arrangement', 'all'), **cell})
+        except Exception:
+            # One failing cell fails the job: drop the cells not started yet
+            for future in futures:
+                future.cancel()
+            await asyncio.gather(*futures, return_exceptions=True)
+            raise
+        await self._send(writer, {'type': 'done', 'cells': len(fingerprints),
+                                  'elapsed': time.perf_counter() - start})
+
+    @staticmethod
+    async def _send(writer, message):
+        writer.write((json.dumps(message) + '\n').encode())
+        await writer.drain()
+
+    async def _handle(self, reader, writer):
+        try:
+            while line := await reader.readline():
+                try:
+                    job = json.loads(line)
+                    command = job.get('command', 'run')
+                    if command == 'status':
+                        await self._send(writer, {'type': 'status', 'arrangements': {
+                            arrangement: sorted({len(self.testcases[fingerprint]) for fingerprint in view})
+                            for arrangement, view in self.views.items()}})
+                    elif command == 'shutdown':
+                        await self._send(writer, {'type': 'shutdown'})
+                        self.server.close()
+                        return
+                    else:
+                        await self._run_job(job, writer)
+                except Exception as e:
+                    # Bad jobs (unknown function, failing sort, ...) must not take the daemon down
+                    await self._send(writer, {'type': 'error', 'message': f"{type(e).__name__}: {e}"})
+        finally:
+            writer.close()
+
+    async def serve(self, path=SOCKET_PATH):
+        """
+        Listen on a Unix socket until a shutdown command arrives.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if os.path.exists(path):
+            os.remove(path)
+        self.server = await asyncio.start_unix_server(self._handle, path=path)
+        print(f"Benchmark daemon listening on '{path}' with {len(self.testcases)} test cases")
+        try:
+            async with self.server:
+                await self.server.wait_closed()
+        finally:
+            self.executor.shutdown(cancel_futures=True)
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def submit(job, path=SOCKET_PATH):
+    """
+    Client: send one job (or command) to a running daemon and yield its messages as
+    they arrive. Uses only the standard library, so a client starts in milliseconds.
+
+    Args:
+        job (dict): The job, as described in BenchDaemon
+        path (str): Socket of the daemon (default: SOCKET_PATH)
+
+    Yields:
+        dict: 'result' messages, then a final 'done', 'status', 'shutdown' or 'error' message
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(path)
+        client.sendall((json.dumps(job) + '\n').encode())
+        with client.makefile('r') as stream:
+            for line in stream:
+                message = json.loads(line)
+                yield message
+                if message['type'] != 'result':
+                    return
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Warm benchmark daemon with a Unix socket API')
+    parser.add_argument('--socket', default=SOCKET_PATH)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    serve = subparsers.add_parser('serve', help='Load the test cases of run.py and serve jobs')
+    serve.add_argument('--workers', type=int, default=WORKERS)
+
+    run = subparsers.add_parser('run', help='Submit a job and print results as they arrive')
+    run.add_argument('function', help="e.g. algorithms.merge_sort:merge_sort")
+    run.add_argument('--arrangement', default='all')
+    run.add_argument('--sizes', nargs='+', type=int, default=None)
+    run.add_argument('--iterations', type=int, default=3)
+    run.add_argument('--warmup', type=int, default=0)
+    run.add_argument('--params', type=json.loads, default=None, help='JSON keyword arguments, e.g. \'{"cutoff": 8}\'')
+
+    subparsers.add_parser('status', help='List the loaded arrangements and sizes')
+    subparsers.add_parser('shutdown', help='Stop the daemon')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    if args.command == 'serve':
+        from run import ALL_ARRANGEMENT, TESTCASE_FILES
+        from utils.load_testcases import load_testcase_views
+
+        testcases, views = load_testcase_views(TESTCASE_FILES, combined_view=ALL_ARRANGEMENT)
+        asyncio.run(BenchDaemon(testcases, views, args.workers).serve(args.socket))
+    else:
+        if args.command == 'run':
+            job = {'function': args.function, 'arrangement': args.arrangement, 'sizes': args.sizes,
+                   'iterations': args.iterations, 'warmup': args.warmup, 'params': args.params}
+        else:
+            job = {'command': args.command}
+        for message in submit(job, args.socket):
+            if message['type'] == 'result':
+                print(f"n={message['input_size']:>8}  avg={message['avg']:.6f}s  min={message['min']:.6f}s  "
+                      f"p99={message['p99']:.6f}s" + ("  (reloaded)" if message['reloaded'] else ""))
+            elif message['type'] == 'done':
+                print(f"{message['cells']} cells in {message['elapsed']:.2f}s")
+            else:
+                print(json.dumps(message, indent=2))
@@ -0,0 +1,581 @@
+import hashlib
+import random
+from operator import itemgetter
+
+from prettytable import PrettyTable
+
+from algorithms.argsort import lexsort
+from algorithms.resort import resort
+from algorithms.sorted_list import SortedList
+from utils.backends import BACKENDS
+from utils.run_experiment import _calculate_runtime, bind_params, run_experiment
+
+
+def _print_table(title, field_names, rows, sortby=None):
+    print("\n" + "="*80)
+    print(title.center(80))
+    print("="*80)
+    table = PrettyTable()
+    table.field_names = field_names
+    for row in rows:
+        table.add_row(row)
+    if sortby:
+        table.sortby = sortby
+    print(table)
+
+
+def run_batch_experiment(batch_functions, looped_functions, test_cases, iterations=1, warmup=0):
+    """
+    Compare sorting a whole collection of small arrays in one batched call against
+    looping over the collection with an ordinary sorting function.
+
+    Args:
+        batch_functions (list): Functions taking (values, offsets), e.g. batch_sort
+        looped_functions (list): Functions sorting one list in place, called once per test case
+        test_cases (list): The arrays making up the batch
+        iterations (int): Number of timed iterations (default: 1)
+        warmup (int): Number of warmup runs before timing (default: 0)
+
+    Returns:
+        dict: Function name -> statistics from _calculate_runtime() extended with
+              'arrays_per_sec' and 'elements_per_sec' (based on the average time)
+    """
+    from algorithms.batch_sort import to_ragged
+
+    values, offsets = to_ragged(test_cases)
+    element_count = sum(len(case) for case in test_cases)
+
+    def looped(func):
+        def run(cases):
+            for case in cases:
+                func(case.copy())
+        run.__name__ = f"looped_{func.__name__}"
+        return run
+
+    candidates = [(func, (values, offsets)) for func in batch_functions]
+    candidates += [(looped(func), (test_cases,)) for func in looped_functions]
+
+    results = {}
+    for func, args in candidates:
+        stats = _calculate_runtime(func, iterations, warmup, *args)
+        stats['arrays_per_sec'] = len(test_cases) / stats['avg'] if stats['avg'] else float('inf')
+        stats['elements_per_sec'] = element_count / stats['avg'] if stats['avg'] else float('inf')
+        results[func.__name__] = stats
+
+    _print_table(f"BATCH THROUGHPUT - {len(test_cases)} ARRAYS, {element_count} ELEMENTS",
+                 ["Method", "Avg Time (s)", "Arrays/sec", "Elements/sec"],
+                 [[name, f"{stats['avg']:.6f}", f"{stats['arrays_per_sec']:.0f}", f"{stats['elements_per_sec']:.0f}"]
+                  for name, stats in results.items()],
+                 sortby=None)
+    return results
+
+
+def quicksort_matrix():
+    """
+    Every pivot strategy x partition scheme combination of the quick sort engine.
+
+    Returns:
+        list: Functions named e.g. 'quick_sort_pivot_ninther_partition_hoare'
+    """
+    from algorithms.quick_sort import PARTITION_SCHEMES, PIVOT_STRATEGIES, quick_sort
+
+    return [bind_params(quick_sort, pivot=pivot, partition=partition)
+            for pivot in PIVOT_STRATEGIES for partition in PARTITION_SCHEMES]
+
+
+def run_quicksort_matrix(testcases, views, iterations=1, warmup=0, **kwargs):
+    """
+    Time the full pivot strategy x partition scheme matrix and print the mean average
+    time of every combination per arrangement.
+
+    Args:
+        testcases (dict): Fingerprint -> test case, as returned by load_testcase_views()
+        views (dict): Arrangement -> fingerprints
+        iterations (int): Number of iterations per test case (default: 1)
+        warmup (int): Number of warmup runs per test case (default: 0)
+        **kwargs: Further arguments for run_experiment()
+
+    Returns:
+        dict: run_experiment() results per arrangement, keyed by the variant names
+    """
+    variants = quicksort_matrix()
+    results = run_experiment(variants, testcases, iterations=iterations, warmup=warmup, views=views, **kwargs)
+
+    arrangements = list(results)
+    rows = []
+    for variant in variants:
+        row = [variant.__name__.replace('quick_sort_pivot_', '').replace('_partition_', ' / ')]
+        for arrangement in arrangements:
+            stats = results[arrangement][variant.__name__]
+            row.append(f"{sum(s['avg'] for s in stats) / len(stats):.6f}" if stats else "-")
+        rows.append(row)
+
+    _print_table("QUICKSORT PIVOT x PARTITION MATRIX - MEAN AVG TIME (s)",
+                 ["Pivot / Partition"] + arrangements, rows)
+    return results
+
+
+def _selection_methods(ratio):
+    # Each method produces the k = ratio * n smallest elements of one test case
+    from algorithms.quick_sort import quick_sort
+    from algorithms.selection import nth_element, partial_sort, top_k
+
+    def k_of(arr):
+        return max(1, min(len(arr), int(len(arr) * ratio)))
+
+    def nth_element_k(arr):
+        nth_element(arr, k_of(arr) - 1)
+
+    def partial_sort_k(arr):
+        partial_sort(arr, k_of(arr))
+
+    def top_k_stream(arr):
+        top_k(iter(arr), k_of(arr))
+
+    def full_sort_slice(arr):
+        quick_sort(arr)
+        return arr[:k_of(arr)]
+
+    methods = [nth_element_k, partial_sort_k, top_k_stream, full_sort_slice]
+    for method in methods:
+        method.__name__ = f"{method.__name__}_{ratio}n"
+    return methods
+
+
+def run_selection_experiment(test_cases, ratios, iterations=1, warmup=0, **kwargs):
+    """
+    Time the selection APIs against a full sort plus slice for several k/n ratios.
+
+    Args:
+        test_cases (list): Test cases, as for run_experiment()
+        ratios (list): Values of k / n to try
+        iterations (int): Number of iterations per test case (default: 1)
+        warmup (int): Number of warmup runs per test case (default: 0)
+        **kwargs: Further arguments for run_experiment()
+
+    Returns:
+        dict: k/n label (e.g. 'k=0.01n') -> {method: [stats]}, the shape
+              plot_testcase_comparison() takes
+    """
+    results = {}
+    for ratio in ratios:
+        methods = _selection_methods(ratio)
+        ratio_results = run_experiment(methods, test_cases, iterations=iterations, warmup=warmup, **kwargs)
+        results[f"k={ratio}n"] = {method.__name__[:-len(f"_{ratio}n")]: ratio_results[method.__name__]
+                                  for method in methods}
+
+    methods = list(next(iter(results.values())))
+    _print_table("SELECTION VS FULL SORT - MEAN AVG TIME (s)", ["k / n"] + methods,
+                 [[label] + [f"{sum(s['avg'] for s in stats) / len(stats):.6f}" if stats else "-"
+                             for stats in method_results.values()]
+                  for label, method_results in results.items()])
+    return results
+
+
+def hashed_name(record):
+    # A derived key costly enough to dominate comparisons: 32 bits of a hash of the name
+    return int.from_bytes(hashlib.blake2b(record['name'].encode(), digest_size=4).digest(), 'little')
+
+
+# Key name -> key function on a make_records() record: a field lookup and a derived key
+RECORD_KEYS = {
+    'score': itemgetter('score'),
+    'hashed_name': hashed_name,
+}
+
+
+def make_records(values):
+    """
+    Turn a test case into records resembling production rows (one dict per value).
+    """
+    return [{'id': i, 'score': value, 'name': f"item-{value}"} for i, value in enumerate(values)]
+
+
+def _comparison_wrapper(key):
+    # The alternative to key=: wrap records in objects whose comparisons call key()
+    class Keyed:
+        __slots__ = ('record',)
+
+        def __init__(self, record):
+            self.record = record
+
+        def __lt__(self, other):
+            return key(self.record) < key(other.record)
+
+        def __le__(self, other):
+            return key(self.record) <= key(other.record)
+
+        def __gt__(self, other):
+            return key(self.record) > key(other.record)
+
+    return Keyed
+
+
+def run_record_experiment(functions, test_cases, keys, iterations=1, warmup=0):
+    """
+    Time sorting records by a derived key: each function with key= (keys computed once
+    per element) against the same function on records wrapped in objects whose
+    comparisons compute the key (keys computed twice per comparison).
+
+    Args:
+        functions (list): Sorting functions accepting key=
+        test_cases (list): Test cases; each becomes a list of records via make_records()
+        keys (dict): Key name -> key function on a record (must return non-negative
+                     ints for radix_sort)
+        iterations (int): Number of timed iterations (default: 1)
+        warmup (int): Number of warmup runs before timing (default: 0)
+
+    Returns:
+        dict: Key name -> {'<function>' or '<function>_wrapped': statistics from _calculate_runtime()}
+    """
+    record_sets = [make_records(case) for case in test_cases]
+    element_count = sum(len(records) for records in record_sets)
+
+    results = {}
+    rows = []
+    for key_name, key in keys.items():
+        Keyed = _comparison_wrapper(key)
+        results[key_name] = {}
+        for func in functions:
+            def with_key(record_sets):
+                for records in record_sets:
+                    func(list(records), key=key)
+
+            def wrapped(record_sets):
+                for records in record_sets:
+                    func([Keyed(record) for record in records])
+
+            keyed_stats = _calculate_runtime(with_key, iterations, warmup, record_sets)
+            results[key_name][func.__name__] = keyed_stats
+            row = [key_name, func.__name__, f"{keyed_stats['avg']:.6f}", "-", "-"]
+
+            # Radix sort cannot order arbitrary objects, only integer keys
+            if func.__name__ != 'radix_sort':
+                wrapped_stats = _calculate_runtime(wrapped, iterations, warmup, record_sets)
+                results[key_name][f"{func.__name__}_wrapped"] = wrapped_stats
+                row[3] = f"{wrapped_stats['avg']:.6f}"
+                row[4] = f"{wrapped_stats['avg'] / keyed_stats['avg']:.2f}x" if keyed_stats['avg'] else "-"
+            rows.append(row)
+
+    _print_table(f"RECORD SORTING - {len(record_sets)} ARRAYS, {element_count} RECORDS",
+                 ["Key", "Algorithm", "key= Time (s)", "__lt__ Wrapper Time (s)", "Speedup"], rows)
+    return results
+
+
+# Key type -> transform of an integer test case into keys of that type (same order)
+KEY_TYPE_TRANSFORMS = {
+    'unsigned_int': lambda case: list(case),
+    'signed_int': lambda case: [value - 2**31 for value in case],
+    'float': lambda case: [value * 0.001 - 1e3 for value in case],
+    'str': lambda case: [f"key-{value:016x}" for value in case],  # padded, so text order = value order
+}
+
+
+def run_key_type_experiment(functions, test_cases, transforms=None, iterations=1, warmup=0, **kwargs):
+    """
+    Time sorting functions on the same test cases recast as different key types.
+
+    Args:
+        functions (list): Sorting functions to compare
+        test_cases (list): Integer test cases
+        transforms (dict): Key type -> transform (default: KEY_TYPE_TRANSFORMS)
+        iterations (int): Number of iterations per test case (default: 1)
+        warmup (int): Number of warmup runs per test case (default: 0)
+        **kwargs: Further arguments for run_experiment()
+
+    Returns:
+        dict: Key type -> {function name: [stats]}, the shape plot_testcase_comparison() takes
+    """
+    transforms = transforms or KEY_TYPE_TRANSFORMS
+    results = {key_type: run_experiment(functions, [transform(case) for case in test_cases],
+                                        iterations=iterations, warmup=warmup, **kwargs)
+               for key_type, transform in transforms.items()}
+
+    names = [func.__name__ for func in functions]
+    _print_table("SORTING BY KEY TYPE - MEAN AVG TIME (s)", ["Key Type"] + names,
+                 [[key_type] + [f"{sum(s['avg'] for s in type_results[name]) / len(type_results[name]):.6f}"
+                                if type_results[name] else "-" for name in names]
+                  for key_type, type_results in results.items()])
+    return results
+
+
+# Column name -> derived column of an integer test case: a low-cardinality primary key,
+# a signed secondary key and a string tie-break, most significant first
+LEXSORT_COLUMNS = {
+    'bucket': lambda case: [value % 16 for value in case],
+    'offset': lambda case: [value % 1000 - 500 for value in case],
+    'label': lambda case: [f"k{value % 4096:03x}" for value in case],
+}
+
+
+def run_lexsort_experiment(tuple_functions, test_cases, columns=None, methods=('radix', 'merge'),
+                           iterations=1, warmup=0):
+    """
+    Time computing the sorting permutation of several key columns: lexsort() with one
+    stable pass per column against zipping the columns into (keys..., index) tuples and
+    sorting those with an ordinary sorting function.
+
+    Args:
+        tuple_functions (list): Sorting functions that sort a list of tuples in place
+        test_cases (list): Integer test cases; each becomes one set of columns
+        columns (dict): Column name -> transform of a test case (default: LEXSORT_COLUMNS)
+        methods (tuple): lexsort() methods to time (default: ('radix', 'merge'))
+        iterations (int): Number of timed iterations (default: 1)
+        warmup (int): Number of warmup runs before timing (default: 0)
+
+    Returns:
+        dict: 'lexsort_<method>' or '<function>_tuples' -> statistics from _calculate_runtime()
+    """
+    columns = columns or LEXSORT_COLUMNS
+    column_sets = [[transform(case) for transform in columns.values()] for case in test_cases]
+    row_count = sum(len(case) for case in test_cases)
+
+    variants = {}
+    for method in methods:
+        def by_lexsort(column_sets, method=method):
+            return [lexsort(case_columns, method=method) for case_columns in column_sets]
+        variants[f"lexsort_{method}"] = by_lexsort
+
+    for func in tuple_functions:
+        def by_tuples(column_sets, func=func):
+            orders = []
+            for case_columns in column_sets:
+                rows = list(zip(*case_columns, range(len(case_columns[0]))))
+                func(rows)
+                orders.append([row[-1] for row in rows])  # the permutation, as lexsort() returns it
+            return orders
+        variants[f"{func.__name__}_tuples"] = by_tuples
+
+    results = {name: _calculate_runtime(variant, iterations, warmup, column_sets)
+               for name, variant in variants.items()}
+
+    _print_table(f"LEXSORT - {len(column_sets)} CASES, {row_count} ROWS x {len(columns)} COLUMNS ({', '.join(columns)})",
+                 ["Method", "Avg Time (s)", "Min Time (s)"],
+                 [[name, f"{stats['avg']:.6f}", f"{stats['min']:.6f}"] for name, stats in results.items()],
+                 sortby="Avg Time (s)")
+    return results
+
+
+def _online_methods(resort_functions, ratio):
+    # Each method consumes one test case in batches of ratio * n values, keeping
+    # everything received so far in sorted order after every batch
+    def batches(arr):
+        size = max(1, int(len(arr) * ratio))
+        return [arr[start:start + size] for start in range(0, len(arr), size)]
+
+    def sorted_list(arr):
+        container = SortedList()
+        for batch in batches(arr):
+            container.update(batch)
+
+    methods = [sorted_list]
+    for func in resort_functions:
+        def resort(arr, func=func):
+            received = []
+            for batch in batches(arr):
+                received.extend(batch)
+                func(received)
+        resort.__name__ = f"{func.__name__}_resort"
+        methods.append(resort)
+
+    for method in methods:
+        method.__name__ = f"{method.__name__}_{ratio}n"
+    return methods
+
+
+def run_online_experiment(resort_functions, test_cases, ratios, iterations=1, warmup=0, **kwargs):
+    """
+    Time keeping continuously arriving data sorted: inserting each batch into a
+    SortedList against appending it and re-sorting everything received so far.
+
+    Args:
+        resort_functions (list): Sorting functions re-run over the whole list per batch
+        test_cases (list): Test cases, each consumed in batches
+        ratios (list): Values of batch size / n to try
+        iterations (int): Number of iterations per test case (default: 1)
+        warmup (int): Number of warmup runs per test case (default: 0)
+        **kwargs: Further arguments for run_experiment()
+
+    Returns:
+        dict: Batch/total label (e.g. 'batch=0.01n') -> {method: [stats]}, the shape
+              plot_testcase_comparison() takes
+    """
+    results = {}
+    for ratio in ratios:
+        methods = _online_methods(resort_functions, ratio)
+        ratio_results = run_experiment(methods, test_cases, iterations=iterations, warmup=warmup, **kwargs)
+        results[f"batch={ratio}n"] = {method.__name__[:-len(f"_{ratio}n")]: ratio_results[method.__name__]
+                                      for method in methods}
+
+    methods = list(next(iter(results.values())))
+    _print_table("ONLINE SORTING - MEAN AVG TIME (s)", ["Batch / n"] + methods,
+                 [[label] + [f"{sum(s['avg'] for s in stats) / len(stats):.6f}" if stats else "-"
+                             for stats in method_results.values()]
+                  for label, method_results in results.items()])
+    return results
+
+
+def make_delta(sorted_arr, fraction, rng):
+    """
+    Draw a resort() delta touching about fraction * n elements of a sorted array: half
+    of them updated to random values, a quarter deleted and a quarter newly inserted.
+
+    Returns:
+        tuple: (inserts, deletes, updates) as resort() takes them
+    """
+    n = len(sorted_arr)
+    k = max(1, int(n * fraction))
+    low, high = (sorted_arr[0], sorted_arr[-1]) if n else (0, 1)
+    positions = rng.sample(range(n), min(n, k - k // 4))
+    updates = {position: rng.randint(low, high) for position in positions[:k // 2]}
+    deletes = positions[k // 2:]
+    inserts = [rng.randint(low, high) for _ in range(k // 4)]
+    return inserts, deletes, updates
+
+
+def perturbed_delta(case):
+    """
+    Recover the resort() delta a 'perturbed' test case describes: its ascending source
+    1..n is last cycle's sorted array, and every position the generator overwrote
+    becomes an update to the value found there.
+
+    Returns:
+        tuple: (sorted_arr, (inserts, deletes, updates))
+    """
+    base = list(range(1, len(case) + 1))
+    updates = {position: value for position, value in enumerate(case) if value != position + 1}
+    return base, ([], [], updates)
+
+
+def _time_resort(functions, bases, deltas, changed_arrays, iterations, warmup):
+    # resort() on every (base, delta) pair against every function on the changed arrays
+    def incremental(bases, deltas):
+        for base, (inserts, deletes, updates) in zip(bases, deltas):
+            resort(list(base), inserts, deletes, updates)
+
+    results = {'resort': _calculate_runtime(incremental, iterations, warmup, bases, deltas)}
+    for func in functions:
+        def from_scratch(changed_arrays, func=func):
+            for changed in changed_arrays:
+                func(list(changed))
+        results[func.__name__] = _calculate_runtime(from_scratch, iterations, warmup, changed_arrays)
+    return results
+
+
+def run_resort_experiment(functions, test_cases, fractions, iterations=1, warmup=0, seed=0, perturbed_cases=None):
+    """
+    Time bringing a sorted array up to date after a small delta: resort() (sort the
+    delta, merge it in) against sorting the changed array from scratch.
+
+    Args:
+        functions (list): Sorting functions run from scratch on the changed arrays
+        test_cases (list): Test cases; each is sorted to give last cycle's array
+        fractions (list): Fractions of n touched by the random deltas
+        iterations (int): Number of timed iterations (default: 1)
+        warmup (int): Number of warmup runs before timing (default: 0)
+        seed (int): Seed of the random deltas (default: 0)
+        perturbed_cases (list): Test cases of the 'perturbed' arrangement; each adds its
+                                own delta (see perturbed_delta()), and the from-scratch
+                                sorts run on the case itself (default: None)
+
+    Returns:
+        dict: Delta label (e.g. 'delta=0.01n', or 'perturbed') -> {'resort' or function
+              name: statistics from _calculate_runtime()}
+    """
+    rng = random.Random(seed)
+    bases = [sorted(case) for case in test_cases]
+
+    results = {}
+    for fraction in fractions:
+        deltas = [make_delta(base, fraction, rng) for base in bases]
+        # The same changes applied without the sorted order: the from-scratch input
+        changed_arrays = []
+        for base, (inserts, deletes, updates) in zip(bases, deltas):
+            removed = set(deletes).union(updates)
+            changed = [value for position, value in enumerate(base) if position not in removed]
+            changed.extend(value for position, value in updates.items() if position not in deletes)
+            changed.extend(inserts)
+            changed_arrays.append(changed)
+        results[f"delta={fraction}n"] = _time_resort(functions, bases, deltas, changed_arrays, iterations, warmup)
+
+    if perturbed_cases:
+        derived = [perturbed_delta(case) for case in perturbed_cases]
+        results['perturbed'] = _time_resort(functions, [base for base, _ in derived], [delta for _, delta in derived],
+                                            [list(case) for case in perturbed_cases], iterations, warmup)
+
+    names = list(next(iter(results.values())))
+    counts = f"{len(bases)} ARRAYS" + (f" + {len(perturbed_cases)} PERTURBED" if perturbed_cases else "")
+    _print_table(f"INCREMENTAL RE-SORT - {counts} - AVG TIME (s)", ["Delta / n"] + names,
+                 [[label] + [f"{stats['avg']:.6f}" for stats in label_results.values()]
+                  for label, label_results in results.items()])
+    return results
+
+
+def run_memory_experiment(functions, testcases, views, iterations=1, warmup=0, **kwargs):
+    """
+    Time functions on every arrangement and measure their peak traced memory, printing
+    the mean average time and the mean peak bytes per element per arrangement.
+
+    Args:
+        functions (list): Functions to compare, e.g. merge_sort and inplace_merge_sort
+        testcases (dict): Fingerprint -> test case, as returned by load_testcase_views()
+        views (dict): Arrangement -> fingerprints
+        iterations (int): Number of iterations per test case (default: 1)
+        warmup (int): Number of warmup runs per test case (default: 0)
+        **kwargs: Further arguments for run_experiment()
+
+    Returns:
+        dict: run_experiment() results per arrangement, including 'peak_bytes'
+    """
+    results = run_experiment(functions, testcases, iterations=iterations, warmup=warmup, views=views,
+                             measure_memory=True, **kwargs)
+
+    rows = []
+    for arrangement, arrangement_results in results.items():
+        for func in functions:
+            stats = arrangement_results[func.__name__]
+            if not stats:
+                continue
+            avg = sum(s['avg'] for s in stats) / len(stats)
+            per_element = sum(s['peak_bytes'] / max(s['input_size'], 1) for s in stats) / len(stats)
+            rows.append([arrangement, func.__name__, f"{avg:.6f}", f"{per_element:.2f}"])
+
+    _print_table("TIME AND PEAK MEMORY PER ARRANGEMENT", ["Arrangement", "Algorithm", "Mean Avg Time (s)",
+                                                        "Peak Bytes / Element"], rows)
+    return results
+
+
+def run_backend_experiment(functions, test_cases, backends=None, iterations=1, warmup=0, **kwargs):
+    """
+    Time every function on every container backend (list of boxed ints, array('q'),
+    NumPy int64 array, memoryview over a shared buffer) and report the container's
+    footprint per element next to the time.
+
+    Args:
+        functions (list): Sorting functions to compare
+        test_cases (list): Test cases, materialized anew for every run
+        backends (list): Names from utils.backends.BACKENDS (default: all of them)
+        iterations (int): Number of iterations per test case (default: 1)
+        warmup (int): Number of warmup runs per test case (default: 0)
+        **kwargs: Further arguments for run_experiment()
+
+    Returns:
+        dict: Backend -> {function name: [stats]}, the shape plot_testcase_comparison() takes
+    """
+    backends = backends or list(BACKENDS)
+    results = {backend: run_experiment(functions, test_cases, iterations=iterations, warmup=warmup,
+                                       measure_memory=True, backend=backend, **kwargs)
+               for backend in backends}
+
+    rows = []
+    for func in functions:
+        row = [func.__name__]
+        for backend in backends:
+            stats = results[backend][func.__name__]
+            avg = sum(s['avg'] for s in stats) / len(stats) if stats else 0.0
+            per_element = sum(s['bytes_per_element'] for s in stats) / len(stats) if stats else 0.0
+            row.append(f"{avg:.6f} / {per_element:.1f}")
+        rows.append(row)
+
+    _print_table("CONTAINER BACKENDS - MEAN AVG TIME (s) / BYTES PER ELEMENT", ["Algorithm"] + backends, rows)
+    return results
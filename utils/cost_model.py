@@ -0,0 +1,81 @@
+import json
+import os
+
+import numpy as np
+
+from algorithms.adaptive_sort import ROUTING_FEATURES, probe
+from algorithms.machine import machine_file, machine_id
+
+
+def _basis(sizes):
+    sizes = np.asarray(sizes, dtype=float)
+    return np.column_stack((np.ones_like(sizes), sizes, sizes * np.log2(np.maximum(sizes, 1)), sizes ** 2))
+
+
+def fit_cost_curve(sizes, times):
+    """
+    Least-squares fit of time = c0 + c1*n + c2*n*log2(n) + c3*n^2.
+
+    Columns are normalized before solving so the n^2 term does not swamp the others.
+
+    Args:
+        sizes (list): Input sizes
+        times (list): Measured times in seconds
+
+    Returns:
+        list: The four coefficients [c0, c1, c2, c3]
+    """
+    basis = _basis(sizes)
+    scale = np.abs(basis).max(axis=0)
+    scale[scale == 0] = 1
+    solution, *_ = np.linalg.lstsq(basis / scale, np.asarray(times, dtype=float), rcond=None)
+    return (solution / scale).tolist()
+
+
+def fit_cost_model(results, testcases, views, skip=('all',)):
+    """
+    Fit the cost model used by algorithms.adaptive_sort from run_experiment() results.
+
+    For every arrangement, the mean probe() features of its test cases form a centroid
+    and each function gets a cost curve fitted over (input size, average time).
+
+    Args:
+        results (dict): Results per arrangement, as returned by run_experiment(..., views=...)
+        testcases (dict): Fingerprint -> test case, as returned by load_testcase_views()
+        views (dict): Arrangement -> fingerprints
+        skip (tuple): Virtual arrangements to leave out (default: ('all',))
+
+    Returns:
+        dict: JSON-serializable model
+    """
+    model = {'machine': machine_id(), 'features': list(ROUTING_FEATURES), 'arrangements': {}}
+
+    for arrangement, func_results in results.items():
+        if arrangement in skip or not views.get(arrangement):
+            continue
+
+        features = [probe(testcases[fingerprint]) for fingerprint in views[arrangement]]
+        centroid = {name: float(np.mean([f[name] for f in features])) for name in ROUTING_FEATURES}
+
+        coefficients = {}
+        for func_name, stats in func_results.items():
+            if stats:
+                coefficients[func_name] = fit_cost_curve([s['input_size'] for s in stats], [s['avg'] for s in stats])
+
+        model['arrangements'][arrangement] = {'centroid': centroid, 'coefficients': coefficients}
+
+    return model
+
+
+def save_cost_model(model, path=None):
+    """
+    Write a cost model to this machine's model file (or the given path).
+
+    Returns:
+        str: The path written
+    """
+    path = path or machine_file('cost_model')
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as file:
+        json.dump(model, file, indent=2)
+    return path
@@ -0,0 +1,170 @@
+import json
+import os
+
+from utils.run_experiment import _stats_from_json, _stats_to_json
+
+# Completed cells written between two fsync() calls
+FSYNC_EVERY = 32
+
+
+class Journal:
+    """
+    Append-only, crash-safe JSON-lines journal of completed run_experiment() cells.
+
+    Every (function, test case, backend) cell is appended as one line as soon as it has
+    been measured; lines are flushed and fsync'd in batches of fsync_every, so a crash
+    loses at most one batch. A resumed journal replays the existing lines first, and
+    run_experiment() skips every cell found there that was measured with the same
+    settings (iterations, warmup, isolate, timer_overhead), continuing from the first
+    missing one. A line torn by a crash mid-write is cut off before new lines are
+    appended.
+    """
+
+    def __init__(self, path, resume=True, fsync_every=FSYNC_EVERY):
+        """
+        Args:
+            path (str): Journal file; parent directories are created
+            resume (bool): Replay and extend an existing journal; False starts afresh (default: True)
+            fsync_every (int): Cells per fsync batch (default: FSYNC_EVERY)
+        """
+        self.path = path
+        self.fsync_every = fsync_every
+        self.pending = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if resume:
+            # Cut a torn line off first, so every replayed cell is still in the file
+            _truncate_torn_tail(path)
+        self.cells = {}
+        self.settings = {}
+        for key, entry in (_read_entries(path) if resume else ()):
+            self.cells[key] = _stats_from_json(entry['stats'])
+            self.settings[key] = entry.get('settings')
+        self.file = open(path, 'a' if resume else 'w')
+
+    def lookup(self, func_name, fingerprint, backend='list', settings=None):
+        """
+        Statistics of a cell recorded earlier, or None if it is missing or was measured
+        with other settings than the given ones (cells recorded without settings never
+        match them).
+        """
+        key = (func_name, fingerprint, backend)
+        if settings is not None and self.settings.get(key) != settings:
+            return None
+        return self.cells.get(key)
+
+    def record(self, func_name, fingerprint, stats, backend='list', settings=None):
+        """
+        Append one completed cell.
+
+        Args:
+            func_name (str): Name of the timed function
+            fingerprint (str): Fingerprint of the test case
+            stats (dict): Statistics from _calculate_runtime() (plus memory, input_size, ...)
+            backend (str): Container backend the cell was measured on (default: 'list')
+            settings (dict): Measurement settings lookup() compares on resume, e.g.
+                             {'iterations': 5, 'warmup': 1, ...} (default: None)
+        """
+        entry = {'function': func_name, 'fingerprint': fingerprint, 'backend': backend,
+                 'settings': settings, 'stats': _stats_to_json(stats)}
+        self.file.write(json.dumps(entry) + '\n')
+        self.cells[(func_name, fingerprint, backend)] = stats
+        self.settings[(func_name, fingerprint, backend)] = settings
+        self.pending += 1
+        if self.pending >= self.fsync_every:
+            self.sync()
+
+    def sync(self):
+        """
+        Make every recorded cell durable.
+        """
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.pending = 0
+
+    def close(self):
+        if not self.file.closed:
+            self.sync()
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _truncate_torn_tail(path):
+    # Drop a final line without its newline (a write interrupted by a crash)
+    if not os.path.exists(path):
+        return
+    with open(path, 'rb+') as file:
+        data = file.read()
+        if data and not data.endswith(b'\n'):
+            file.truncate(data.rfind(b'\n') + 1)
+
+
+def _read_entries(path):
+    # (function name, fingerprint, backend) and parsed entry of every written line
+    if not os.path.exists(path):
+        return
+    with open(path) as file:
+        for line in file:
+            if not line.endswith('\n'):
+                # Torn final line
+                break
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                # A corrupt line loses its own cell only; later lines are still valid
+                continue
+            yield (entry['function'], entry['fingerprint'], entry.get('backend', 'list')), entry
+
+
+def read_journal(path):
+    """
+    Replay a journal. Only newline-terminated lines count as written: a final line
+    without its newline was torn by a crash, even if it happens to parse. Lines that
+    are not valid JSON are skipped.
+
+    Args:
+        path (str): Journal file (a missing file is an empty journal)
+
+    Returns:
+        dict: (function name, fingerprint, backend) -> statistics, in journal order;
+              a later line for the same cell replaces an earlier one
+    """
+    return {key: _stats_from_json(entry['stats']) for key, entry in _read_entries(path)}
+
+
+def results_from_journal(path, views=None, order=None, backend='list'):
+    """
+    Rebuild run_experiment() results from a journal, e.g. to plot a sweep that was
+    interrupted or ran in several sessions.
+
+    Args:
+        path (str): Journal file
+        views (dict): Arrangement -> fingerprints, as returned by load_testcase_views();
+                      without views, one list per function in journal order
+        order (list): Function names to include, in this order (default: all, in journal order)
+        backend (str): Backend whose cells to include (default: 'list')
+
+    Returns:
+        dict: Results shaped like run_experiment()'s; cells missing from the journal are left out
+    """
+    cells = {(func_name, fingerprint): stats
+             for (func_name, fingerprint, cell_backend), stats in read_journal(path).items()
+             if cell_backend == backend}
+    names = order or list(dict.fromkeys(func_name for func_name, _ in cells))
+
+    def collect(func_name, fingerprints):
+        return [dict(cells[(func_name, fingerprint)]) for fingerprint in fingerprints
+                if (func_name, fingerprint) in cells]
+
+    if views is None:
+        return {func_name: collect(func_name, [fingerprint for name, fingerprint in cells if name == func_name])
+                for func_name in names}
+    return {arrangement: {func_name: collect(func_name, view) for func_name in names}
+            for arrangement, view in views.items()}
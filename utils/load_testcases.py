@@ -1,3 +1,6 @@
+import hashlib
+from array import array
+
 def load_testcases(filepath):
     """
     Read test cases from a text file structured with multiple blocks as:
@@ -66,4 +69,57 @@ def load_testcases(filepath):
     except Exception as e:
         print(f"Error reading test case file: {e}")
     
-    return all_blocks
\ No newline at end of file
+    return all_blocks
+
+def fingerprint_testcase(block):
+    """
+    Compute a content fingerprint of a test case, so identical inputs can be detected
+    no matter which file (or position within a file) they were loaded from.
+
+    Integer blocks are hashed over their packed 64-bit representation; anything else
+    (floats, strings, huge ints) falls back to hashing its repr.
+
+    Args:
+        block (list): Elements of one test case
+
+    Returns:
+        str: Hex digest identifying the block's contents
+    """
+    try:
+        payload = b'q' + array('q', block).tobytes()
+    except (TypeError, OverflowError):
+        payload = b'r' + repr(list(block)).encode()
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+def load_testcase_views(testcase_files, combined_view='all'):
+    """
+    Load several test case files, storing every distinct block once.
+
+    Each arrangement becomes a view: an ordered list of fingerprints into the shared
+    case table. The combined view is a virtual index over all other views (in file
+    order) rather than a separate concatenated file.
+
+    Args:
+        testcase_files (dict): Mapping of arrangement name to test case file path
+        combined_view (str): Name of the virtual view over all arrangements
+                             (None to skip it)
+
+    Returns:
+        tuple: (cases, views) where cases maps fingerprint -> block and views maps
+               arrangement name -> list of fingerprints
+    """
+    cases = {}
+    views = {}
+
+    for arrangement, filepath in testcase_files.items():
+        views[arrangement] = []
+        for block in load_testcases(filepath):
+            fingerprint = fingerprint_testcase(block)
+            cases.setdefault(fingerprint, block)
+            views[arrangement].append(fingerprint)
+
+    if combined_view is not None:
+        views[combined_view] = [fingerprint for view in list(views.values()) for fingerprint in view]
+
+    return cases, views
@@ -787,10 +787,10 @@ def plot_quicksort_comparison(results, title="Quicksort Variants Comparison",
         all_input_sizes.update(grouped_results[func_name].keys())
     input_sizes = sorted(all_input_sizes)
     
-    # Colors, markers and line styles for consistent visualization
-    colors = ['#1f77b4', '#ff7f0e', '#2ca02c']  # Blue, orange, green
-    markers = ['o', 's', '^']
-    line_styles = ['-', '--', ':']
+    # Colors, markers and line styles for consistent visualization (cycled for larger matrices)
+    colors = plt.cm.tab20.colors if len(quicksort_variants) > 10 else plt.cm.tab10.colors
+    markers = ['o', 's', '^', 'D', 'v', 'P']
+    line_styles = ['-', '--', ':', '-.']
     
     # Create separate figures for min, avg, and max times
     metric_titles = ['Best Case (Minimum Time)', 'Average Case', 'Worst Case (Maximum Time)']
@@ -816,16 +816,16 @@ def plot_quicksort_comparison(results, title="Quicksort Variants Comparison",
             # Plot with both scatter points and lines
             ax.scatter(x_values, y_values, 
                      label=display_name,
-                     color=colors[i],
-                     marker=markers[i],
+                     color=colors[i % len(colors)],
+                     marker=markers[i % len(markers)],
                      s=60,
                      alpha=0.7,
                      edgecolors='black',
                      linewidths=0.5)
             
             ax.plot(x_values, y_values, 
-                   color=colors[i],
-                   linestyle=line_styles[i],
+                   color=colors[i % len(colors)],
+                   linestyle=line_styles[i % len(line_styles)],
                    alpha=0.6,
                    linewidth=2)
         
@@ -846,8 +846,11 @@ def plot_quicksort_comparison(results, title="Quicksort Variants Comparison",
         if log_scale:
             ax.set_yscale('log')
         
-        # Add legend
-        ax.legend(fontsize=12)
+        # Add legend (outside the axes when there are too many variants to fit)
+        if len(quicksort_variants) > 6:
+            ax.legend(fontsize=8, loc='upper left', bbox_to_anchor=(1, 1))
+        else:
+            ax.legend(fontsize=12)
         
         plt.tight_layout()
         
@@ -863,4 +866,195 @@ def plot_quicksort_comparison(results, title="Quicksort Variants Comparison",
     if not save_plots:
         plt.show()
     
-    return figures
\ No newline at end of file
+    return figures
+
+def plot_memory_comparison(results, title="Peak Memory Usage", metric='peak_bytes',
+                           log_scale=False, save_plots=False,
+                           save_dir='outputs/memory_plots/'):
+    """
+    Creates a line graph of memory usage versus input size for all algorithms,
+    averaging test cases with the same input size.
+    
+    Args:
+        results (dict): Dictionary with function names as keys and lists of statistics as values.
+                        Expected format is the output from run_experiment(..., measure_memory=True).
+        title (str): Title for the plot.
+        metric (str): Memory statistic to plot ('peak_bytes', 'sampled_allocations', 'peak_blocks',
+                      'retained_bytes' or 'retained_blocks').
+        log_scale (bool): Whether to use logarithmic scale for the y-axis.
+        save_plots (bool): Whether to save the plot as an image file.
+        save_dir (str): Directory to save the plot if save_plots is True.
+    
+    Returns:
+        list: List containing the figure object created.
+    """
+    # Only functions that went through the memory pass
+    func_names = [name for name, test_cases in results.items() if test_cases and metric in test_cases[0]]
+    if not func_names:
+        print(f"Error: No '{metric}' measurements found in results")
+        return None
+    
+    display_names = [name.replace('_', ' ').title() for name in func_names]
+    
+    # Group test cases by input size and calculate averages
+    grouped_results = {}
+    for func_name in func_names:
+        grouped_results[func_name] = defaultdict(lambda: {'sum': 0, 'count': 0})
+        
+        for test_case in results[func_name]:
+            input_size = test_case['input_size']
+            grouped_results[func_name][input_size]['sum'] += test_case[metric]
+            grouped_results[func_name][input_size]['count'] += 1
+    
+    # Get all unique input sizes across all functions
+    all_input_sizes = set()
+    for func_name in func_names:
+        all_input_sizes.update(grouped_results[func_name].keys())
+    input_sizes = sorted(all_input_sizes)
+    
+    # Create a color map for the algorithms
+    colors = plt.cm.tab10(range(len(func_names)))
+    markers = ['o', 's', '^', 'D', 'x', '*', '+', 'v', '<', '>']
+    
+    # Byte metrics are shown in KiB, block metrics as plain counts
+    scale, unit = (1024, 'Memory (KiB)') if metric.endswith('_bytes') else (1, 'Blocks')
+    
+    fig = plt.figure(figsize=(12, 7))
+    ax = fig.add_subplot(111)
+    
+    # Plot each algorithm
+    for i, (func_name, display_name) in enumerate(zip(func_names, display_names)):
+        x_values = []
+        y_values = []
+        
+        for size in input_sizes:
+            if size in grouped_results[func_name]:
+                data = grouped_results[func_name][size]
+                x_values.append(size)
+                y_values.append(data['sum'] / data['count'] / scale)
+        
+        ax.scatter(x_values, y_values, 
+                 label=display_name,
+                 color=colors[i % len(colors)],
+                 marker=markers[i % len(markers)],
+                 s=60,
+                 alpha=0.7,
+                 edgecolors='black',
+                 linewidths=0.5)
+        
+        ax.plot(x_values, y_values, 
+               color=colors[i % len(colors)],
+               linestyle='-',
+               alpha=0.6)
+    
+    # Set title and labels
+    ax.set_title(title, fontsize=16)
+    ax.set_xlabel('Input Size', fontsize=14)
+    ax.set_ylabel(unit, fontsize=14)
+    
+    # Set x-axis tick labels
+    ax.set_xticks(input_sizes)
+    if len(input_sizes) > 10:
+        interval = max(1, len(input_sizes) // 8)  # Show about 8 labels
+        x_labels = [str(size) if i % interval == 0 else '' for i, size in enumerate(input_sizes)]
+        ax.set_xticklabels(x_labels, rotation=45)
+    
+    # Set logarithmic scale if requested
+    if log_scale:
+        ax.set_yscale('log')
+    
+    ax.grid(True, linestyle='--', alpha=0.6)
+    ax.legend(fontsize=10, loc='upper left', bbox_to_anchor=(1, 1))
+    
+    plt.tight_layout()
+    
+    # Save if requested
+    if save_plots:
+        _ensure_directory_exists(save_dir)
+        filename = os.path.join(save_dir, f"{metric}_comparison.png")
+        plt.savefig(filename, dpi=300, bbox_inches='tight')
+        print(f"Memory plot saved as '{filename}'")
+    
+    if not save_plots:
+        plt.show()
+    
+    return [fig]
+
+
+def plot_runtime_vs_disorder(results, metric='inversion_ratio', title="Runtime vs Disorder",
+                             log_scale=True, save_plots=False,
+                             save_dir='outputs/disorder_plots/'):
+    """
+    Creates a scatter plot of size-normalized runtime against a presortedness metric,
+    one series per algorithm, so behaviour can be read off as a function of disorder
+    rather than per arrangement.
+    
+    Runtimes are divided by n*log2(n) so test cases of different sizes share one axis.
+    
+    Args:
+        results (dict): Dictionary with function names as keys and lists of statistics as values.
+                        Every statistics dictionary must carry 'presortedness'
+                        (see utils.presortedness.attach_presortedness()).
+        metric (str): Presortedness metric for the x-axis (e.g. 'inversion_ratio', 'run_ratio',
+                      'lis_ratio', 'displacement_ratio', 'distinct_ratio').
+        title (str): Title for the plot.
+        log_scale (bool): Whether to use logarithmic scale for the y-axis.
+        save_plots (bool): Whether to save the plot as an image file.
+        save_dir (str): Directory to save the plot if save_plots is True.
+    
+    Returns:
+        list: List containing the figure object created.
+    """
+    func_names = [name for name, test_cases in results.items()
+                  if test_cases and 'presortedness' in test_cases[0]]
+    if not func_names:
+        print("Error: No presortedness metrics found in results")
+        return None
+    
+    colors = plt.cm.tab10(range(len(func_names)))
+    markers = ['o', 's', '^', 'D', 'x', '*', '+', 'v', '<', '>']
+    
+    fig = plt.figure(figsize=(12, 7))
+    ax = fig.add_subplot(111)
+    
+    for i, func_name in enumerate(func_names):
+        x_values = []
+        y_values = []
+        for test_case in results[func_name]:
+            n = test_case['input_size']
+            if n < 2:
+                continue
+            x_values.append(test_case['presortedness'][metric])
+            y_values.append(test_case['avg'] / (n * math.log2(n)) * 1e9)
+        
+        ax.scatter(x_values, y_values,
+                   label=func_name.replace('_', ' ').title(),
+                   color=colors[i % len(colors)],
+                   marker=markers[i % len(markers)],
+                   s=40,
+                   alpha=0.6,
+                   edgecolors='black',
+                   linewidths=0.5)
+    
+    ax.set_title(title, fontsize=16)
+    ax.set_xlabel(metric.replace('_', ' ').title(), fontsize=14)
+    ax.set_ylabel('Time / (n log2 n) (ns)', fontsize=14)
+    
+    if log_scale:
+        ax.set_yscale('log')
+    
+    ax.grid(True, linestyle='--', alpha=0.6)
+    ax.legend(fontsize=10, loc='upper left', bbox_to_anchor=(1, 1))
+    
+    plt.tight_layout()
+    
+    if save_plots:
+        _ensure_directory_exists(save_dir)
+        filename = os.path.join(save_dir, f"runtime_vs_{metric}.png")
+        plt.savefig(filename, dpi=300, bbox_inches='tight')
+        print(f"Disorder plot saved as '{filename}'")
+    
+    if not save_plots:
+        plt.show()
+    
+    return [fig]
@@ -0,0 +1,180 @@
+from bisect import bisect_right
+
+import numpy as np
+
+from utils.load_testcases import fingerprint_testcase
+
+# Fingerprint -> metrics, so each distinct test case is analysed once per process
+_metrics_cache = {}
+
+
+def _ranks(values):
+    """
+    Position of each element in sorted order, equal elements ranked by index.
+    """
+    order = np.argsort(values, kind='stable')
+    ranks = np.empty(len(values), dtype=np.int64)
+    ranks[order] = np.arange(len(values))
+    return ranks
+
+
+def inversion_count(arr):
+    """
+    Count pairs i < j with arr[i] > arr[j] using a bottom-up merge sort.
+
+    Each merge level is vectorized: every run holds distinct ranks, so offsetting runs
+    by block * n makes all left runs one globally sorted array, and a single
+    searchsorted counts, for every right-run element, the larger elements in its
+    paired left run. The same searches give each element's merged position, so the
+    runs are merged with an O(n) scatter instead of a re-sort, and the whole count
+    takes log2(n) NumPy passes instead of a Python-level merge.
+
+    Args:
+        arr: Sequence of mutually comparable elements
+
+    Returns:
+        int: Number of inversions (equal elements are not inversions)
+    """
+    values = np.asarray(arr)
+    n = len(values)
+    if n < 2:
+        return 0
+
+    runs = _ranks(values)
+    index = np.arange(n, dtype=np.int64)
+    inversions = 0
+    width = 1
+    while width < n:
+        block = index // (2 * width)
+        in_right = index % (2 * width) >= width
+        keys = block * n + runs
+
+        left_keys = keys[~in_right]
+        right_keys = keys[in_right]
+        right_block = block[in_right]
+        # End of each right element's paired left run within left_keys
+        left_end = np.searchsorted(left_keys, (right_block + 1) * n, 'left')
+        left_below = np.searchsorted(left_keys, right_keys, 'right')
+        inversions += int((left_end - left_below).sum())
+
+        # Merge by scattering: every block before an element's own is full, so its merged
+        # position is its index in its half plus the count of smaller keys in the other
+        merged = np.empty(n, dtype=np.int64)
+        merged[np.arange(len(left_keys)) + np.searchsorted(right_keys, left_keys, 'left')] = runs[~in_right]
+        merged[np.arange(len(right_keys)) + left_below] = runs[in_right]
+        runs = merged
+        width *= 2
+    return inversions
+
+
+def ascending_runs(arr):
+    """
+    Number of maximal non-decreasing runs (1 for sorted input, n for strictly decreasing).
+    """
+    values = np.asarray(arr)
+    if len(values) == 0:
+        return 0
+    return 1 + int(np.count_nonzero(values[1:] < values[:-1]))
+
+
+def longest_increasing_subsequence(arr):
+    """
+    Length of the longest non-decreasing subsequence (patience sorting, O(n log n)).
+
+    Equal elements count as ordered, as in ascending_runs(), so sorted input with
+    duplicates scores n; n minus this length is the Rem measure of disorder (the fewest
+    elements to remove to leave a sorted sequence).
+    """
+    values = np.asarray(arr)
+    if len(values) == 0:
+        return 0
+    # Dense ranks keep equal elements equal while turning everything into small ints
+    _, dense = np.unique(values, return_inverse=True)
+    tails = []
+    for value in dense.ravel().tolist():
+        position = bisect_right(tails, value)
+        if position == len(tails):
+            tails.append(value)
+        else:
+            tails[position] = value
+    return len(tails)
+
+
+def max_displacement(arr):
+    """
+    Largest distance between an element's position and its position in sorted order.
+    """
+    values = np.asarray(arr)
+    if len(values) == 0:
+        return 0
+    return int(np.abs(_ranks(values) - np.arange(len(values))).max())
+
+
+def distinct_ratio(arr):
+    """
+    Fraction of distinct keys (1 when all elements differ).
+    """
+    values = np.asarray(arr)
+    if len(values) == 0:
+        return 1.0
+    return len(np.unique(values)) / len(values)
+
+
+def compute_presortedness(arr, fingerprint=None):
+    """
+    Compute all presortedness metrics of one test case, cached by fingerprint.
+
+    Args:
+        arr (list): The test case
+        fingerprint (str): Its fingerprint, if already known
+
+    Returns:
+        dict: 'inversions', 'inversion_ratio' (inversions / max possible), 'runs',
+              'run_ratio' (runs / n), 'lis', 'lis_ratio' (lis / n),
+              'max_displacement', 'displacement_ratio' (max_displacement / n)
+              and 'distinct_ratio'
+    """
+    if fingerprint is None:
+        fingerprint = fingerprint_testcase(arr)
+    if fingerprint in _metrics_cache:
+        return _metrics_cache[fingerprint]
+
+    n = len(arr)
+    max_inversions = n * (n - 1) // 2
+    metrics = {
+        'inversions': inversion_count(arr),
+        'runs': ascending_runs(arr),
+        'lis': longest_increasing_subsequence(arr),
+        'max_displacement': max_displacement(arr),
+        'distinct_ratio': distinct_ratio(arr),
+    }
+    metrics['inversion_ratio'] = metrics['inversions'] / max_inversions if max_inversions else 0.0
+    metrics['run_ratio'] = metrics['runs'] / n if n else 0.0
+    metrics['lis_ratio'] = metrics['lis'] / n if n else 0.0
+    metrics['displacement_ratio'] = metrics['max_displacement'] / n if n else 0.0
+
+    _metrics_cache[fingerprint] = metrics
+    return metrics
+
+
+def attach_presortedness(results, testcases):
+    """
+    Add a 'presortedness' entry to every statistics dictionary in run_experiment() results.
+
+    Args:
+        results (dict): Results with or without views; every stats dict must carry 'fingerprint'
+        testcases (dict): Fingerprint -> test case
+
+    Returns:
+        dict: The same results object, updated in place
+    """
+    def visit(node):
+        if isinstance(node, list):
+            for stats in node:
+                stats['presortedness'] = compute_presortedness(testcases[stats['fingerprint']], stats['fingerprint'])
+        else:
+            for child in node.values():
+                visit(child)
+
+    visit(results)
+    return results
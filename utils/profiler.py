@@ -0,0 +1,203 @@
+import argparse
+import cProfile
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+
+PROFILERS = ('cprofile', 'sampling')
+MAX_STACK_DEPTH = 64
+
+
+def _frame_label(filename, line, name):
+    # Collapsed-stack format uses ';' as separator, so keep it out of labels
+    return f"{name} ({os.path.basename(filename)}:{line})".replace(';', ',')
+
+
+def _profiled_call(func, arr):
+    # Marks the bottom of the sampled stacks
+    func(arr)
+
+
+def select_case(test_cases, size):
+    """
+    Pick the test case whose length is closest to the requested size.
+
+    Args:
+        test_cases (list): Candidate test cases
+        size (int): Desired input size
+
+    Returns:
+        list: The chosen test case
+    """
+    if not test_cases:
+        raise ValueError("No test cases to profile")
+    return min(test_cases, key=lambda case: abs(len(case) - size))
+
+
+def collapse_pstats(stats):
+    """
+    Convert cProfile statistics into collapsed stacks ("root;caller;callee value").
+
+    cProfile only records caller -> callee edges, so each function's own time is
+    spread over its callers in proportion to the cumulative time along each edge,
+    walking up to the root. Recursive edges are folded into the first occurrence.
+
+    Args:
+        stats (pstats.Stats): Profile statistics
+
+    Returns:
+        Counter: Collapsed stack -> own time in microseconds
+    """
+    raw = stats.stats
+    collapsed = Counter()
+
+    def walk(func, weight, stack):
+        callers = {caller: edge for caller, edge in raw[func][4].items()
+                   if caller not in stack and caller in raw}
+        if not callers or len(stack) >= MAX_STACK_DEPTH:
+            collapsed[';'.join(_frame_label(*f) for f in reversed(stack))] += weight
+            return
+        total = sum(edge[3] for edge in callers.values())
+        for caller, edge in callers.items():
+            share = edge[3] / total if total > 0 else 1 / len(callers)
+            walk(caller, weight * share, stack + (caller,))
+
+    for func, (_, _, own_time, _, _) in raw.items():
+        # Skip the profiler's own bookkeeping call
+        if own_time > 0 and '_lsprof.Profiler' not in func[2]:
+            walk(func, own_time * 1e6, (func,))
+
+    return Counter({stack: round(weight) for stack, weight in collapsed.items() if round(weight) > 0})
+
+
+def _write_collapsed(collapsed, path):
+    with open(path, 'w') as file:
+        for stack, value in sorted(collapsed.items()):
+            file.write(f"{stack} {value}\n")
+
+
+def _sample(func, arr, interval):
+    """
+    Run func(arr) on this thread while a background thread samples its stack.
+
+    Returns:
+        Counter: Collapsed stack -> number of samples
+    """
+    target = threading.get_ident()
+    samples = Counter()
+    done = threading.Event()
+    bottom = _profiled_call.__code__
+
+    def sampler():
+        while not done.wait(interval):
+            frame = sys._current_frames().get(target)
+            stack = []
+            while frame is not None and frame.f_code is not bottom:
+                code = frame.f_code
+                stack.append(_frame_label(code.co_filename, code.co_firstlineno, code.co_name))
+                frame = frame.f_back
+            # Only count samples taken while the profiled call was on the stack
+            if frame is not None and stack:
+                samples[';'.join(reversed(stack[-MAX_STACK_DEPTH:]))] += 1
+
+    # Let the sampler get the GIL about as often as it wants to sample
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(min(switch_interval, interval))
+    thread = threading.Thread(target=sampler, daemon=True)
+    thread.start()
+    try:
+        _profiled_call(func, arr)
+    finally:
+        done.set()
+        thread.join()
+        sys.setswitchinterval(switch_interval)
+    return samples
+
+
+def profile_cell(func, test_cases, size, arrangement='case', profiler='cprofile', runs=1,
+                 sample_interval=0.0005, save_dir='outputs/profiles/'):
+    """
+    Profile one (function, arrangement, size) cell in a pass of its own, so the
+    regular timing numbers are never measured with a profiler attached.
+
+    With 'cprofile', writes a .pstats file (for pstats/snakeviz) plus a .collapsed
+    file derived from it. With 'sampling', the stack is sampled every sample_interval
+    seconds and only the .collapsed file is written. Collapsed files feed straight
+    into flamegraph.pl or speedscope.
+
+    Args:
+        func (callable): Sorting function to profile
+        test_cases (list): Test cases of the arrangement
+        size (int): Input size; the closest available size is used
+        arrangement (str): Arrangement name, used in the output file names
+        profiler (str): 'cprofile' or 'sampling'
+        runs (int): Number of times to sort a fresh copy of the case (default: 1)
+        sample_interval (float): Seconds between stack samples in sampling mode
+        save_dir (str): Directory the profile files are written to
+
+    Returns:
+        dict: Paths of the written files under 'pstats' (cProfile only) and 'collapsed',
+              plus the 'input_size' actually profiled
+    """
+    if profiler not in PROFILERS:
+        raise ValueError(f"Unknown profiler '{profiler}', expected one of {PROFILERS}")
+
+    case = select_case(test_cases, size)
+    os.makedirs(save_dir, exist_ok=True)
+    base = os.path.join(save_dir, f"{func.__name__}_{arrangement}_{len(case)}_{profiler}")
+    outputs = {'input_size': len(case)}
+
+    if profiler == 'cprofile':
+        profile = cProfile.Profile()
+        for _ in range(runs):
+            profile.runcall(func, case.copy())
+        outputs['pstats'] = base + '.pstats'
+        profile.dump_stats(outputs['pstats'])
+        collapsed = collapse_pstats(pstats.Stats(profile))
+    else:
+        collapsed = Counter()
+        for _ in range(runs):
+            collapsed.update(_sample(func, case.copy(), sample_interval))
+
+    outputs['collapsed'] = base + '.collapsed'
+    _write_collapsed(collapsed, outputs['collapsed'])
+    return outputs
+
+
+def print_hotspots(pstats_path, limit=10):
+    """
+    Print the functions with the highest own time from a saved .pstats file.
+    """
+    pstats.Stats(pstats_path).sort_stats('tottime').print_stats(limit)
+
+
+def parse_args(function_names, arrangements):
+    parser = argparse.ArgumentParser(description='Profile one sorting function on one arrangement and size')
+    parser.add_argument('function', choices=function_names)
+    parser.add_argument('arrangement', choices=arrangements)
+    parser.add_argument('size', type=int)
+    parser.add_argument('--profiler', choices=PROFILERS, default='cprofile')
+    parser.add_argument('--runs', type=int, default=1)
+    parser.add_argument('--save-dir', default='outputs/profiles/')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from run import FUNCTIONS, TESTCASE_FILES
+    from utils.load_testcases import load_testcases
+
+    functions = {func.__name__: func for func in FUNCTIONS}
+    args = parse_args(list(functions), list(TESTCASE_FILES))
+    start = time.perf_counter()
+    outputs = profile_cell(functions[args.function], load_testcases(TESTCASE_FILES[args.arrangement]), args.size,
+                           args.arrangement, args.profiler, args.runs, save_dir=args.save_dir)
+    print(f"Profiled {args.function} on {args.arrangement} (n={outputs['input_size']}) in {time.perf_counter() - start:.2f}s")
+    for kind in ('pstats', 'collapsed'):
+        if kind in outputs:
+            print(f"   - {kind}: {outputs[kind]}")
+    if 'pstats' in outputs:
+        print_hotspots(outputs['pstats'])
@@ -1,82 +1,426 @@
+import gc
+import json
+import os
+import sys
 import time
+import tracemalloc
+from array import array
+from contextlib import contextmanager
 from tqdm import tqdm
 
+from utils.backends import footprint, materializer
+from utils.load_testcases import fingerprint_testcase
+from utils.stream_stats import StreamingStats
 
-def _calculate_runtime(func, iterations=1, warmup=0, *args, **kwargs):
+
+def calibrate_timer_overhead(samples=10000):
+    """
+    Estimates the fixed cost of timing an empty function call with perf_counter.
+
+    Args:
+        samples: Number of empty calls to time (default: 10000).
+
+    Returns:
+        The minimum observed overhead in seconds (the minimum is the least noisy
+        estimate of a constant cost).
+    """
+    def empty():
+        pass
+
+    timer = time.perf_counter
+    overhead = float('inf')
+    for _ in range(samples):
+        start_time = timer()
+        empty()
+        overhead = min(overhead, timer() - start_time)
+    return overhead
+
+
+@contextmanager
+def timing_isolation(enabled=True, cpu=None, priority=None, spin_seconds=0.2):
+    """
+    Context manager that sets up a low-noise environment for timing and restores
+    the process afterwards.
+
+    Args:
+        enabled: When False, nothing is changed and only the defaults are reported (default: True).
+        cpu: CPU index to pin the process to with os.sched_setaffinity (default: None, no pinning).
+        priority: Niceness increment to apply, e.g. -10 to raise priority (default: None, unchanged).
+                  Raising priority usually needs elevated privileges; failures are recorded, not raised.
+        spin_seconds: Busy-loop duration before timing so the CPU leaves its low-frequency
+                      state (default: 0.2).
+
+    Yields:
+        dict: The settings actually in effect, including the calibrated 'timer_overhead',
+              suitable for passing on to display_machine_specs().
+    """
+    settings = {
+        'isolated': enabled,
+        'gc_disabled': enabled,
+        'cpu_affinity': None,
+        'priority': None,
+        'spin_seconds': 0.0,
+        'timer_overhead': 0.0,
+    }
+    if not enabled:
+        yield settings
+        return
+
+    original_affinity = None
+    original_priority = None
+    try:
+        if cpu is not None:
+            if hasattr(os, 'sched_setaffinity'):
+                original_affinity = os.sched_getaffinity(0)
+                try:
+                    os.sched_setaffinity(0, {cpu})
+                    settings['cpu_affinity'] = cpu
+                except OSError as e:
+                    settings['cpu_affinity'] = f"unchanged ({e.strerror})"
+            else:
+                settings['cpu_affinity'] = "unchanged (sched_setaffinity unavailable)"
+
+        if priority is not None:
+            try:
+                original_priority = os.getpriority(os.PRIO_PROCESS, 0)
+                os.setpriority(os.PRIO_PROCESS, 0, original_priority + priority)
+                settings['priority'] = os.getpriority(os.PRIO_PROCESS, 0)
+            except (AttributeError, OSError) as e:
+                original_priority = None
+                settings['priority'] = f"unchanged ({getattr(e, 'strerror', None) or e})"
+
+        # Ramp the CPU clock up before anything is measured
+        deadline = time.perf_counter() + spin_seconds
+        while time.perf_counter() < deadline:
+            pass
+        settings['spin_seconds'] = spin_seconds
+
+        settings['timer_overhead'] = calibrate_timer_overhead()
+        yield settings
+    finally:
+        if original_priority is not None:
+            try:
+                os.setpriority(os.PRIO_PROCESS, 0, original_priority)
+            except OSError:
+                pass
+        if original_affinity is not None:
+            os.sched_setaffinity(0, original_affinity)
+
+
+def _summarize(accumulator, cpu_accumulator):
+    """
+    Derives the flat statistics stored in each result from the two accumulators.
+    """
+    stats = accumulator.summary()
+    del stats['count']
+    cpu_summary = cpu_accumulator.summary()
+    for name in ('min', 'max', 'avg', 'p50', 'p90', 'p99'):
+        stats[f'cpu_{name}'] = cpu_summary[name]
+    stats['iterations'] = accumulator.count
+    stats['accumulator'] = accumulator
+    stats['cpu_accumulator'] = cpu_accumulator
+    return stats
+
+
+def _calculate_runtime(func, iterations=1, warmup=0, *args, isolate=False, timer_overhead=0.0, keep_samples=False, setup=None, **kwargs):
     """
     Calculates the runtime statistics of a function with warmup and multiple iterations.
 
+    Samples are folded into constant-memory StreamingStats accumulators, so the
+    statistics cost the same regardless of the number of iterations.
+
     Args:
         func: The function to be timed.
         iterations: Number of iterations to run for gathering statistics (default: 1).
         warmup: Number of warmup runs to perform before timing (default: 0).
         *args: Positional arguments for the function.
+        isolate: Collect garbage before each iteration and keep the garbage collector
+                 disabled while the function runs (default: False).
+        timer_overhead: Calibrated cost of an empty timed call, subtracted from every
+                        wall-clock sample (default: 0.0).
+        keep_samples: Also keep the raw samples as compact array('d') under 'times'
+                      and 'cpu_times' (default: False).
+        setup: Function returning fresh positional arguments, called before every
+               warmup and timed run outside the timed region, so in-place functions
+               never see the output of the previous run (default: None, reuse args).
         **kwargs: Keyword arguments for the function.
 
     Returns:
-        A dictionary containing the function's return value and runtime statistics in seconds
-        (min, max, avg, total, individual runs).
+        A dictionary of runtime statistics in seconds (min, max, avg, total, stddev,
+        p50/p90/p99, mad, filtered_avg and outliers), the same percentiles for CPU time
+        (process_time) under the 'cpu_' prefix, and the mergeable 'accumulator' and
+        'cpu_accumulator' they were derived from. For randomized functions that publish
+        a 'last_seed' attribute, 'seeds' holds the seed of every timed iteration and
+        'slowest_seed' the seed of the slowest one (see replay_run()).
     """
     # Perform warmup runs (results discarded)
     for _ in range(warmup):
-        func(*args, **kwargs)
+        func(*(setup() if setup else args), **kwargs)
     
     # Perform timed iterations
-    times = []
-    result = None
+    accumulator = StreamingStats()
+    cpu_accumulator = StreamingStats()
+    times = array('d')
+    cpu_times = array('d')
+    seeds = []
+    slowest = (-1.0, None)
+    gc_was_enabled = gc.isenabled()
     
-    for i in range(iterations):
-        start_time = time.perf_counter()
-        current_result = func(*args, **kwargs)
-        end_time = time.perf_counter()
-        runtime = end_time - start_time
-        times.append(runtime)
-        
-        # Save the last result (or first if you prefer)
-        if i == 0:
-            result = current_result
+    try:
+        for _ in range(iterations):
+            if setup:
+                args = setup()
+            if isolate:
+                gc.collect()
+                gc.disable()
+
+            cpu_start = time.process_time()
+            start_time = time.perf_counter()
+            func(*args, **kwargs)
+            end_time = time.perf_counter()
+            cpu_end = time.process_time()
+
+            if isolate and gc_was_enabled:
+                gc.enable()
+
+            runtime = max(end_time - start_time - timer_overhead, 0.0)
+            accumulator.add(runtime)
+            cpu_accumulator.add(cpu_end - cpu_start)
+            seed = _last_seed(func)
+            if seed is not None:
+                seeds.append(seed)
+                slowest = max(slowest, (runtime, seed), key=lambda pair: pair[0])
+            if keep_samples:
+                times.append(runtime)
+                cpu_times.append(cpu_end - cpu_start)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
     
     # Calculate statistics
-    stats = {
-        'result': result,
-        'times': times,
-        'min': min(times) if times else 0,
-        'max': max(times) if times else 0,
-        'avg': sum(times) / len(times) if times else 0,
-        'total': sum(times) if times else 0,
-        'iterations': iterations
-    }
+    stats = _summarize(accumulator, cpu_accumulator)
+    if keep_samples:
+        stats['times'] = times
+        stats['cpu_times'] = cpu_times
+    if seeds:
+        stats['seeds'] = seeds
+        stats['slowest_seed'] = slowest[1]
     
     return stats
 
 
-def run_experiment(functions, test_cases, iterations=1, warmup=0):
+def _last_seed(func):
+    # Randomized sorts publish the seed of their latest call; wrappers expose __wrapped__
+    while func is not None:
+        seed = getattr(func, 'last_seed', None)
+        if seed is not None:
+            return seed
+        func = getattr(func, '__wrapped__', None)
+    return None
+
+
+def replay_run(func, test_case, seed, **kwargs):
+    """
+    Re-run one randomized call with a recorded seed, e.g. the 'slowest_seed' of a cell,
+    to investigate it; the pivot choices are identical to the recorded run.
+
+    Args:
+        func (callable): The function that was timed; it must accept a seed keyword.
+        test_case (list): The input of that run; a copy is sorted.
+        seed (int): Seed recorded in the statistics.
+        **kwargs: Further arguments for _calculate_runtime() (isolate, timer_overhead, ...).
+
+    Returns:
+        dict: Runtime statistics of the single replayed run.
+    """
+    return _calculate_runtime(bind_params(func, seed=seed), 1, 0, list(test_case), **kwargs)
+
+
+class _BlockCounter:
+    """
+    Profile hook following the number of live allocated blocks (sys.getallocatedblocks())
+    at every Python and C function call and return. The sum of its increases is a sampled
+    lower bound on the number of allocations: blocks allocated and freed between two
+    events, e.g. inside a loop that makes no calls, are not seen, so the count is only
+    comparable between algorithms that allocate through calls. Its maximum gives the
+    peak number of live blocks. (A line-level trace hook would see more, but slows the
+    quadratic sorts down some 40 times.)
+    """
+
+    def __init__(self):
+        self.baseline = self.last = self.peak = sys.getallocatedblocks()
+        self.allocated = 0
+
+    def __call__(self, frame, event, arg):
+        blocks = sys.getallocatedblocks()
+        if blocks > self.last:
+            self.allocated += blocks - self.last
+            if blocks > self.peak:
+                self.peak = blocks
+        self.last = blocks
+
+
+def _calculate_memory(func, *args, **kwargs):
+    """
+    Measures the memory a function allocates while it runs, using tracemalloc, and a
+    sampled lower bound on how many allocations it makes, using a profile hook on
+    sys.getallocatedblocks().
+
+    The arguments are created before tracing starts, so only memory allocated by the
+    function itself is counted. Tracing slows Python down considerably, which is why
+    this runs as a separate pass and never overlaps with timing.
+
+    Args:
+        func: The function to be measured.
+        *args: Positional arguments for the function.
+        **kwargs: Keyword arguments for the function.
+
+    Returns:
+        A dictionary with 'peak_bytes' (highest traced memory above the starting point),
+        'sampled_allocations' (lower bound on the allocations made while the function ran,
+        sampled at every call and return: temporaries such as merge buffers and per-pass
+        output lists are counted, allocations freed again before the next call or return
+        are not), 'peak_blocks' (highest sampled number of live blocks above the starting
+        point), and 'retained_bytes' / 'retained_blocks' (memory and
+        number of blocks still alive when the function returned, net of frees).
+    """
+    was_tracing = tracemalloc.is_tracing()
+    gc.collect()
+    if not was_tracing:
+        tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        baseline, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+
+        counter = _BlockCounter()
+        sys.setprofile(counter)
+        try:
+            func(*args, **kwargs)
+        finally:
+            sys.setprofile(None)
+
+        current, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+
+    # Ignore the snapshots' own bookkeeping
+    trace_filter = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    retained_blocks = sum(diff.count_diff for diff in after.filter_traces(trace_filter).compare_to(
+        before.filter_traces(trace_filter), 'lineno') if diff.count_diff > 0)
+
+    return {
+        'peak_bytes': max(peak - baseline, 0),
+        'sampled_allocations': counter.allocated,
+        'peak_blocks': counter.peak - counter.baseline,
+        'retained_bytes': max(current - baseline, 0),
+        'retained_blocks': retained_blocks,
+    }
+
+
+def merge_runtime_stats(stats, other):
+    """
+    Combines two statistics dictionaries measured for the same (function, input) cell,
+    e.g. by different worker processes.
+
+    Args:
+        stats (dict): Statistics as returned by _calculate_runtime().
+        other (dict): Statistics for the same cell.
+
+    Returns:
+        dict: New statistics over the samples of both; non-statistical keys such as
+              'input_size' and 'fingerprint' are taken from stats.
+    """
+    accumulator = StreamingStats().merge(stats['accumulator']).merge(other['accumulator'])
+    cpu_accumulator = StreamingStats().merge(stats['cpu_accumulator']).merge(other['cpu_accumulator'])
+    merged = dict(stats)
+    merged.update(_summarize(accumulator, cpu_accumulator))
+    if 'times' in stats and 'times' in other:
+        merged['times'] = stats['times'] + other['times']
+        merged['cpu_times'] = stats['cpu_times'] + other['cpu_times']
+    else:
+        merged.pop('times', None)
+        merged.pop('cpu_times', None)
+    return merged
+
+
+def run_experiment(functions, test_cases, iterations=1, warmup=0, views=None, isolate=False, timer_overhead=0.0, measure_memory=False, backend=None, journal=None):
     """
     Run an experiment on multiple functions using a list of test cases.
+
+    Test cases are fingerprinted and each unique (function, input) pair is timed once;
+    the statistics are then fanned out to every position (and every view) that
+    references that input.
     
     Args:
         functions (list or callable): A single function or a list of functions to test.
-        test_cases (list): A list of test cases, where each test case is a list of arguments to pass to the function.
+        test_cases (list or dict): A list of test cases, where each test case is a list of arguments to pass to the function.
+                                   When views is given, a dict mapping fingerprint -> test case
+                                   (as returned by load_testcase_views()).
         iterations (int): Number of iterations to run for each test case (default: 1).
         warmup (int): Number of warmup runs before timing starts (default: 0).
+        views (dict): Optional mapping of arrangement name -> list of fingerprints into test_cases.
+        isolate (bool): Disable the garbage collector around each timed run (default: False).
+        timer_overhead (float): Calibrated empty-call overhead subtracted from each timing (default: 0.0).
+        measure_memory (bool): After timing each cell, run it once more under tracemalloc and add
+                               'peak_bytes', 'sampled_allocations', 'peak_blocks', 'retained_bytes' and
+                               'retained_blocks' (default: False).
+        backend (str or callable): Container every run receives, a name in utils.backends.BACKENDS
+                                   ('list', 'array', 'numpy', 'memoryview') or a function; a fresh
+                                   one is materialized before each run (default: 'list').
+        journal (utils.journal.Journal): Append every completed cell to this journal and reuse the
+                                         cells it already holds (measured with the same iterations,
+                                         warmup, isolate and timer_overhead, and with memory if
+                                         measure_memory), so an interrupted run resumes from the
+                                         first missing cell.
     
     Returns:
         dict: A dictionary where keys are function names and values are lists of dictionaries
-              containing the function's return value, test case length, and detailed runtime statistics for each test case.
+              containing the test case length, fingerprint, and detailed runtime statistics for each test case.
+              When views is given, a dictionary mapping each arrangement name to such a dictionary.
     """
     # Convert single function to list for uniform handling
     if callable(functions) and not isinstance(functions, list):
         functions = [functions]
+
+    if views is None:
+        cases = {}
+        order = []
+        for case in test_cases:
+            fingerprint = fingerprint_testcase(case)
+            cases.setdefault(fingerprint, case)
+            order.append(fingerprint)
+    else:
+        cases = test_cases
+        order = [fingerprint for view in views.values() for fingerprint in view]
+
+    # Unique inputs in first-appearance order
+    unique_fingerprints = list(dict.fromkeys(order))
+    
+    results = {} if views is None else {arrangement: {} for arrangement in views}
+    materialize = materializer(backend)
+    backend_name = backend if isinstance(backend, str) else getattr(backend, '__name__', 'list')
     
-    results = {}
+    # Journaled cells are only reused when measured the same way
+    settings = {'iterations': iterations, 'warmup': warmup, 'isolate': isolate, 'timer_overhead': timer_overhead}
     
     for func in functions:
         func_name = func.__name__
-        results[func_name] = []
+        cell_stats = {}
         
-        for i, case in enumerate(tqdm(test_cases, desc=f"{func_name}: ")):
-            # Add iterations and warmup as the first arguments
-            stats = _calculate_runtime(func, iterations, warmup, case.copy())
+        for fingerprint in tqdm(unique_fingerprints, desc=f"{func_name}: "):
+            if journal is not None:
+                recorded = journal.lookup(func_name, fingerprint, backend_name, settings)
+                if recorded is not None and (not measure_memory or 'peak_bytes' in recorded):
+                    cell_stats[fingerprint] = recorded
+                    continue
+
+            case = cases[fingerprint]
+            # Add iterations and warmup as the first arguments; every run sorts a fresh container
+            stats = _calculate_runtime(func, iterations, warmup, isolate=isolate, timer_overhead=timer_overhead,
+                                       setup=lambda: (materialize(case),))
             
             # Add test case length to the statistics
             # If case is a list, tuple, string or other sequence type
@@ -85,7 +429,143 @@ def run_experiment(functions, test_cases, iterations=1, warmup=0):
             except (TypeError, AttributeError):
                 # If the case doesn't have a length (like an integer)
                 stats['input_size'] = 1
+            stats['fingerprint'] = fingerprint
+
+            if measure_memory:
+                container = materialize(case)
+                stats['container_bytes'] = footprint(container)
+                stats['bytes_per_element'] = stats['container_bytes'] / max(stats['input_size'], 1)
+                stats.update(_calculate_memory(func, container))
             
-            results[func_name].append(stats)
+            cell_stats[fingerprint] = stats
+            if journal is not None:
+                journal.record(func_name, fingerprint, stats, backend_name, settings)
+
+        if journal is not None:
+            journal.sync()
+
+        # Fan each measurement out to every reference (copied so views stay independent)
+        if views is None:
+            results[func_name] = [dict(cell_stats[fingerprint]) for fingerprint in order]
+        else:
+            for arrangement, view in views.items():
+                results[arrangement][func_name] = [dict(cell_stats[fingerprint]) for fingerprint in view]
             
-    return results
\ No newline at end of file
+    return results
+
+
+def bind_params(func, **params):
+    """
+    Wraps a function with fixed keyword arguments under a descriptive name, so that
+    variants of one algorithm get separate entries in run_experiment() results.
+
+    Args:
+        func (callable): The function to wrap.
+        **params: Keyword arguments to pass on every call.
+
+    Returns:
+        callable: The wrapper, named e.g. 'merge_sort_cutoff_8'.
+    """
+    def bound(*args, **kwargs):
+        return func(*args, **params, **kwargs)
+    suffix = '_'.join(f"{name}_{value}" for name, value in params.items())
+    bound.__name__ = f"{func.__name__}_{suffix}" if suffix else func.__name__
+    bound.__wrapped__ = func
+    return bound
+
+
+def run_parameter_sweep(functions, test_cases, param, values, iterations=1, warmup=0, **kwargs):
+    """
+    Runs run_experiment() for every value of one keyword parameter.
+
+    Args:
+        functions (list or callable): Functions accepting the parameter.
+        test_cases (list): Test cases, as for run_experiment().
+        param (str): Name of the keyword parameter to sweep.
+        values (list): Values to try.
+        iterations (int): Number of iterations per test case (default: 1).
+        warmup (int): Number of warmup runs per test case (default: 0).
+        **kwargs: Further arguments for run_experiment().
+
+    Returns:
+        tuple: (results, best) where results is a run_experiment() dictionary keyed by
+               the bound variant names, and best maps each function name to the value
+               with the lowest mean of average times.
+    """
+    if callable(functions) and not isinstance(functions, list):
+        functions = [functions]
+
+    variants = [bind_params(func, **{param: value}) for func in functions for value in values]
+    results = run_experiment(variants, test_cases, iterations=iterations, warmup=warmup, **kwargs)
+
+    best = {}
+    for func in functions:
+        mean_times = {}
+        for value in values:
+            stats = results[bind_params(func, **{param: value}).__name__]
+            mean_times[value] = sum(s['avg'] for s in stats) / len(stats) if stats else float('inf')
+        best[func.__name__] = min(mean_times, key=mean_times.get)
+
+    return results, best
+
+
+def _stats_to_json(stats):
+    encoded = {}
+    for name, value in stats.items():
+        if isinstance(value, StreamingStats):
+            encoded[name] = value.to_dict()
+        elif isinstance(value, array):
+            encoded[name] = value.tolist()
+        else:
+            encoded[name] = value
+    return encoded
+
+
+def _stats_from_json(encoded):
+    stats = dict(encoded)
+    for name in ('accumulator', 'cpu_accumulator'):
+        if name in stats:
+            stats[name] = StreamingStats.from_dict(stats[name])
+    for name in ('times', 'cpu_times'):
+        if name in stats:
+            stats[name] = array('d', stats[name])
+    return stats
+
+
+def save_results(results, path):
+    """
+    Saves run_experiment() results (with or without views) as JSON.
+
+    Args:
+        results (dict): Results as returned by run_experiment().
+        path (str): File to write; parent directories are created.
+    """
+    def encode(node):
+        if isinstance(node, list):
+            return [_stats_to_json(stats) for stats in node]
+        return {name: encode(child) for name, child in node.items()}
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w') as file:
+        json.dump(encode(results), file)
+
+
+def load_results(path):
+    """
+    Loads results written by save_results().
+
+    Args:
+        path (str): File to read.
+
+    Returns:
+        dict: The results, with accumulators and sample arrays restored.
+    """
+    def decode(node):
+        if isinstance(node, list):
+            return [_stats_from_json(stats) for stats in node]
+        return {name: decode(child) for name, child in node.items()}
+
+    with open(path) as file:
+        return decode(json.load(file))
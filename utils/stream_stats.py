@@ -0,0 +1,213 @@
+import math
+
+# Log-spaced histogram covering 1 ns .. 1000 s; each bucket is ~2.3% wide
+BUCKETS_PER_DECADE = 100
+MIN_VALUE = 1e-9
+MAX_VALUE = 1e3
+
+# Scale factor turning a MAD into a consistent estimate of the standard deviation
+MAD_TO_STDDEV = 1.4826
+
+
+class StreamingStats:
+    """
+    Constant-memory accumulator for timing samples.
+
+    Keeps Welford's running mean/variance together with a sparse, fixed-bucket
+    logarithmic histogram (bucket -> [count, sum]). Percentiles and the median
+    absolute deviation are read off the histogram, so memory is bounded by the
+    number of buckets rather than the number of samples. Two accumulators built
+    on different workers can be combined with merge().
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.total = 0.0
+        self.buckets = {}
+
+    @staticmethod
+    def _bucket(value):
+        value = min(max(value, MIN_VALUE), MAX_VALUE)
+        return math.floor(math.log10(value) * BUCKETS_PER_DECADE)
+
+    @staticmethod
+    def _bucket_midpoint(bucket):
+        # Geometric midpoint of [10^(b/B), 10^((b+1)/B))
+        return 10 ** ((bucket + 0.5) / BUCKETS_PER_DECADE)
+
+    def add(self, value):
+        """
+        Add one sample.
+
+        Args:
+            value (float): The sample, e.g. a runtime in seconds
+        """
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+        bucket = self.buckets.setdefault(self._bucket(value), [0, 0.0])
+        bucket[0] += 1
+        bucket[1] += value
+
+    def merge(self, other):
+        """
+        Fold another accumulator into this one (Chan et al.'s parallel variance update).
+
+        Args:
+            other (StreamingStats): Accumulator to merge in; left unchanged
+
+        Returns:
+            StreamingStats: self, to allow chaining
+        """
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+        else:
+            count = self.count + other.count
+            delta = other.mean - self.mean
+            self.mean += delta * other.count / count
+            self.m2 += other.m2 + delta * delta * self.count * other.count / count
+            self.count = count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        for bucket, (count, total) in other.buckets.items():
+            mine = self.buckets.setdefault(bucket, [0, 0.0])
+            mine[0] += count
+            mine[1] += total
+        return self
+
+    @property
+    def variance(self):
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stddev(self):
+        return math.sqrt(self.variance)
+
+    def percentile(self, q):
+        """
+        Approximate percentile from the histogram (within one bucket width).
+
+        Args:
+            q (float): Percentile in [0, 100]
+
+        Returns:
+            float: The estimated value, clamped to the observed [min, max]
+        """
+        if self.count == 0:
+            return 0.0
+        rank = q / 100 * self.count
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket][0]
+            if seen >= rank:
+                return min(max(self._bucket_midpoint(bucket), self.min), self.max)
+        return self.max
+
+    def mad(self):
+        """
+        Approximate median absolute deviation, computed from bucket midpoints.
+
+        Returns:
+            float: The MAD of the samples seen so far
+        """
+        if self.count == 0:
+            return 0.0
+        median = self.percentile(50)
+        deviations = sorted((abs(min(max(self._bucket_midpoint(b), self.min), self.max) - median), c)
+                            for b, (c, _) in self.buckets.items())
+        seen = 0
+        for deviation, count in deviations:
+            seen += count
+            if seen >= self.count / 2:
+                return deviation
+        return 0.0
+
+    def filtered(self, threshold=3.5):
+        """
+        Mean and count after rejecting outliers further than threshold robust standard
+        deviations (MAD * 1.4826) from the median. Whole buckets are kept or rejected.
+
+        Args:
+            threshold (float): Rejection distance in robust standard deviations (default: 3.5)
+
+        Returns:
+            tuple: (filtered mean, number of samples rejected)
+        """
+        if self.count == 0:
+            return 0.0, 0
+        median = self.percentile(50)
+        limit = threshold * MAD_TO_STDDEV * self.mad()
+        kept_count = 0
+        kept_total = 0.0
+        for bucket, (count, total) in self.buckets.items():
+            midpoint = min(max(self._bucket_midpoint(bucket), self.min), self.max)
+            # A zero MAD means most samples share one bucket; keep only that bucket's neighbourhood
+            if abs(midpoint - median) <= limit or bucket == self._bucket(median):
+                kept_count += count
+                kept_total += total
+        if kept_count == 0:
+            return self.mean, 0
+        return kept_total / kept_count, self.count - kept_count
+
+    def summary(self):
+        """
+        Returns:
+            dict: count, min, max, avg, total, stddev, p50, p90, p99, mad,
+                  filtered_avg and outliers
+        """
+        filtered_avg, outliers = self.filtered()
+        return {
+            'count': self.count,
+            'min': self.min if self.count else 0,
+            'max': self.max if self.count else 0,
+            'avg': self.mean,
+            'total': self.total,
+            'stddev': self.stddev,
+            'p50': self.percentile(50),
+            'p90': self.percentile(90),
+            'p99': self.percentile(99),
+            'mad': self.mad(),
+            'filtered_avg': filtered_avg,
+            'outliers': outliers,
+        }
+
+    def to_dict(self):
+        """
+        Returns:
+            dict: JSON-serializable state, restorable with StreamingStats.from_dict()
+        """
+        return {
+            'count': self.count,
+            'mean': self.mean,
+            'm2': self.m2,
+            'min': self.min if self.count else None,
+            'max': self.max if self.count else None,
+            'total': self.total,
+            'buckets': [[bucket, count, total] for bucket, (count, total) in sorted(self.buckets.items())],
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        stats = cls()
+        stats.count = state['count']
+        stats.mean = state['mean']
+        stats.m2 = state['m2']
+        stats.min = state['min'] if state['min'] is not None else math.inf
+        stats.max = state['max'] if state['max'] is not None else -math.inf
+        stats.total = state['total']
+        stats.buckets = {bucket: [count, total] for bucket, count, total in state['buckets']}
+        return stats
@@ -0,0 +1,355 @@
+import argparse
+import json
+import os
+import socket
+import sqlite3
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Allow running as `python utils/work_queue.py` from the repository root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.backends import materializer
+from utils.run_experiment import (_calculate_memory, _calculate_runtime, _stats_from_json, _stats_to_json,
+                                  merge_runtime_stats, timing_isolation)
+
+# Seconds a claimed unit stays leased; after that any worker may claim it again
+LEASE_SECONDS = 600
+
+# Seconds an idle worker waits before looking for expired leases again
+POLL_SECONDS = 1.0
+
+# Seconds to wait for another process's write lock before giving up
+LOCK_TIMEOUT = 60
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS testcases (fingerprint TEXT PRIMARY KEY, data TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS units (
+    id INTEGER PRIMARY KEY,
+    function TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    chunk INTEGER NOT NULL,
+    iterations INTEGER NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',
+    worker TEXT,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    result TEXT
+);
+CREATE INDEX IF NOT EXISTS units_state ON units (state, lease_expires);
+"""
+
+
+def connect(path):
+    """
+    Open the queue database. Transactions are explicit (BEGIN IMMEDIATE), so claims
+    by concurrent workers are serialized by SQLite's write lock.
+
+    SQLite's locking needs a filesystem with working POSIX locks: a local disk, or
+    a shared one that supports them (many NFS setups do not).
+    """
+    conn = sqlite3.connect(path, timeout=LOCK_TIMEOUT, isolation_level=None)
+    conn.execute('PRAGMA busy_timeout = %d' % (LOCK_TIMEOUT * 1000))
+    return conn
+
+
+def create_queue(path, functions, testcases, views=None, iterations=1, warmup=0, chunk_iterations=None,
+                 measure_memory=False, backend='list'):
+    """
+    Coordinator: fill a queue with one work unit per function x test case x chunk of
+    iterations. Test cases are stored in the database, so workers need nothing but
+    the database file and the functions.
+
+    Args:
+        path (str): Queue database file (created; an existing queue is replaced)
+        functions (list): Functions to time; workers look them up by name
+        testcases (dict or list): Fingerprint -> test case as from load_testcase_views(), or a
+                                  list of test cases
+        views (dict): Arrangement -> fingerprints (default: None, plain list results)
+        iterations (int): Timed iterations per function and test case (default: 1)
+        warmup (int): Warmup runs before each unit's timed iterations (default: 0)
+        chunk_iterations (int): Iterations per unit, so one cell can be spread over several
+                                workers (default: all iterations in one unit)
+        measure_memory (bool): Also measure memory, in each cell's first unit (default: False)
+        backend (str): Container backend from utils.backends.BACKENDS (default: 'list')
+
+    Returns:
+        int: Number of work units created
+    """
+    from utils.load_testcases import fingerprint_testcase
+
+    if isinstance(testcases, dict):
+        cases = testcases
+        order = [fingerprint for view in views.values() for fingerprint in view] if views else list(cases)
+    else:
+        cases = {}
+        order = []
+        for case in testcases:
+            fingerprint = fingerprint_testcase(case)
+            cases.setdefault(fingerprint, case)
+            order.append(fingerprint)
+    unique_fingerprints = list(dict.fromkeys(order))
+
+    chunk_iterations = chunk_iterations or iterations
+    chunks = [min(chunk_iterations, iterations - start) for start in range(0, iterations, chunk_iterations)]
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    if os.path.exists(path):
+        os.remove(path)
+
+    conn = connect(path)
+    try:
+        conn.executescript(SCHEMA)
+        conn.execute('BEGIN IMMEDIATE')
+        meta = {
+            'functions': [func.__name__ for func in functions],
+            'order': order,
+            'views': views,
+            'warmup': warmup,
+            'measure_memory': measure_memory,
+            'backend': backend,
+        }
+        conn.executemany('INSERT INTO meta VALUES (?, ?)', [(key, json.dumps(value)) for key, value in meta.items()])
+        conn.executemany('INSERT INTO testcases VALUES (?, ?)',
+                         [(fingerprint, json.dumps(list(cases[fingerprint]))) for fingerprint in unique_fingerprints])
+        units = [(func.__name__, fingerprint, chunk, chunk_size)
+                 for func in functions for fingerprint in unique_fingerprints
+                 for chunk, chunk_size in enumerate(chunks)]
+        conn.executemany('INSERT INTO units (function, fingerprint, chunk, iterations) VALUES (?, ?, ?, ?)', units)
+        conn.execute('COMMIT')
+    finally:
+        conn.close()
+    return len(units)
+
+
+def _meta(conn):
+    return {key: json.loads(value) for key, value in conn.execute('SELECT key, value FROM meta')}
+
+
+def claim(conn, worker, lease_seconds=LEASE_SECONDS):
+    """
+    Lease the next pending unit, or one whose lease has expired (its worker died or
+    stalled), to this worker.
+
+    Returns:
+        tuple: (id, function, fingerprint, chunk, iterations), or None if no unit is claimable
+    """
+    now = time.time()
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        unit = conn.execute(
+            "SELECT id, function, fingerprint, chunk, iterations FROM units "
+            "WHERE state = 'pending' OR (state = 'leased' AND lease_expires < ?) ORDER BY id LIMIT 1",
+            (now,)).fetchone()
+        if unit is not None:
+            conn.execute("UPDATE units SET state = 'leased', worker = ?, lease_expires = ?, attempts = attempts + 1 "
+                         "WHERE id = ?", (worker, now + lease_seconds, unit[0]))
+        conn.execute('COMMIT')
+    except BaseException:
+        conn.execute('ROLLBACK')
+        raise
+    return unit
+
+
+def complete(conn, unit_id, worker, stats):
+    """
+    Store a unit's statistics. Only the current lease holder may complete a unit: if
+    the lease expired and another worker claimed the unit, this result is discarded.
+
+    Returns:
+        bool: Whether the result was stored
+    """
+    cursor = conn.execute("UPDATE units SET state = 'done', result = ?, lease_expires = NULL "
+                          "WHERE id = ? AND worker = ? AND state = 'leased'",
+                          (json.dumps(_stats_to_json(stats)), unit_id, worker))
+    return cursor.rowcount == 1
+
+
+def progress(path):
+    """
+    Number of units per state ('pending', 'leased', 'done').
+    """
+    conn = connect(path)
+    try:
+        return dict(conn.execute('SELECT state, COUNT(*) FROM units GROUP BY state'))
+    finally:
+        conn.close()
+
+
+def run_worker(path, functions, worker=None, lease_seconds=LEASE_SECONDS, poll=POLL_SECONDS, isolate=False):
+    """
+    Worker: claim units, time them with _calculate_runtime() and write the results
+    back until every unit is done. Any number of workers, on any node that can open
+    the database, may run at once.
+
+    Args:
+        path (str): Queue database file
+        functions (list): Functions the queue refers to (matched by name)
+        worker (str): Worker id (default: host name and process id)
+        lease_seconds (float): Lease length; must exceed the longest unit (default: LEASE_SECONDS)
+        poll (float): Wait before re-checking while other workers hold the last leases
+        isolate (bool): Time under timing_isolation() (default: False)
+
+    Returns:
+        int: Number of units this worker completed
+    """
+    worker = worker or f"{socket.gethostname()}:{os.getpid()}"
+    by_name = {func.__name__: func for func in functions}
+    conn = connect(path)
+    meta = _meta(conn)
+    missing = [name for name in meta['functions'] if name not in by_name]
+    if missing:
+        conn.close()
+        raise ValueError(f"Worker lacks the queued functions {missing}")
+
+    materialize = materializer(meta['backend'])
+    cases = {}
+    completed = 0
+    try:
+        with timing_isolation(enabled=isolate) as timing_settings:
+            while True:
+                unit = claim(conn, worker, lease_seconds)
+                if unit is None:
+                    remaining = conn.execute("SELECT COUNT(*) FROM units WHERE state != 'done'").fetchone()[0]
+                    if not remaining:
+                        break
+                    # Other workers hold the last leases; wait in case one of them expires
+                    time.sleep(poll)
+                    continue
+
+                unit_id, func_name, fingerprint, chunk, iterations = unit
+                if fingerprint not in cases:
+                    row = conn.execute('SELECT data FROM testcases WHERE fingerprint = ?', (fingerprint,)).fetchone()
+                    cases[fingerprint] = json.loads(row[0])
+                case = cases[fingerprint]
+                func = by_name[func_name]
+
+                stats = _calculate_runtime(func, iterations, meta['warmup'], isolate=isolate,
+                                           timer_overhead=timing_settings['timer_overhead'],
+                                           setup=lambda: (materialize(case),))
+                if meta['measure_memory'] and chunk == 0:
+                    stats.update(_calculate_memory(func, materialize(case)))
+                stats['worker'] = worker
+                completed += complete(conn, unit_id, worker, stats)
+    finally:
+        conn.close()
+    return completed
+
+
+def merge_queue(path):
+    """
+    Merge step: combine the chunks of every cell with merge_runtime_stats() and fan the
+    cells out into the normal run_experiment() results dict.
+
+    Args:
+        path (str): Queue database file (every unit should be done)
+
+    Returns:
+        dict: Results shaped like run_experiment()'s, with views if the queue was created with views
+    """
+    conn = connect(path)
+    try:
+        meta = _meta(conn)
+        pending = conn.execute("SELECT COUNT(*) FROM units WHERE state != 'done'").fetchone()[0]
+        if pending:
+            raise RuntimeError(f"{pending} work units are not done yet")
+        sizes = {fingerprint: len(json.loads(data)) for fingerprint, data in conn.execute('SELECT fingerprint, data FROM testcases')}
+        rows = conn.execute('SELECT function, fingerprint, result FROM units ORDER BY function, fingerprint, chunk')
+
+        cells = {}
+        for func_name, fingerprint, result in rows:
+            stats = _stats_from_json(json.loads(result))
+            previous = cells.get((func_name, fingerprint))
+            if previous is None:
+                stats['input_size'] = sizes[fingerprint]
+                stats['fingerprint'] = fingerprint
+                cells[(func_name, fingerprint)] = stats
+            else:
+                merged = merge_runtime_stats(previous, stats)
+                if 'seeds' in previous and 'seeds' in stats:
+                    merged['seeds'] = previous['seeds'] + stats['seeds']
+                cells[(func_name, fingerprint)] = merged
+    finally:
+        conn.close()
+
+    if meta['views'] is None:
+        return {func_name: [dict(cells[(func_name, fingerprint)]) for fingerprint in meta['order']]
+                for func_name in meta['functions']}
+    return {arrangement: {func_name: [dict(cells[(func_name, fingerprint)]) for fingerprint in view]
+                          for func_name in meta['functions']}
+            for arrangement, view in meta['views'].items()}
+
+
+def run_local(path, functions, workers=None, **kwargs):
+    """
+    Run several worker processes on this machine against one queue, e.g. to try
+    distributed execution with a queue in a temporary directory.
+
+    Args:
+        path (str): Queue database file
+        functions (list): Module-level functions the queue refers to (they are pickled by reference)
+        workers (int): Number of worker processes (default: os.cpu_count())
+        **kwargs: Further arguments for run_worker()
+
+    Returns:
+        list: Units completed per worker
+    """
+    workers = workers or os.cpu_count()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(run_worker, path, functions, f"{socket.gethostname()}:local-{i}", **kwargs)
+                   for i in range(workers)]
+        return [future.result() for future in futures]
+
+
+def parse_args(arrangements):
+    parser = argparse.ArgumentParser(description='Distribute a benchmark matrix over workers through a SQLite queue')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    create = subparsers.add_parser('create', help='Fill a queue with the matrix of run.py FUNCTIONS x test cases')
+    create.add_argument('queue')
+    create.add_argument('--arrangements', nargs='+', choices=arrangements, default=arrangements)
+    create.add_argument('--iterations', type=int, default=3)
+    create.add_argument('--warmup', type=int, default=0)
+    create.add_argument('--chunk-iterations', type=int, default=None)
+    create.add_argument('--measure-memory', action='store_true')
+
+    worker = subparsers.add_parser('worker', help='Claim and run units until the queue is done')
+    worker.add_argument('queue')
+    worker.add_argument('--lease', type=float, default=LEASE_SECONDS)
+    worker.add_argument('--isolate', action='store_true')
+
+    local = subparsers.add_parser('local', help='Run several worker processes on this machine')
+    local.add_argument('queue')
+    local.add_argument('--workers', type=int, default=None)
+
+    merge = subparsers.add_parser('merge', help='Merge finished units into a results file')
+    merge.add_argument('queue')
+    merge.add_argument('--output', default='outputs/results.json')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    from run import ALL_ARRANGEMENT, FUNCTIONS, TESTCASE_FILES
+    from utils.load_testcases import load_testcase_views
+    from utils.run_experiment import save_results
+
+    args = parse_args(list(TESTCASE_FILES))
+    if args.command == 'create':
+        testcases, views = load_testcase_views({name: TESTCASE_FILES[name] for name in args.arrangements},
+                                               combined_view=ALL_ARRANGEMENT)
+        count = create_queue(args.queue, FUNCTIONS, testcases, views, args.iterations, args.warmup,
+                             args.chunk_iterations, args.measure_memory)
+        print(f"Queued {count} work units in '{args.queue}'")
+    elif args.command == 'worker':
+        count = run_worker(args.queue, FUNCTIONS, lease_seconds=args.lease, isolate=args.isolate)
+        print(f"Worker finished after completing {count} units")
+    elif args.command == 'local':
+        counts = run_local(args.queue, FUNCTIONS, args.workers)
+        print(f"{len(counts)} local workers completed {sum(counts)} units ({counts})")
+    else:
+        save_results(merge_queue(args.queue), args.output)
+        print(f"Merged {sum(progress(args.queue).values())} units into '{args.output}'")